@@ -0,0 +1,222 @@
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pygame
+
+# Everything the title screen and character creation need up front
+MANIFEST = {
+    "sounds": [
+        "creation_start.wav",
+        "name_confirm.wav",
+        "class_select.wav",
+        "creation_complete.wav",
+        "blood_drip.wav",
+        "confirm.wav",
+        "deny.wav"
+    ],
+    "images": [
+        "sprites/title_garnet.png"
+    ],
+    "fonts": [
+        ("OldLondon.ttf", 96, "arial"),
+        ("OldLondon.ttf", 64, "arial"),
+        ("OldLondon.ttf", 42, "arial"),
+        ("OldLondon.ttf", 36, "arial"),
+        ("OldLondon.ttf", 72, "arial"),
+        ("OldLondon.ttf", 40, "arial"),
+        ("OldLondon.ttf", 32, "arial"),
+        ("necromancer.ttf", 20, None)
+    ]
+}
+
+
+class DummySound:
+    """Silent stand-in for sounds that failed to load"""
+    def play(self, *args, **kwargs): pass
+    def stop(self): pass
+    def set_volume(self, vol): pass
+    def get_length(self): return 0.0
+
+
+class AssetManager:
+    """Central cache for sounds, images and fonts.
+
+    Loads run on a thread pool and are deduplicated: asking for an asset
+    that is already loading waits on the same job. Decoded objects are
+    cached, and files found missing are remembered so they are never
+    opened again.
+    """
+    def __init__(self, root="assets", workers=4):
+        self.root = root
+        self.workers = workers
+        self.load_times = {}
+        self.missing = set()
+        self._cache = {}
+        self._jobs = {}
+        self._lock = threading.Lock()
+        self._font_lock = threading.Lock()
+        self._pool = None
+
+    # ======================
+    # LOADING
+    # ======================
+    def _submit(self, key, loader):
+        """Start loading key unless it is cached, missing or already queued"""
+        with self._lock:
+            job = self._jobs.get(key)
+            if job is None:
+                if self._pool is None:
+                    self._pool = ThreadPoolExecutor(self.workers, thread_name_prefix="assets")
+                job = self._jobs[key] = self._pool.submit(self._timed, key, loader)
+            return job
+
+    def _timed(self, key, loader):
+        start = time.perf_counter()
+        try:
+            value = loader()
+        finally:
+            self.load_times[key] = time.perf_counter() - start
+        if value is None:
+            self.missing.add(key)
+        self._cache[key] = value
+        return value
+
+    def _load(self, key, loader):
+        """Cached value for key, loading it on the pool if needed"""
+        if key in self._cache:
+            return self._cache[key]
+        return self._submit(key, loader).result()
+
+    def _path(self, *parts):
+        return os.path.join(self.root, *parts)
+
+    def _read_sound(self, filename):
+        path = self._path("sounds", filename)
+        if not os.path.exists(path):
+            print(f"Sound load failed: {path} not found")
+            return None
+        try:
+            # Initialize mixer if needed
+            if pygame.mixer.get_init() is None:
+                pygame.mixer.init(frequency=44100, size=-16, channels=2, buffer=512)
+            try:
+                return pygame.mixer.Sound(path)
+            except pygame.error:
+                # Some MP3s only decode from an in-memory buffer
+                with open(path, 'rb') as f:
+                    return pygame.mixer.Sound(buffer=f.read())
+        except Exception as e:
+            print(f"Sound load failed: {e}")
+            return None
+
+    def _read_image(self, name):
+        path = self._path(name)
+        if not os.path.exists(path):
+            print(f"Image load failed: {path} not found")
+            return None
+        try:
+            return pygame.image.load(path)
+        except (pygame.error, OSError) as e:
+            # Corrupt or unsupported files count as missing too
+            print(f"Image load failed: {path}: {e}")
+            return None
+
+    def _read_font(self, font_name, size, fallback_name):
+        from utils import FONTS
+
+        # FreeType faces are not safe to open concurrently
+        with self._font_lock:
+            return FONTS.load(font_name, size, fallback_name)
+
+    # ======================
+    # PUBLIC API
+    # ======================
+    def sound(self, filename):
+        """Decoded sound, or a silent DummySound if the file is missing"""
+        key = ("sound", filename)
+        sound = self._load(key, lambda: self._read_sound(filename))
+        return sound if sound is not None else DummySound()
+
+    def prefetch_sound(self, filename):
+        """Start decoding a sound in the background; returns its job"""
+        key = ("sound", filename)
+        return self._submit(key, lambda: self._read_sound(filename))
+
+    def run(self, func, *args):
+        """Run func(*args) on the loader threads; returns its Future.
+
+        For warm-up work that doesn't touch pygame surfaces.
+        """
+        with self._lock:
+            if self._pool is None:
+                self._pool = ThreadPoolExecutor(self.workers, thread_name_prefix="assets")
+            return self._pool.submit(func, *args)
+
+    def release_sound(self, filename):
+        """Drop a decoded sound so its memory can be freed; it reloads if asked for again"""
+        key = ("sound", filename)
+        with self._lock:
+            if key in self.missing:
+                # Keep remembering that it is missing
+                return
+            job = self._jobs.get(key)
+            if job is not None and job.done():
+                del self._jobs[key]
+                self._cache.pop(key, None)
+
+    def image(self, name):
+        """Image converted for the display, or None if the file is missing"""
+        key = ("image", name)
+        image = self._load(key, lambda: self._read_image(name))
+        if image is None:
+            return None
+        converted = self._cache.get(("converted", name))
+        if converted is None and pygame.display.get_surface() is not None:
+            # Conversion needs the display, so it happens on the main thread
+            converted = self._cache[("converted", name)] = image.convert_alpha()
+        return converted if converted is not None else image
+
+    def font(self, font_name, size, fallback_name=None):
+        key = ("font", font_name, size, fallback_name)
+        return self._load(key, lambda: self._read_font(font_name, size, fallback_name))
+
+    def preload(self, manifest=MANIFEST):
+        """Queue every asset in the manifest; returns the list of jobs"""
+        jobs = []
+        for filename in manifest.get("sounds", ()):
+            jobs.append(self._submit(("sound", filename), lambda f=filename: self._read_sound(f)))
+        for name in manifest.get("images", ()):
+            jobs.append(self._submit(("image", name), lambda n=name: self._read_image(n)))
+        for font_name, size, fallback_name in manifest.get("fonts", ()):
+            jobs.append(self._submit(
+                ("font", font_name, size, fallback_name),
+                lambda f=font_name, s=size, fb=fallback_name: self._read_font(f, s, fb)
+            ))
+        return jobs
+
+    @staticmethod
+    def progress(jobs):
+        """Fraction of jobs finished"""
+        if not jobs:
+            return 1.0
+        return sum(job.done() for job in jobs) / len(jobs)
+
+    def report(self):
+        """Per-asset load-time table, slowest first"""
+        lines = [f"{'asset':<48} {'ms':>8}  status"]
+        for key, seconds in sorted(self.load_times.items(), key=lambda item: -item[1]):
+            name = " ".join(str(part) for part in key if part is not None)
+            status = "missing" if key in self.missing else "ok"
+            lines.append(f"{name:<48} {seconds * 1000:>8.2f}  {status}")
+        lines.append(f"{'total':<48} {sum(self.load_times.values()) * 1000:>8.2f}")
+        return "\n".join(lines)
+
+    def shutdown(self):
+        if self._pool is not None:
+            self._pool.shutdown(wait=True)
+            self._pool = None
+
+
+ASSETS = AssetManager()
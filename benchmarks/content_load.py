@@ -0,0 +1,106 @@
+"""Content startup cost as packs grow, with and without the binary cache.
+
+Writes synthetic packs of n relics, potions and spells, then times:
+
+    parse + validate   reading, merging and validating the packs
+    cold cache         the first load_content(), which also writes the blob
+    warm cache         later load_content() calls: hash the packs, map the blob
+    first lookup       decoding one entry and compiling its effects
+
+plus a mod overlay patching and removing entries on top:
+
+    python -m benchmarks.content_load --sizes 100 1000 10000
+"""
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+
+from content import PACK_DIR, build_registry, load_content, merge_packs, read_pack
+
+SIGILS = ("Garnet", "Crimson", "Void", None)
+
+
+def synthetic_pack(n):
+    """A pack of n entries split between relics, potions and spells"""
+    relics, potions, spells = {}, {}, {}
+    for i in range(n):
+        kind = i % 3
+        if kind == 0:
+            relics[f"Relic {i}"] = {
+                "type": ("weapon", "armor", "relic")[i % 9 // 3],
+                "damage": f"{1 + i % 3}d{4 + 2 * (i % 4)}",
+                "effect": f"Drains HP on hit ({i})",
+                "effects": [["drain", f"1d{4 + i % 5}"]],
+                "blood_cost": i % 4
+            }
+        elif kind == 1:
+            potions[f"Potion {i}"] = {
+                "effect": f"Restores {10 + i % 40} HP",
+                "effects": [["heal", 10 + i % 40]],
+                "color": [i % 256, 0, 0]
+            }
+        else:
+            spell = {
+                "cost": 1 + i % 20,
+                "damage": f"{1 + i % 4}d8",
+                "effect": f"Blood tendrils lash out ({i})",
+                "effects": [["damage", f"{1 + i % 4}d8"], ["lifesteal", i % 25]]
+            }
+            if SIGILS[i % 4]:
+                spell["sigil"] = SIGILS[i % 4]
+            spells[f"Spell {i}"] = spell
+    return {"name": f"synthetic-{n}", "relics": relics, "potions": potions, "spells": spells}
+
+
+def overlay(n):
+    """A mod patching and removing some of the synthetic entries"""
+    return {
+        "name": "overlay",
+        "patch": {f"Spell {i}": {"cost": 1} for i in range(2, n, 30)},
+        "remove": [f"Potion {i}" for i in range(1, n, 30)]
+    }
+
+
+def timed(func):
+    start = time.perf_counter()
+    result = func()
+    return time.perf_counter() - start, result
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[100, 1000, 10000])
+    args = parser.parse_args(argv)
+
+    print(f"{'entries':>8} {'parse+validate':>15} {'cold cache':>11} {'warm cache':>11} "
+          f"{'first lookup':>13} {'warm + mod':>11}  (ms)")
+    with tempfile.TemporaryDirectory() as directory:
+        for n in args.sizes:
+            pack_path = os.path.join(directory, f"synthetic-{n}.json")
+            mod_path = os.path.join(directory, f"overlay-{n}.json")
+            with open(pack_path, "w") as f:
+                json.dump(synthetic_pack(n), f)
+            with open(mod_path, "w") as f:
+                json.dump(overlay(n), f)
+            paths = [os.path.join(PACK_DIR, "base.json"), pack_path]
+            cache_dir = os.path.join(directory, f"cache-{n}")
+
+            parse_time, registry = timed(lambda: build_registry(merge_packs(read_pack(p) for p in paths)))
+            cold, _ = timed(lambda: load_content(paths, cache_dir))
+            warm, content = min((timed(lambda: load_content(paths, cache_dir)) for _ in range(5)),
+                                key=lambda pair: pair[0])
+            lookup, _ = timed(lambda: content["Crimson Lash"].program)
+            # The first modded load builds its own blob; time the warm one
+            load_content(paths + [mod_path], cache_dir)
+            modded, _ = timed(lambda: load_content(paths + [mod_path], cache_dir))
+            assert len(content) == len(registry.entries)
+            print(f"{len(content):>8} {parse_time * 1e3:>15.1f} {cold * 1e3:>11.1f} {warm * 1e3:>11.2f} "
+                  f"{lookup * 1e3:>13.3f} {modded * 1e3:>11.2f}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
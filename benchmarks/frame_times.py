@@ -0,0 +1,306 @@
+"""Headless frame-time benchmark for every game state.
+
+Runs DarkRPG under SDL's dummy video and audio drivers, drives each state
+with scripted input and records frame-time percentiles, allocations and
+draw calls per frame. Results can be saved as a JSON baseline and later
+runs compared against it. Frame times depend on the machine, so each
+machine keeps its own baseline and none is committed:
+
+    python -m benchmarks.frame_times --frames 300 --save-baseline
+    python -m benchmarks.frame_times --frames 300 --compare
+"""
+import argparse
+import json
+import os
+import statistics
+import sys
+import time
+import tracemalloc
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+import pygame
+
+DEFAULT_BASELINE = os.path.join(os.path.dirname(__file__), "baselines", "frame_times.json")
+
+# Metrics where a higher value is a regression, with absolute slack so
+# near-zero values don't trip the relative tolerance
+CHECKED_METRICS = {
+    "p50_ms": 0.2,
+    "p95_ms": 0.3,
+    "p99_ms": 0.5,
+    "alloc_kb_per_frame": 4.0,
+    "surfaces_per_frame": 0.5,
+    "draw_calls_per_frame": 2.0
+}
+
+# ======================
+# INSTRUMENTATION
+# ======================
+class Counters:
+    """Per-frame counts collected by the instrumented pygame entry points"""
+    def __init__(self):
+        self.reset()
+
+    def reset(self):
+        self.surfaces = 0
+        self.surface_bytes = 0
+        self.draw_calls = 0
+        self.blits = 0
+
+
+COUNTERS = Counters()
+
+
+class CountingSurface(pygame.Surface):
+    """Surface that counts its own creation plus blits and fills drawn onto it"""
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        COUNTERS.surfaces += 1
+        COUNTERS.surface_bytes += self.get_width() * self.get_height() * self.get_bytesize()
+
+    def blit(self, *args, **kwargs):
+        COUNTERS.blits += 1
+        return super().blit(*args, **kwargs)
+
+    def blits(self, blit_sequence, *args, **kwargs):
+        blit_sequence = list(blit_sequence)
+        COUNTERS.blits += len(blit_sequence)
+        return super().blits(blit_sequence, *args, **kwargs)
+
+    def fill(self, *args, **kwargs):
+        COUNTERS.draw_calls += 1
+        return super().fill(*args, **kwargs)
+
+
+def instrument_pygame():
+    """Count surface allocations and draw primitives for the whole process"""
+    pygame.Surface = CountingSurface
+    for name in ("line", "lines", "rect", "polygon", "circle", "ellipse", "arc", "aaline", "aalines"):
+        original = getattr(pygame.draw, name)
+
+        def counted(*args, _original=original, **kwargs):
+            COUNTERS.draw_calls += 1
+            return _original(*args, **kwargs)
+
+        setattr(pygame.draw, name, counted)
+
+# ======================
+# SCRIPTED STATES
+# ======================
+def key(k, unicode=""):
+    return pygame.event.Event(pygame.KEYDOWN, key=k, unicode=unicode, mod=0)
+
+
+def typing_script(frame):
+    """Keep the blood-name animation busy: type, then trim, forever"""
+    cycle = frame % 120
+    if cycle < 60 and cycle % 10 == 0:
+        return [key(pygame.K_a + cycle // 10, chr(ord("a") + cycle // 10))]
+    if cycle >= 60 and cycle % 10 == 0:
+        return [key(pygame.K_BACKSPACE)]
+    return []
+
+
+def hover_script(frame):
+    """Sweep the mouse across the class buttons so the tooltip moves"""
+    x = 300 + (frame * 7) % 700
+    y = 260 + (frame * 3) % 300
+    return [pygame.event.Event(pygame.MOUSEMOTION, pos=(x, y), rel=(7, 3), buttons=(0, 0, 0))]
+
+
+def sample_player():
+    return {
+        "name": "Benchmark the Bloodsoaked",
+        "class": "Nightblade",
+        "stats": {"STR": 15, "DEX": 18, "CON": 14, "INT": 12, "WIS": 11, "CHA": 13},
+        "crimson_tears": 3,
+        "garnet_shards": 1,
+        "inventory": {"weapons": ["Rusty Dagger"], "armor": ["Tattered Robes"], "relics": [], "gold": 12}
+    }
+
+
+def enter_title(game):
+    game.scenes.clear()
+    game.start()
+
+
+def enter_name_entry(game):
+    game.enter_creation()
+
+
+def enter_confirm(game):
+    game.enter_creation()
+    for char in "Bench":
+        game.handle_event(key(ord(char.lower()), char))
+    game.handle_event(key(pygame.K_RETURN))
+
+
+def enter_class_select(game):
+    game.enter_creation()
+    game.handle_event(key(pygame.K_RETURN))
+
+
+def enter_summary(game):
+    game.scenes.clear()
+    game.creation_complete(sample_player())
+
+
+def enter_game(game):
+    from main import GameScene
+    from character_model import Character
+
+    game.scenes.clear()
+    game.player = Character.from_dict(sample_player())
+    game.scenes.push(GameScene(game))
+
+
+STATES = [
+    ("title", enter_title, None),
+    ("name_entry", enter_name_entry, typing_script),
+    ("confirm_name", enter_confirm, None),
+    ("class_select", enter_class_select, hover_script),
+    ("summary", enter_summary, None),
+    ("game", enter_game, None)
+]
+
+# ======================
+# MEASUREMENT
+# ======================
+def run_frames(game, frames, script, trace=False):
+    """Run frames of update+render+present; returns per-frame samples"""
+    times, allocs, surfaces, draws, blits, redrawn = [], [], [], [], [], []
+    step = game.timestep.step
+    for frame in range(frames):
+        events = script(frame) if script else []
+        COUNTERS.reset()
+        if trace:
+            tracemalloc.reset_peak()
+            base = tracemalloc.get_traced_memory()[0]
+
+        start = time.perf_counter()
+        for event in events:
+            game.handle_event(event)
+        game.update(step)
+        game.render_frame()
+        elapsed = time.perf_counter() - start
+
+        if trace:
+            allocs.append(tracemalloc.get_traced_memory()[1] - base)
+        times.append(elapsed)
+        surfaces.append(COUNTERS.surfaces)
+        draws.append(COUNTERS.draw_calls)
+        blits.append(COUNTERS.blits)
+        redrawn.append(game.renderer.redrawn_fraction)
+    return times, allocs, surfaces, draws, blits, redrawn
+
+
+def percentile(values, pct):
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, int(round(pct / 100 * (len(ordered) - 1)))))
+    return ordered[index]
+
+
+def benchmark(frames=300, warmup=30):
+    """Benchmark every state; returns {state: metrics}"""
+    instrument_pygame()
+    from main import DarkRPG
+
+    game = DarkRPG()
+    # The counting subclass only applies to surfaces made from now on
+    game.screen = game.renderer.screen = CountingSurface(game.screen.get_size())
+    game.next_creator = None
+    # Keep save-file writes out of the frame timings
+    game.saves = None
+
+    results = {}
+    for name, enter, script in STATES:
+        enter(game)
+        assert game.current_state == name, f"expected {name}, got {game.current_state}"
+        run_frames(game, warmup, script)
+
+        times, _, surfaces, draws, blits, redrawn = run_frames(game, frames, script)
+
+        # Allocation pass separately, since tracing skews the timings
+        enter(game)
+        tracemalloc.start()
+        _, allocs, _, _, _, _ = run_frames(game, min(frames, 100), script, trace=True)
+        tracemalloc.stop()
+
+        results[name] = {
+            "frames": frames,
+            "mean_ms": statistics.fmean(times) * 1000,
+            "p50_ms": percentile(times, 50) * 1000,
+            "p95_ms": percentile(times, 95) * 1000,
+            "p99_ms": percentile(times, 99) * 1000,
+            "alloc_kb_per_frame": statistics.fmean(allocs) / 1024,
+            "surfaces_per_frame": statistics.fmean(surfaces),
+            "draw_calls_per_frame": statistics.fmean(draws),
+            "blits_per_frame": statistics.fmean(blits),
+            "redrawn_fraction": statistics.fmean(redrawn)
+        }
+    return results
+
+
+def compare(results, baseline, tolerance):
+    """List of regression messages versus baseline"""
+    regressions = []
+    for state, metrics in results.items():
+        base = baseline.get(state)
+        if base is None:
+            continue
+        for metric, slack in CHECKED_METRICS.items():
+            if metric not in base:
+                continue
+            limit = base[metric] * (1 + tolerance) + slack
+            if metrics[metric] > limit:
+                regressions.append(
+                    f"{state}.{metric}: {metrics[metric]:.3f} > {limit:.3f} (baseline {base[metric]:.3f})"
+                )
+    return regressions
+
+
+def format_table(results):
+    columns = ["p50_ms", "p95_ms", "p99_ms", "alloc_kb_per_frame", "surfaces_per_frame",
+               "draw_calls_per_frame", "blits_per_frame", "redrawn_fraction"]
+    lines = [f"{'state':<14}" + "".join(f"{column:>22}" for column in columns)]
+    for state, metrics in results.items():
+        lines.append(f"{state:<14}" + "".join(f"{metrics[column]:>22.3f}" for column in columns))
+    return "\n".join(lines)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--frames", type=int, default=300)
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE)
+    parser.add_argument("--save-baseline", action="store_true", help="write results as the new baseline")
+    parser.add_argument("--compare", action="store_true", help="fail if results regress past the baseline")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="allowed relative slowdown")
+    parser.add_argument("--json", help="also write results to this path")
+    args = parser.parse_args(argv)
+    if args.compare and not args.save_baseline and not os.path.exists(args.baseline):
+        parser.error(f"no baseline at {args.baseline}; run with --save-baseline first")
+
+    results = benchmark(args.frames)
+    print(format_table(results))
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(results, f, indent=2)
+    if args.save_baseline:
+        os.makedirs(os.path.dirname(args.baseline), exist_ok=True)
+        with open(args.baseline, "w") as f:
+            json.dump(results, f, indent=2)
+        print(f"Baseline written to {args.baseline}")
+    if args.compare:
+        with open(args.baseline) as f:
+            regressions = compare(results, json.load(f), args.tolerance)
+        for message in regressions:
+            print(f"REGRESSION {message}")
+        return 1 if regressions else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,84 @@
+"""Event throughput of the initiative scheduler as encounters grow.
+
+Fills an InitiativeScheduler with n combatants, gives a quarter of them
+damage-over-time effects, hastes or slows a few every turn and queues
+delayed blood rituals, then times how many events per second step()
+resolves. Heap operations are O(log n), so the per-event cost should
+rise only slowly from dozens to thousands of combatants:
+
+    python -m benchmarks.initiative --sizes 10 100 1000 10000
+"""
+import argparse
+import random
+import sys
+import time
+
+from character_factory import CharacterFactory
+from character_model import Character
+from combat import BloodCombatSystem
+from content import CONTENT
+from effects import compile_effects
+from initiative import TURN, InitiativeScheduler
+
+# Nobody dies during the run, so every size resolves the same event mix
+UNDYING_HP = 10 ** 9
+BLEED = compile_effects([("damage", "1d4")])
+
+
+def build_encounter(n, seed=1):
+    roster = CharacterFactory(seed=seed).generate(n, name_prefix="Undead")
+    characters = [Character.from_dict(roster.character(i)) for i in range(n)]
+    scheduler = InitiativeScheduler()
+    for character in characters:
+        character.hp = UNDYING_HP
+        scheduler.add(character)
+    for i in range(0, n, 4):
+        scheduler.add_dot(characters[i - 1], characters[i], BLEED, ticks=10 ** 6)
+    return scheduler, characters
+
+
+def run(n, events, seed=1):
+    """(events per second, mean heap size) for an n-combatant encounter"""
+    scheduler, characters = build_encounter(n, seed)
+    rng = random.Random(seed)
+    lash = CONTENT["Crimson Lash"]
+
+    def on_turn(order, event):
+        roll = rng.random()
+        if roll < 0.05:
+            order.haste(event.actor, 2.0, duration=200)
+        elif roll < 0.10:
+            order.slow(event.actor, 2.0, duration=200)
+        elif roll < 0.15:
+            event.actor.hp = UNDYING_HP
+            order.cast_later(event.actor, rng.choice(characters), lash, delay=150)
+
+    resolved = 0
+    heap_total = 0
+    start = time.perf_counter()
+    while resolved < events:
+        event = scheduler.step()
+        if event.kind == TURN:
+            on_turn(scheduler, event)
+        resolved += 1
+        heap_total += len(scheduler._heap)
+    elapsed = time.perf_counter() - start
+    return resolved / elapsed, heap_total / resolved
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10, 100, 1000, 10000])
+    parser.add_argument("--events", type=int, default=200_000)
+    args = parser.parse_args(argv)
+
+    BloodCombatSystem.set_headless()
+    print(f"{'combatants':>10} {'events/s':>12} {'us/event':>9} {'heap size':>10}")
+    for n in args.sizes:
+        rate, heap_size = run(n, args.events)
+        print(f"{n:>10} {rate:>12,.0f} {1e6 / rate:>9.2f} {heap_size:>10.0f}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
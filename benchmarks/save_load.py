@@ -0,0 +1,95 @@
+"""Save and load times of the binary save format against plain JSON.
+
+Builds a roster of Characters, then times a full snapshot, a full load,
+a lazy open plus one character, and journaling single changes, next to
+json.dump / json.load of Character.to_dict() (the obvious way to save
+them). Both sides end with real Character objects:
+
+    python -m benchmarks.save_load --characters 10000
+"""
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+
+from character_factory import CharacterFactory
+from character_model import Character
+from savegame import SaveFile
+
+
+def timed(func, repeat):
+    """(best seconds of repeat runs, last result)"""
+    best, result = float("inf"), None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def roster(n, seed=1):
+    generated = CharacterFactory(seed=seed).generate(n)
+    characters = [Character.from_dict(generated.character(i)) for i in range(n)]
+    # Some wear and tear so drains, curses and extra items get stored too
+    for character in characters[::7]:
+        character.drain("STR")
+        character.add_curse("Bleeds at dawn")
+        character.inventory.add("Garnet Shard")
+    return characters
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--characters", type=int, default=10_000)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--journal", type=int, default=1000, help="single-character changes to journal")
+    parser.add_argument("--sync", action="store_true", help="fsync every write, as the game does")
+    args = parser.parse_args(argv)
+
+    characters = roster(args.characters)
+    with tempfile.TemporaryDirectory() as directory:
+        json_path = os.path.join(directory, "roster.json")
+        save = SaveFile(os.path.join(directory, "roster.sav"))
+
+        def json_save():
+            with open(json_path, "w") as f:
+                json.dump([character.to_dict() for character in characters], f)
+
+        def json_load():
+            with open(json_path) as f:
+                return [Character.from_dict(data) for data in json.load(f)]
+
+        def lazy_one():
+            with save.open_lazy() as lazy:
+                return lazy[len(lazy) // 2].name
+
+        def journal_changes():
+            for i in range(args.journal):
+                character = characters[i % len(characters)]
+                character.hp -= 1
+                save.record(i % len(characters), character, sync=args.sync)
+
+        rows = [
+            ("save", timed(json_save, args.repeat)[0], timed(lambda: save.save(characters, args.sync), args.repeat)[0]),
+            ("load", timed(json_load, args.repeat)[0], timed(save.load, args.repeat)[0]),
+        ]
+        assert [c.to_dict() for c in save.load()] == [c.to_dict() for c in json_load()]
+        json_size, binary_size = os.path.getsize(json_path), os.path.getsize(save.path)
+        lazy_time = timed(lazy_one, args.repeat)[0]
+        journal_time = timed(journal_changes, 1)[0]
+
+    print(f"{args.characters:,} characters")
+    print(f"{'':<6} {'JSON ms':>10} {'binary ms':>10} {'speedup':>8}")
+    for name, json_time, binary_time in rows:
+        print(f"{name:<6} {json_time * 1e3:>10.1f} {binary_time * 1e3:>10.1f} {json_time / binary_time:>7.1f}x")
+    print(f"size   {json_size / 1024:>9.0f}K {binary_size / 1024:>9.0f}K {json_size / binary_size:>7.1f}x")
+    print(f"\nlazy open + 1 character: {lazy_time * 1e3:.2f} ms")
+    print(f"journaled change: {journal_time / args.journal * 1e6:.0f} us each"
+          f"{' (fsync)' if args.sync else ''}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,128 @@
+"""Per-cast overhead of compiled spell effects.
+
+Times EffectProgram.apply for the game's own spells and items against a
+naive interpreter that re-reads the effect list and re-parses dice on
+every cast, plus batch application to Characters and to NumPy arrays.
+Each figure is the best of several runs, less the cost of the loop and
+the HP reset around each cast. Most of the gain comes from compiling
+dice; an effect without dice, like Siphon Soul's steal, costs about the
+same either way and is reported as such:
+
+    python -m benchmarks.spell_effects --casts 200000
+"""
+import argparse
+import sys
+import time
+
+import numpy as np
+
+from character_factory import CharacterFactory
+from character_model import Character
+from content import CONTENT
+from dice import parse
+
+# Per-cast budget for compiled effects
+BUDGET_NS = 750
+REPEATS = 5
+
+
+def interpret(spec, caster, target):
+    """Reference: walk the effect list and parse dice on every cast"""
+    dealt = 0
+    for op, args in spec:
+        if op == "damage":
+            amount = parse.__wrapped__(str(args[0])).roll()
+            target.hp -= amount
+            dealt += amount
+        elif op == "drain":
+            amount = parse.__wrapped__(str(args[0])).roll()
+            target.hp -= amount
+            caster.hp = min(caster.max_hp, caster.hp + amount)
+            dealt += amount
+        elif op == "steal":
+            amount = max(target.hp, 0) * args[0] // 100
+            target.hp -= amount
+            caster.hp = min(caster.max_hp, caster.hp + amount)
+            dealt += amount
+        elif op == "heal":
+            target.hp = min(target.max_hp, target.hp + parse.__wrapped__(str(args[0])).roll())
+    return dealt
+
+
+def time_per_call(func, casts):
+    """Best ns per call over REPEATS runs"""
+    best = float("inf")
+    for _ in range(REPEATS):
+        start = time.perf_counter()
+        for _ in range(casts):
+            func()
+        best = min(best, time.perf_counter() - start)
+    return best / casts * 1e9
+
+
+def characters(n):
+    roster = CharacterFactory(seed=1).generate(n)
+    return [Character.from_dict(roster.character(i)) for i in range(n)]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--casts", type=int, default=200_000)
+    parser.add_argument("--targets", type=int, default=1000)
+    args = parser.parse_args(argv)
+
+    caster, target = characters(2)
+    rows = []
+    for name in ("Crimson Lash", "Siphon Soul", "Shard of the Crimson Moon"):
+        program = CONTENT[name].program
+
+        def compiled(apply=program.apply):
+            target.hp = 10_000
+            apply(caster, target)
+
+        def interpreted(spec=program.spec):
+            target.hp = 10_000
+            interpret(spec, caster, target)
+
+        # Subtract the harness cost (the call and the HP reset) from both
+        def harness():
+            target.hp = 10_000
+
+        base = time_per_call(harness, args.casts)
+        rows.append((name, time_per_call(compiled, args.casts) - base, time_per_call(interpreted, args.casts) - base))
+
+    print(f"{'effect':<28} {'compiled ns':>12} {'interpreted ns':>15} {'speedup':>8}")
+    for name, compiled_ns, interpreted_ns in rows:
+        print(f"{name:<28} {compiled_ns:>12.0f} {interpreted_ns:>15.0f} {interpreted_ns / compiled_ns:>7.1f}x")
+
+    crowd = characters(args.targets)
+    lash = CONTENT["Crimson Lash"].program
+    start = time.perf_counter()
+    for _ in range(20):
+        for victim in crowd:
+            victim.hp = 10_000
+        lash.cast_many(caster, crowd)
+    per_target = (time.perf_counter() - start) / (20 * len(crowd)) * 1e9
+    print(f"\ncast_many over {len(crowd)} Characters: {per_target:.0f} ns/target (incl. HP reset)")
+
+    n = 1_000_000
+    hp = np.full(n, 10_000, dtype=np.int64)
+    max_hp = hp.copy()
+    rng = np.random.default_rng(1)
+    start = time.perf_counter()
+    lash.apply_arrays(hp, max_hp, rng=rng)
+    print(f"apply_arrays over {n:,} targets: {(time.perf_counter() - start) / n * 1e9:.1f} ns/target")
+
+    no_gain = [name for name, compiled_ns, interpreted_ns in rows if interpreted_ns < 1.5 * compiled_ns]
+    if no_gain:
+        print(f"No real gain from compiling: {', '.join(no_gain)}")
+    over = [name for name, compiled_ns, _ in rows if compiled_ns > BUDGET_NS]
+    if over:
+        print(f"Over the {BUDGET_NS}ns budget: {', '.join(over)}")
+        return 1
+    print(f"All compiled effects within the {BUDGET_NS}ns budget")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,17 +1,18 @@
 import pygame
 import random
 import math
+from scenes import Scene
+from dark_classes import DARK_CLASSES, DARK_TITLES
+from character_factory import CURSED_STAT_DICE, roll_stats, create_character
+from particles import BloodParticles
 from utils import (
-    # Visual Effects
-    blood_drip_effect,
-    fade_in,
-    
     # Text & UI
     draw_blood_text,
     garnet_button,
     draw_tooltip,
     center_horizontal,
-    blood_text_animation,
+    BloodTextAnimation,
+    render_text,
     
     # Audio
     load_sound,
@@ -26,43 +27,17 @@ class ShadowbornCreation:
     # ======================
     # CLASS CONSTANTS
     # ======================
-    DARK_TITLES = [
-        "the Bloodsoaked",
-        "of the Crimson Veil",
-        "the Garnet Ghost",
-        "Bearer of the Dark Shard",
-        "the Void-Touched"
-    ]
-
-    DARK_CLASSES = {
-        "Bloodmancer": {
-            "stats": {"STR": 1, "DEX": 2, "CON": 2, "INT": 4, "WIS": 3, "CHA": 1},
-            "desc": "Master of hemomancy\nExcels at blood magic\nWeak in melee combat",
-            "color": (120, 0, 30)
-        },
-        "Nightblade": {
-            "stats": {"STR": 3, "DEX": 4, "CON": 2, "INT": 1, "WIS": 1, "CHA": 2},
-            "desc": "Shadowy assassin\nHigh critical chance\nLow magical defense",
-            "color": (30, 0, 60)
-        },
-        "Harbinger": {
-            "stats": {"STR": 2, "DEX": 1, "CON": 4, "INT": 2, "WIS": 3, "CHA": 1},
-            "desc": "Tanky frontline fighter\nHigh health pool\nSlow movement speed",
-            "color": (60, 30, 0)
-        },
-        "Garnet Apostle": {
-            "stats": {"STR": 1, "DEX": 2, "CON": 3, "INT": 3, "WIS": 4, "CHA": 0},
-            "desc": "Garnet magic specialist\nBalanced abilities\nNo charisma",
-            "color": (90, 0, 0)
-        }
-    }
+    DARK_TITLES = DARK_TITLES
+    DARK_CLASSES = DARK_CLASSES
+    CURSED_STAT_DICE = CURSED_STAT_DICE
 
     # ======================
     # INITIALIZATION
     # ======================
-    def __init__(self, screen):
+    def __init__(self, screen, renderer=None):
         self.screen = screen
         self.screen_rect = screen.get_rect()
+        self.renderer = renderer
         
         # Font system
         self.blood_font = load_font("OldLondon.ttf", 40, "arial")
@@ -87,314 +62,333 @@ class ShadowbornCreation:
         self.cursor_timer = 0
         self.blood_animation_pos = 0
         self.class_selected = None
+        self.on_complete = None
 
     # ======================
-    # NAME ENTRY SYSTEM
+    # CHARACTER CREATION FLOW
     # ======================
-    def get_blood_name(self):
-        """Dark interactive name input with animated blood writing"""
-        play_music("name_entry.mp3")
-        clock = pygame.time.Clock()
+    def start(self, stack, on_complete):
+        """Push the creation scenes; on_complete(player) fires at the end"""
+        self.on_complete = on_complete
+        self.sounds['start_creation'].play()
+        stack.push(NameEntryScene(self))
+
+    def finish(self, stack):
+        """Leave the creation scenes and hand the new Shadowborn over"""
+        stack.pop()
+        self.on_complete(self.create_shadowborn())
+
+    def roll_cursed_stats(self):
+        """3d6 but lowest die becomes 6 (dark gift)"""
+        return roll_stats(self.class_selected)
+
+    def create_shadowborn(self):
+        """Build the Shadowborn from the chosen name and class"""
+        self.sounds['creation_complete'].play()
+        return create_character(self.name, self.class_selected)
+
+# ======================
+# NAME ENTRY SYSTEM
+# ======================
+class NameEntryScene(Scene):
+    """Dark interactive name input with animated blood writing"""
+    name = "name_entry"
+
+    def __init__(self, creator):
+        super().__init__()
+        self.creator = creator
         input_width = 500
-        input_rect = pygame.Rect(
-            self.screen_rect.centerx - input_width//2, 
-            self.screen_rect.centery, 
+        self.input_rect = pygame.Rect(
+            creator.screen_rect.centerx - input_width//2, 
+            creator.screen_rect.centery, 
             input_width, 
             60
         )
         
         # Animation variables
-        blood_surface = pygame.Surface((input_width, 60), pygame.SRCALPHA)
-        animation_complete = False
+        self.name_text = BloodTextAnimation(creator.blood_font, (200, 30, 50))
+        self.name_text.set_text(creator.name)
+        self.animation_complete = False
+        self.drips = BloodParticles(creator.screen.get_size())
+
+    def enter(self):
+        play_music("name_entry.mp3")
+
+    def exit(self):
+        stop_music()
+
+    def handle_event(self, event):
+        creator = self.creator
+        if event.type != pygame.KEYDOWN:
+            return
         
-        while not self.name_entry_complete:
-            dt = clock.tick(60) / 1000.0
-            self.cursor_timer += dt
-            
-            # Event handling
-            for event in pygame.event.get():
-                if event.type == pygame.QUIT:
-                    return None
-                
-                if event.type == pygame.KEYDOWN:
-                    if event.key == pygame.K_RETURN:
-                        if self.name:  # Has name
-                            if self.confirm_name():
-                                self.name_entry_complete = True
-                                self.sounds['name_confirm'].play()
-                        else:  # No name - auto accept as Rouge
-                            self.name = f"Rouge {random.choice(self.DARK_TITLES)}"
-                            self.name_entry_complete = True
-                            self.sounds['confirm'].play()
-                    elif event.key == pygame.K_BACKSPACE:
-                        self.name = self.name[:-1]
-                        blood_surface.fill((0, 0, 0, 0))
-                        animation_complete = False
-                    elif event.unicode.isalnum() and len(self.name) < 12:
-                        self.name += event.unicode
-                        animation_complete = False
-            
-            # Animation logic
-            if not animation_complete and self.name:
-                blood_surface = blood_text_animation(
-                    self.name, 
-                    self.blood_font, 
-                    min(self.blood_animation_pos, len(self.name)),
-                    (200, 30, 50)
-                )
-                self.blood_animation_pos += dt * 10
-                if self.blood_animation_pos >= len(self.name):
-                    animation_complete = True
-                    self.sounds['drip'].play()
-            
-            # Rendering
-            self.screen.fill((20, 0, 10))
-            blood_drip_effect(self.screen)
-            
-            # Title
-            title = self.title_font.render("NAME YOUR SHADOWBORN", True, (180, 0, 30))
-            title_pos = center_horizontal(title, self.screen_rect, -150)
-            self.screen.blit(title, title_pos)
-            
-            # Input box
-            pygame.draw.rect(self.screen, (80, 0, 0), input_rect, 3)
-            
-            # Blood drips
-            for i in range(3):
-                pygame.draw.line(
-                    self.screen, (120, 0, 0),
-                    (input_rect.left + 50 + i*100, input_rect.bottom),
-                    (input_rect.left + 70 + i*100, input_rect.bottom + 20),
-                    2
-                )
-            
-            # Animated text
-            if self.name:
-                self.screen.blit(blood_surface, (input_rect.left + 20, input_rect.centery - 20))
-            
-            # Cursor
-            if self.cursor_timer % 1.0 < 0.5 and not animation_complete:
-                cursor_x = input_rect.left + 20 + self.blood_font.size(self.name[:int(self.blood_animation_pos)])[0]
-                pygame.draw.line(
-                    self.screen, (200, 0, 0),
-                    (cursor_x, input_rect.centery - 20),
-                    (cursor_x, input_rect.centery + 20),
-                    3
-                )
-            
-            # Prompt
-            prompt_text = "Press ENTER to confirm" if self.name else "Press ENTER to be named Rouge"
-            prompt = self.blood_font.render(prompt_text, True, (100, 0, 20))
-            prompt_pos = center_horizontal(prompt, self.screen_rect, 150)
-            self.screen.blit(prompt, prompt_pos)
-            
-            pygame.display.flip()
+        if event.key == pygame.K_RETURN:
+            if creator.name:  # Has name
+                self.stack.push(ConfirmNameScene(creator, self.name_confirmed))
+            else:  # No name - auto accept as Rouge
+                creator.name = f"Rouge {random.choice(creator.DARK_TITLES)}"
+                creator.sounds['confirm'].play()
+                self.complete()
+        elif event.key == pygame.K_BACKSPACE:
+            creator.name = creator.name[:-1]
+            self.name_text.set_text(creator.name)
+            self.animation_complete = False
+        elif event.unicode.isalnum() and len(creator.name) < 12:
+            creator.name += event.unicode
+            self.name_text.set_text(creator.name)
+            self.animation_complete = False
+
+    def name_confirmed(self):
+        self.creator.sounds['name_confirm'].play()
+        self.complete()
+
+    def complete(self):
+        self.creator.name_entry_complete = True
+        self.stack.replace(ClassSelectScene(self.creator))
+
+    def update(self, dt):
+        creator = self.creator
+        creator.cursor_timer += dt
+        self.drips.maintain_drips(30)
+        self.drips.update(dt)
         
-        stop_music()
-        return self.name
+        # Animation logic
+        if not self.animation_complete and creator.name:
+            self.name_text.update(min(creator.blood_animation_pos, len(creator.name)))
+            creator.blood_animation_pos += dt * 10
+            if creator.blood_animation_pos >= len(creator.name):
+                self.animation_complete = True
+                creator.sounds['drip'].play()
+
+    def render(self, surface, alpha=1.0):
+        creator = self.creator
+        input_rect = self.input_rect
+        surface.fill((20, 0, 10))
+        self.drips.render(surface)
+        
+        # Title
+        title = render_text(creator.title_font, "NAME YOUR SHADOWBORN", (180, 0, 30))
+        title_pos = center_horizontal(title, creator.screen_rect, -150)
+        surface.blit(title, title_pos)
+        
+        # Input box
+        pygame.draw.rect(surface, (80, 0, 0), input_rect, 3)
+        
+        # Blood drips
+        for i in range(3):
+            pygame.draw.line(
+                surface, (120, 0, 0),
+                (input_rect.left + 50 + i*100, input_rect.bottom),
+                (input_rect.left + 70 + i*100, input_rect.bottom + 20),
+                2
+            )
+        
+        # Animated text
+        if creator.name:
+            surface.blit(self.name_text.surface, (input_rect.left + 20, input_rect.centery - 20))
+        
+        # Cursor
+        if creator.cursor_timer % 1.0 < 0.5 and not self.animation_complete:
+            cursor_x = input_rect.left + 20 + self.name_text.offsets[min(int(creator.blood_animation_pos), len(creator.name))]
+            pygame.draw.line(
+                surface, (200, 0, 0),
+                (cursor_x, input_rect.centery - 20),
+                (cursor_x, input_rect.centery + 20),
+                3
+            )
+        
+        # Prompt
+        prompt_text = "Press ENTER to confirm" if creator.name else "Press ENTER to be named Rouge"
+        prompt = render_text(creator.blood_font, prompt_text, (100, 0, 20))
+        prompt_pos = center_horizontal(prompt, creator.screen_rect, 150)
+        surface.blit(prompt, prompt_pos)
 
-    def confirm_name(self):
-        """Enhanced confirmation screen with sound"""
+
+class ConfirmNameScene(Scene):
+    """Enhanced confirmation screen with sound"""
+    name = "confirm_name"
+
+    def __init__(self, creator, on_confirm):
+        super().__init__()
+        self.creator = creator
+        self.on_confirm = on_confirm
         confirm_width, confirm_height = 600, 400
-        confirm_rect = pygame.Rect(
-            self.screen_rect.centerx - confirm_width//2,
-            self.screen_rect.centery - confirm_height//2,
+        self.confirm_rect = pygame.Rect(
+            creator.screen_rect.centerx - confirm_width//2,
+            creator.screen_rect.centery - confirm_height//2,
             confirm_width,
             confirm_height
         )
+        self.pulse = 0
+        self.dt = 0.0
+
+    def enter(self):
+        self.creator.sounds['confirm'].play()
+
+    def handle_event(self, event):
+        if event.type != pygame.KEYDOWN:
+            return
+        if event.key == pygame.K_y:
+            self.stack.pop()
+            self.on_confirm()
+        elif event.key == pygame.K_n:
+            self.creator.sounds['deny'].play()
+            self.stack.pop()
+
+    def update(self, dt):
+        self.dt = dt
+        self.pulse = (self.pulse + dt * 2) % 6.28
+
+    def render(self, surface, alpha=1.0):
+        creator = self.creator
+        confirm_rect = self.confirm_rect
+        # Interpolate the pulse between fixed updates
+        pulse = self.pulse + alpha * self.dt * 2
+        surface.fill((15, 0, 10))
         
-        clock = pygame.time.Clock()
-        pulse = 0
-        confirmed = False
+        # Pulsing border
+        pygame.draw.rect(
+            surface, 
+            (150 + int(50 * abs(math.sin(pulse))), 0, 30), 
+            confirm_rect.inflate(20, 20), 
+            5
+        )
         
-        self.sounds['confirm'].play()
+        # Dialog background
+        pygame.draw.rect(surface, (0, 0, 0, 200), confirm_rect)
         
-        while not confirmed:
-            dt = clock.tick(60) / 1000.0
-            pulse = (pulse + dt * 2) % 6.28
-            
-            for event in pygame.event.get():
-                if event.type == pygame.QUIT:
-                    return False
-                if event.type == pygame.KEYDOWN:
-                    if event.key == pygame.K_y:
-                        confirmed = True
-                        return True
-                    elif event.key == pygame.K_n:
-                        self.sounds['deny'].play()
-                        return False
-            
-            # Rendering
-            self.screen.fill((15, 0, 10))
-            
-            # Pulsing border
-            pygame.draw.rect(
-                self.screen, 
-                (150 + int(50 * abs(math.sin(pulse))), 0, 30), 
-                confirm_rect.inflate(20, 20), 
-                5
-            )
-            
-            # Dialog background
-            pygame.draw.rect(self.screen, (0, 0, 0, 200), confirm_rect)
-            
-            # Question text (positioned above garnet)
-            question = self.title_font.render(f"Accept {self.name}?", True, (180, 0, 30))
-            question_pos = (confirm_rect.centerx - question.get_width()//2, confirm_rect.top + 50)
-            self.screen.blit(question, question_pos)
-            
-            # Prompt text (positioned below garnet)
-            prompt = self.blood_font.render("(Y) Blood Oath  (N) Deny Name", True, (120, 0, 20))
-            prompt_pos = (confirm_rect.centerx - prompt.get_width()//2, confirm_rect.bottom - 80)
-            self.screen.blit(prompt, prompt_pos)
-            
-            # Animated garnet (centered)
-            size = 30 + int(10 * math.sin(pulse * 2))
-            points = [
-                (confirm_rect.centerx, confirm_rect.centery - size),
-                (confirm_rect.centerx + size, confirm_rect.centery),
-                (confirm_rect.centerx, confirm_rect.centery + size),
-                (confirm_rect.centerx - size, confirm_rect.centery)
-            ]
-            pygame.draw.polygon(
-                self.screen, 
-                (180, 0, 30), 
-                points
-            )
-            
-            pygame.display.flip()
+        # Question text (positioned above garnet)
+        question = render_text(creator.title_font, f"Accept {creator.name}?", (180, 0, 30))
+        question_pos = (confirm_rect.centerx - question.get_width()//2, confirm_rect.top + 50)
+        surface.blit(question, question_pos)
+        
+        # Prompt text (positioned below garnet)
+        prompt = render_text(creator.blood_font, "(Y) Blood Oath  (N) Deny Name", (120, 0, 20))
+        prompt_pos = (confirm_rect.centerx - prompt.get_width()//2, confirm_rect.bottom - 80)
+        surface.blit(prompt, prompt_pos)
+        
+        # Animated garnet (centered)
+        size = 30 + int(10 * math.sin(pulse * 2))
+        points = [
+            (confirm_rect.centerx, confirm_rect.centery - size),
+            (confirm_rect.centerx + size, confirm_rect.centery),
+            (confirm_rect.centerx, confirm_rect.centery + size),
+            (confirm_rect.centerx - size, confirm_rect.centery)
+        ]
+        pygame.draw.polygon(
+            surface, 
+            (180, 0, 30), 
+            points
+        )
 
-    # ======================
-    # CLASS SELECTION SYSTEM
-    # ======================
-    def select_dark_class(self):
-        """Class selection with tooltips"""
-        play_music("class_select.mp3")
-        clock = pygame.time.Clock()
+# ======================
+# CLASS SELECTION SYSTEM
+# ======================
+class ClassSelectScene(Scene):
+    """Class selection with tooltips"""
+    name = "class_select"
+
+    def __init__(self, creator):
+        super().__init__()
+        self.creator = creator
+        screen_rect = creator.screen_rect
         
         # Create buttons
-        buttons = []
-        for i, (class_name, data) in enumerate(self.DARK_CLASSES.items()):
+        self.buttons = []
+        for i, (class_name, data) in enumerate(creator.DARK_CLASSES.items()):
             btn_rect = pygame.Rect(0, 0, 300, 80)
             
             # Position in a 2x2 grid
             if i < 2:
-                btn_rect.center = (self.screen_rect.centerx - 200, self.screen_rect.centery - 100 + i*200)
+                btn_rect.center = (screen_rect.centerx - 200, screen_rect.centery - 100 + i*200)
             else:
-                btn_rect.center = (self.screen_rect.centerx + 200, self.screen_rect.centery - 100 + (i-2)*200)
+                btn_rect.center = (screen_rect.centerx + 200, screen_rect.centery - 100 + (i-2)*200)
             
-            buttons.append({
+            self.buttons.append({
                 "rect": btn_rect,
                 "class": class_name,
                 "color": data["color"],
                 "desc": data["desc"]
             })
-        
-        selecting = True
-        hovered_class = None
-        
-        while selecting:
-            mouse_pos = pygame.mouse.get_pos()
-            hovered_class = None
-            
-            for event in pygame.event.get():
-                if event.type == pygame.QUIT:
-                    return None
-                
-                if event.type == pygame.MOUSEBUTTONDOWN:
-                    for btn in buttons:
-                        if btn["rect"].collidepoint(mouse_pos):
-                            self.class_selected = btn["class"]
-                            selecting = False
-                            self.sounds['class_select'].play()
-            
-            # Check hover state
-            for btn in buttons:
-                if btn["rect"].collidepoint(mouse_pos):
-                    hovered_class = btn
-            
-            # Rendering
-            self.screen.fill((15, 0, 10))
-            
-            # Title
-            title = self.title_font.render("CHOOSE YOUR DAMNATION", True, (180, 0, 30))
-            title_pos = center_horizontal(title, self.screen_rect, -200)
-            self.screen.blit(title, title_pos)
-            
-            # Draw buttons
-            for btn in buttons:
-                # Button base
-                pygame.draw.rect(self.screen, btn["color"], btn["rect"])
-                pygame.draw.rect(self.screen, (40, 0, 0), btn["rect"], 3)
-                
-                # Class name
-                class_text = self.blood_font.render(btn["class"], True, (220, 220, 220))
-                class_pos = (btn["rect"].centerx - class_text.get_width()//2, 
-                            btn["rect"].centery - class_text.get_height()//2)
-                self.screen.blit(class_text, class_pos)
-                
-                # Garnet icon
-                garnet_size = 15
-                pygame.draw.polygon(
-                    self.screen, (180, 0, 30),
-                    [
-                        (btn["rect"].centerx, btn["rect"].top + garnet_size),
-                        (btn["rect"].right - garnet_size, btn["rect"].centery),
-                        (btn["rect"].centerx, btn["rect"].bottom - garnet_size),
-                        (btn["rect"].left + garnet_size, btn["rect"].centery)
-                    ]
-                )
-            
-            # Draw tooltip if hovering
-            if hovered_class:
-                draw_tooltip(
-                    self.screen,
-                    hovered_class["desc"],
-                    (mouse_pos[0] + 20, mouse_pos[1] + 20),
-                    self.tooltip_font
-                )
-            
-            pygame.display.flip()
-            clock.tick(60)
-        
+        self.hovered_class = None
+        self.mouse_pos = (0, 0)
+
+    def enter(self):
+        self.mouse_pos = pygame.mouse.get_pos()
+        play_music("class_select.mp3")
+
+    def exit(self):
         stop_music()
-        return self.class_selected
 
-    # ======================
-    # CHARACTER CREATION FLOW
-    # ======================
-    def roll_cursed_stats(self):
-        """3d6 but lowest die becomes 6 (dark gift)"""
-        stats = {}
-        for stat in ["STR", "DEX", "CON", "INT", "WIS", "CHA"]:
-            rolls = sorted([random.randint(1, 6) for _ in range(3)])
-            rolls[0] = 6  # Dark blessing
-            stats[stat] = sum(rolls) + self.DARK_CLASSES[self.class_selected]["stats"][stat]
-        return stats
+    def handle_event(self, event):
+        if event.type == pygame.MOUSEMOTION:
+            self.mouse_pos = event.pos
+        elif event.type == pygame.MOUSEBUTTONDOWN:
+            self.mouse_pos = event.pos
+            for btn in self.buttons:
+                if btn["rect"].collidepoint(event.pos):
+                    self.creator.class_selected = btn["class"]
+                    self.creator.sounds['class_select'].play()
+                    self.creator.finish(self.stack)
+                    return
 
-    def create_shadowborn(self):
-        """Complete character creation flow"""
-        self.sounds['start_creation'].play()
-        name = self.get_blood_name()
-        if name is None:  # User quit during name entry
-            return None
+    def update(self, dt):
+        # Check hover state
+        self.hovered_class = None
+        for btn in self.buttons:
+            if btn["rect"].collidepoint(self.mouse_pos):
+                self.hovered_class = btn
+
+    def render(self, surface, alpha=1.0):
+        renderer = self.creator.renderer
         
-        dark_class = self.select_dark_class()
-        if dark_class is None:  # User quit during class selection
-            return None
+        # Title and buttons are cached, only the tooltip moves
+        if renderer:
+            renderer.begin_frame("class_select", self.draw_background)
+        else:
+            self.draw_background(surface)
         
-        self.sounds['creation_complete'].play()
+        # Draw tooltip if hovering
+        if self.hovered_class:
+            tooltip_rect = draw_tooltip(
+                surface,
+                self.hovered_class["desc"],
+                (self.mouse_pos[0] + 20, self.mouse_pos[1] + 20),
+                self.creator.tooltip_font
+            )
+            if renderer:
+                renderer.add_dynamic(tooltip_rect)
+
+    def draw_background(self, surface):
+        """Static class selection layers: title and class buttons"""
+        creator = self.creator
+        surface.fill((15, 0, 10))
+        
+        # Title
+        title = render_text(creator.title_font, "CHOOSE YOUR DAMNATION", (180, 0, 30))
+        title_pos = center_horizontal(title, creator.screen_rect, -200)
+        surface.blit(title, title_pos)
         
-        return {
-            "name": name,
-            "class": dark_class,
-            "stats": self.roll_cursed_stats(),
-            "crimson_tears": 3,
-            "garnet_shards": 1,
-            "inventory": {
-                "weapons": ["Rusty Dagger"],
-                "armor": ["Tattered Robes"],
-                "relics": [],
-                "gold": random.randint(5, 20)
-            }
-        }
\ No newline at end of file
+        # Draw buttons
+        for btn in self.buttons:
+            # Button base
+            pygame.draw.rect(surface, btn["color"], btn["rect"])
+            pygame.draw.rect(surface, (40, 0, 0), btn["rect"], 3)
+            
+            # Class name
+            class_text = render_text(creator.blood_font, btn["class"], (220, 220, 220))
+            class_pos = (btn["rect"].centerx - class_text.get_width()//2, 
+                        btn["rect"].centery - class_text.get_height()//2)
+            surface.blit(class_text, class_pos)
+            
+            # Garnet icon
+            garnet_size = 15
+            pygame.draw.polygon(
+                surface, (180, 0, 30),
+                [
+                    (btn["rect"].centerx, btn["rect"].top + garnet_size),
+                    (btn["rect"].right - garnet_size, btn["rect"].centery),
+                    (btn["rect"].centerx, btn["rect"].bottom - garnet_size),
+                    (btn["rect"].left + garnet_size, btn["rect"].centery)
+                ]
+            )
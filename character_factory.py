@@ -0,0 +1,131 @@
+"""UI-free Shadowborn generation, one at a time or in vectorized batches.
+
+create_character() builds the same dict ShadowbornCreation hands to the
+game. CharacterFactory.generate() rolls whole rosters at once as columns
+of NumPy arrays, for stat-distribution studies and save-file load tests:
+
+    roster = CharacterFactory(seed=7).generate(1_000_000)
+    roster.stat("DEX").mean(), roster.character(0)
+"""
+import copy
+import random
+
+import numpy as np
+
+from dark_classes import DARK_CLASSES, DARK_TITLES, STAT_NAMES, STARTING_INVENTORY
+from dice import parse
+
+# 3d6 with the lowest die turned to 6 (dark gift)
+CURSED_STAT_DICE = parse("3d6sl6")
+STARTING_GOLD_DICE = parse("1d16+4")
+CRIMSON_TEARS = 3
+GARNET_SHARDS = 1
+
+CLASS_NAMES = tuple(DARK_CLASSES)
+# (classes, stats) table of class bonuses, row order matching CLASS_NAMES
+CLASS_BONUSES = np.array(
+    [[DARK_CLASSES[name]["stats"][stat] for stat in STAT_NAMES] for name in CLASS_NAMES],
+    dtype=np.int16
+)
+
+# ======================
+# ONE CHARACTER
+# ======================
+def roll_stats(class_name, rng=random):
+    """Cursed stats for one character of class_name"""
+    bonuses = DARK_CLASSES[class_name]["stats"]
+    return {stat: CURSED_STAT_DICE.roll(rng) + bonuses[stat] for stat in STAT_NAMES}
+
+
+def create_character(name, class_name, rng=random):
+    """A new Shadowborn dict, as produced at the end of character creation"""
+    inventory = copy.deepcopy(STARTING_INVENTORY)
+    inventory["gold"] = STARTING_GOLD_DICE.roll(rng)
+    return {
+        "name": name,
+        "class": class_name,
+        "stats": roll_stats(class_name, rng),
+        "crimson_tears": CRIMSON_TEARS,
+        "garnet_shards": GARNET_SHARDS,
+        "inventory": inventory
+    }
+
+# ======================
+# ROSTERS
+# ======================
+class Roster:
+    """A batch of characters stored column-wise.
+
+    class_ids index CLASS_NAMES, title_ids index DARK_TITLES, and stats is
+    an (n, 6) array in STAT_NAMES order. Dicts are only built on request.
+    """
+    def __init__(self, class_ids, stats, gold, title_ids, name_prefix="Shadowborn"):
+        self.class_ids = class_ids
+        self.stats = stats
+        self.gold = gold
+        self.title_ids = title_ids
+        self.name_prefix = name_prefix
+
+    def __len__(self):
+        return len(self.class_ids)
+
+    def stat(self, name):
+        """One stat column"""
+        return self.stats[:, STAT_NAMES.index(name)]
+
+    def class_mask(self, class_name):
+        return self.class_ids == CLASS_NAMES.index(class_name)
+
+    def name(self, i):
+        return f"{self.name_prefix} {i} {DARK_TITLES[self.title_ids[i]]}"
+
+    def character(self, i):
+        """Character i as a game dict"""
+        inventory = copy.deepcopy(STARTING_INVENTORY)
+        inventory["gold"] = int(self.gold[i])
+        return {
+            "name": self.name(i),
+            "class": CLASS_NAMES[self.class_ids[i]],
+            "stats": dict(zip(STAT_NAMES, self.stats[i].tolist())),
+            "crimson_tears": CRIMSON_TEARS,
+            "garnet_shards": GARNET_SHARDS,
+            "inventory": inventory
+        }
+
+    def characters(self, start=0, stop=None):
+        """Game dicts for a slice of the roster"""
+        stop = len(self) if stop is None else min(stop, len(self))
+        return [self.character(i) for i in range(start, stop)]
+
+
+class CharacterFactory:
+    """Seedable bulk character generator"""
+    def __init__(self, seed=None):
+        self.rng = np.random.default_rng(seed)
+
+    def class_ids(self, n, classes=None, weights=None):
+        """n class indices; classes may be one name, several names or None for all"""
+        if isinstance(classes, str):
+            return np.full(n, CLASS_NAMES.index(classes), dtype=np.uint8)
+        pool = np.array([CLASS_NAMES.index(c) for c in (classes or CLASS_NAMES)], dtype=np.uint8)
+        if weights is not None:
+            weights = np.asarray(weights, dtype=np.float64)
+            return self.rng.choice(pool, size=n, p=weights / weights.sum())
+        return pool[self.rng.integers(0, len(pool), n)]
+
+    def roll_stats(self, class_ids):
+        """(n, 6) cursed stats for the given class indices"""
+        stats = CURSED_STAT_DICE.sample((len(class_ids), len(STAT_NAMES)), self.rng).astype(np.int16)
+        stats += CLASS_BONUSES[class_ids]
+        return stats
+
+    def generate(self, n, classes=None, weights=None, name_prefix="Shadowborn"):
+        """Roll n characters in one vectorized pass"""
+        class_ids = self.class_ids(n, classes, weights)
+        return Roster(
+            class_ids,
+            self.roll_stats(class_ids),
+            STARTING_GOLD_DICE.sample(n, self.rng).astype(np.int16),
+            self.rng.integers(0, len(DARK_TITLES), n, dtype=np.uint8),
+            name_prefix
+        )
@@ -0,0 +1,326 @@
+"""Compact Character and Inventory objects with cached derived stats.
+
+Both classes use __slots__, so thousands of NPCs cost a few small objects
+each instead of nests of dicts. A Character keeps only its own inputs:
+stat rolls, corrupt_stat drains, curses and inventory. Effective stats,
+max HP, attack bonus and relic curses are derived from those plus class
+bonuses and relics, cached, and recomputed only after something marks
+the character dirty.
+"""
+import random
+
+from dark_classes import DARK_CLASSES, STAT_NAMES, STARTING_INVENTORY
+from content import CONTENT
+from utils import corrupt_stat
+
+BASE_HP = 20
+HP_PER_CON = 2
+# shadow_strike bonus for carrying a Garnet Shard
+SHARD_BONUS = 3
+SHARD_ITEM = "Garnet Shard"
+
+_STAT_INDEX = {stat: i for i, stat in enumerate(STAT_NAMES)}
+_NO_DRAINS = (0,) * len(STAT_NAMES)
+
+SLOT_FOR_TYPE = {"weapon": "weapon", "armor": "armor"}
+# Save-format inventory lists and the item type each holds
+TYPE_FOR_LIST = {"weapons": "weapon", "armor": "armor", "relics": "relic", "potions": "potion"}
+LIST_FOR_TYPE = {kind: key for key, kind in TYPE_FOR_LIST.items()}
+
+
+class Inventory:
+    """Counted multiset of carried items plus equip slots.
+
+    Items are keyed by name with a count and a type, so contains, count
+    and slot queries are dict lookups however many relics are carried.
+    Types come from the content registry, or from the caller for items it
+    doesn't know. Weapons and armor work once equipped; relics work while
+    carried. Changes invalidate the owner's derived stats.
+    """
+    __slots__ = ("gold", "_items", "_equipped", "_owner")
+
+    def __init__(self, gold=0):
+        self.gold = gold
+        # name -> (count, type)
+        self._items = {}
+        # slot -> name
+        self._equipped = {}
+        self._owner = None
+
+    def _changed(self):
+        if self._owner is not None:
+            self._owner.invalidate()
+
+    # ======================
+    # CONTENTS
+    # ======================
+    def add(self, item, count=1, type=None):
+        """Add count copies of item; type is needed only for unregistered items"""
+        if count < 1:
+            raise ValueError("count must be positive")
+        held, kind = self._items.get(item, (0, None))
+        if kind is None:
+            entry = CONTENT.get(item)
+            kind = entry.type if entry is not None else (type or "relic")
+        self._items[item] = (held + count, kind)
+        self._changed()
+
+    def remove(self, item, count=1):
+        """Remove count copies; the last copy also leaves its equip slot"""
+        held, kind = self._items.get(item, (0, None))
+        if held < count:
+            raise KeyError(f"{item!r}: have {held}, tried to remove {count}")
+        if held == count:
+            del self._items[item]
+            slot = self.slot_of(item)
+            if slot is not None:
+                del self._equipped[slot]
+        else:
+            self._items[item] = (held - count, kind)
+        self._changed()
+
+    def __contains__(self, item):
+        return item in self._items
+
+    def __len__(self):
+        return sum(count for count, _ in self._items.values())
+
+    def count(self, item):
+        return self._items.get(item, (0, None))[0]
+
+    def type_of(self, item):
+        return self._items.get(item, (0, None))[1]
+
+    def distinct(self):
+        """Names of carried items, each once"""
+        return list(self._items)
+
+    def of_type(self, kind):
+        return [item for item, (_, item_type) in self._items.items() if item_type == kind]
+
+    # ======================
+    # EQUIPMENT
+    # ======================
+    def equip(self, item):
+        """Put a carried weapon or armor in its slot; returns the slot"""
+        kind = self.type_of(item)
+        if kind is None:
+            raise KeyError(f"{item!r} is not carried")
+        slot = SLOT_FOR_TYPE.get(kind)
+        if slot is None:
+            raise ValueError(f"{item!r} ({kind}) can't be equipped")
+        self._equipped[slot] = item
+        self._changed()
+        return slot
+
+    def unequip(self, slot):
+        if self._equipped.pop(slot, None) is not None:
+            self._changed()
+
+    def equipped(self, slot):
+        return self._equipped.get(slot)
+
+    def slot_of(self, item):
+        """Slot item is equipped in, or None"""
+        for slot, equipped in self._equipped.items():
+            if equipped == item:
+                return slot
+        return None
+
+    def active_items(self):
+        """Items whose effects apply: equipped gear and every carried relic"""
+        return list(self._equipped.values()) + self.of_type("relic")
+
+    # ======================
+    # CONVERSION
+    # ======================
+    def entries(self):
+        """(item, count, type, equipped) for every carried item"""
+        equipped = set(self._equipped.values())
+        return [(item, count, kind, item in equipped) for item, (count, kind) in self._items.items()]
+
+    @classmethod
+    def from_entries(cls, gold, entries):
+        """Inverse of entries(); stored types are trusted as they are"""
+        inventory = cls(gold)
+        items, slots = inventory._items, inventory._equipped
+        for item, count, kind, equipped in entries:
+            items[item] = (count, kind)
+            if equipped:
+                slots[SLOT_FOR_TYPE[kind]] = item
+        return inventory
+
+    def to_dict(self):
+        """Save-format lists, equipped items first"""
+        data = {"weapons": [], "armor": [], "relics": [], "gold": self.gold}
+        equipped = set(self._equipped.values())
+        for item, (count, kind) in sorted(self._items.items(), key=lambda pair: pair[0] not in equipped):
+            data.setdefault(LIST_FOR_TYPE.get(kind, "relics"), []).extend([item] * count)
+        return data
+
+    @classmethod
+    def from_dict(cls, data):
+        """Inverse of to_dict; the first weapon and armor listed get equipped"""
+        inventory = cls(data.get("gold", 0))
+        for key, kind in TYPE_FOR_LIST.items():
+            for item in data.get(key, ()):
+                inventory.add(item, type=kind)
+        for key in ("weapons", "armor"):
+            for item in data.get(key, ())[:1]:
+                if inventory.type_of(item) in SLOT_FOR_TYPE:
+                    inventory.equip(item)
+        return inventory
+
+
+class Character:
+    """A Shadowborn or NPC.
+
+    `rolls` are the six rolled stats before class bonuses, in STAT_NAMES
+    order, and `drains` the accumulated corrupt_stat changes.
+    """
+    __slots__ = (
+        "name", "class_name", "rolls", "drains", "curses", "inventory", "hp", "max_hp_bonus",
+        "crimson_tears", "garnet_shards",
+        "_dirty", "_stat_values", "_max_hp", "_attack_bonus", "_relic_curses"
+    )
+
+    def __init__(self, name, class_name, rolls, inventory=None, hp=None, drains=None, curses=(),
+                 crimson_tears=3, garnet_shards=1, max_hp_bonus=0):
+        if class_name not in DARK_CLASSES:
+            raise ValueError(f"unknown class {class_name!r}")
+        self.name = name
+        self.class_name = class_name
+        self.rolls = tuple(rolls)
+        # Most characters are never drained or cursed, so these stay shared
+        self.drains = tuple(drains) if drains and any(drains) else _NO_DRAINS
+        self.curses = tuple(curses)
+        self.inventory = inventory if inventory is not None else Inventory()
+        self.inventory._owner = self
+        self.crimson_tears = crimson_tears
+        self.garnet_shards = garnet_shards
+        # Permanent max HP changes, e.g. from Vial of Forbidden Life
+        self.max_hp_bonus = max_hp_bonus
+        self._dirty = True
+        self.hp = self.max_hp if hp is None else hp
+
+    # ======================
+    # DERIVED STATS
+    # ======================
+    def invalidate(self):
+        """Mark derived values stale; they are recomputed on next access"""
+        self._dirty = True
+
+    def _refresh(self):
+        bonuses = DARK_CLASSES[self.class_name]["stats"]
+        values = tuple(
+            roll + bonuses[stat] + drain
+            for stat, roll, drain in zip(STAT_NAMES, self.rolls, self.drains)
+        )
+        active = [CONTENT[item] for item in self.inventory.active_items() if item in CONTENT]
+
+        self._stat_values = values
+        self._max_hp = max(1, BASE_HP + HP_PER_CON * values[_STAT_INDEX["CON"]] + self.max_hp_bonus)
+        self._attack_bonus = values[_STAT_INDEX["DEX"]] // 2 + (SHARD_BONUS if SHARD_ITEM in self.inventory else 0)
+        self._relic_curses = tuple(entry.curse for entry in active if entry.curse)
+        self._dirty = False
+
+    @property
+    def stats(self):
+        """Effective stats as a new {name: value} dict"""
+        if self._dirty:
+            self._refresh()
+        return dict(zip(STAT_NAMES, self._stat_values))
+
+    def stat(self, name):
+        if self._dirty:
+            self._refresh()
+        return self._stat_values[_STAT_INDEX[name]]
+
+    @property
+    def max_hp(self):
+        if self._dirty:
+            self._refresh()
+        return self._max_hp
+
+    @property
+    def attack_bonus(self):
+        """Flat bonus added to shadow_strike damage rolls.
+
+        DEX // 2, plus SHARD_BONUS for a carried Garnet Shard. Weapon and
+        relic damage comes from their effect programs, not from here.
+        """
+        if self._dirty:
+            self._refresh()
+        return self._attack_bonus
+
+    @property
+    def active_curses(self):
+        """Curses laid on the character plus those carried by its relics"""
+        if self._dirty:
+            self._refresh()
+        return self.curses + self._relic_curses
+
+    # ======================
+    # CHANGES
+    # ======================
+    def drain(self, stat=None, rng=random):
+        """Apply corrupt_stat to one stat (random if None); returns the change"""
+        stat = stat or rng.choice(STAT_NAMES)
+        current = self.stat(stat)
+        change = corrupt_stat(current, rng) - current
+        drains = list(self.drains)
+        drains[_STAT_INDEX[stat]] += change
+        self.drains = tuple(drains)
+        self.invalidate()
+        return change
+
+    def add_curse(self, curse):
+        self.curses += (curse,)
+        self.invalidate()
+
+    def heal(self, amount):
+        self.hp = min(self.max_hp, self.hp + amount)
+
+    @property
+    def alive(self):
+        return self.hp > 0
+
+    # ======================
+    # CONVERSION
+    # ======================
+    @classmethod
+    def from_dict(cls, data):
+        """Build from the dict shape create_character() and saves use"""
+        bonuses = DARK_CLASSES[data["class"]]["stats"]
+        drains = data.get("drains") or _NO_DRAINS
+        rolls = [data["stats"][stat] - bonuses[stat] - drain for stat, drain in zip(STAT_NAMES, drains)]
+        return cls(
+            data["name"],
+            data["class"],
+            rolls,
+            Inventory.from_dict(data.get("inventory", STARTING_INVENTORY)),
+            hp=data.get("hp"),
+            drains=drains,
+            curses=data.get("curses", ()),
+            crimson_tears=data.get("crimson_tears", 3),
+            garnet_shards=data.get("garnet_shards", 1),
+            max_hp_bonus=data.get("max_hp_bonus", 0)
+        )
+
+    def to_dict(self):
+        """Plain dict with effective stats, the inverse of from_dict"""
+        return {
+            "name": self.name,
+            "class": self.class_name,
+            "stats": self.stats,
+            "hp": self.hp,
+            "drains": list(self.drains),
+            "max_hp_bonus": self.max_hp_bonus,
+            "curses": list(self.curses),
+            "crimson_tears": self.crimson_tears,
+            "garnet_shards": self.garnet_shards,
+            "inventory": self.inventory.to_dict()
+        }
+
+    def __repr__(self):
+        return f"Character({self.name!r}, {self.class_name!r}, hp={self.hp}/{self.max_hp})"
@@ -1,23 +1,52 @@
 import pygame
-import random
-from utils import blood_splatter
+from dice import parse
+from particles import GoreLayer
+
+STRIKE_DICE = parse("1d8")
 
 class BloodCombatSystem:
+    # Persistent layer strikes paint onto; created on first visible hit
+    gore_layer = None
+    gore_size = (800, 600)
+    visuals_enabled = True
+
+    @classmethod
+    def set_headless(cls, headless=True):
+        """Turn splatter generation off entirely, e.g. for simulations"""
+        cls.visuals_enabled = not headless
+
+    @classmethod
+    def splatter(cls, damage_ratio):
+        """Composite a pooled splatter stamp onto the gore layer"""
+        if not cls.visuals_enabled:
+            return None
+        if cls.gore_layer is None:
+            cls.gore_layer = GoreLayer(cls.gore_size)
+        return cls.gore_layer.splatter(damage_ratio)
+
     @staticmethod
     def shadow_strike(attacker, defender):
-        damage = random.randint(1, 8) + attacker["stats"]["DEX"] // 2
-        if "Garnet Shard" in attacker["inventory"]:
-            damage += 3
+        # DEX and Garnet Shard bonuses are cached on the Character
+        damage = STRIKE_DICE.roll() + attacker.attack_bonus
 
-        blood_splatter(defender["hp"] / defender["max_hp"])
+        BloodCombatSystem.splatter(defender.hp / defender.max_hp)
         return damage
-    
+
     @staticmethod
     def cast_necromancy(caster, target, spell):
-        cost = spell["blood_cost"]
-        if caster["hp"] < cost:
+        """Pay a spell's blood cost and apply it.
+
+        spell is a content registry entry, whose compiled effect program
+        runs against the target, or a dict with a "blood_cost" and an
+        "effect" callable taking the target.
+        """
+        cost = spell["blood_cost"] if isinstance(spell, dict) else spell.blood_cost
+        if caster.hp < cost:
             return "Not enough life force!"
-        
-        caster["hp"] -= cost
-        effect = spell["effect"](target)
-        return f"Blood ritual complete! {effect}"
\ No newline at end of file
+
+        caster.hp -= cost
+        if isinstance(spell, dict):
+            effect = spell["effect"](target)
+        else:
+            effect = f"{spell.program(caster, target)} damage"
+        return f"Blood ritual complete! {effect}"
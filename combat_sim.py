@@ -0,0 +1,261 @@
+"""Monte Carlo duel simulator for balancing the dark classes.
+
+Whole batches of duels are resolved at once: N combatants per side are
+NumPy arrays of stats and HP, and every round applies strikes, spells and
+their blood costs to all undecided duels in a few vectorized steps. The
+spell is the registry's DUEL_SPELL, cast through its compiled effect
+program with its own blood cost. The rules mirror BloodCombatSystem, and
+scalar_duel() plays the same duel through the real scalar code so the two
+can be checked against each other:
+
+    python combat_sim.py --duels 1000000
+    python combat_sim.py --verify 20000
+"""
+import argparse
+import random
+import time
+
+import numpy as np
+
+from combat import BloodCombatSystem, STRIKE_DICE
+from character_factory import CLASS_NAMES, CLASS_BONUSES, CURSED_STAT_DICE, create_character
+from character_model import BASE_HP, HP_PER_CON, SHARD_BONUS, Character
+from content import CONTENT
+
+STR, DEX, CON, INT, WIS, CHA = range(6)
+
+# ======================
+# DUEL RULES
+# ======================
+MAX_ROUNDS = 100
+DUEL_SPELL = "Crimson Lash"
+
+
+def duel_spell():
+    """The registry entry casters use in duels.
+
+    The vector engine applies its effects to targets only, so a spell
+    that heals its caster (drain, steal, lifesteal) would need more.
+    """
+    return CONTENT[DUEL_SPELL]
+
+
+def wants_spell(stats, hp, cost):
+    """Casters favour the spell while they can spare twice its cost"""
+    return stats["INT"] > stats["DEX"] and hp > 2 * cost
+
+# ======================
+# SCALAR REFERENCE
+# ======================
+def scalar_combatant(class_name):
+    """Freshly created character of class_name, at full HP"""
+    return Character.from_dict(create_character(class_name, class_name))
+
+
+def scalar_act(actor, target):
+    spell = duel_spell()
+    if wants_spell(actor.stats, actor.hp, spell.blood_cost):
+        BloodCombatSystem.cast_necromancy(actor, target, spell)
+    else:
+        target.hp -= BloodCombatSystem.shadow_strike(actor, target)
+
+
+def scalar_duel(a, b, max_rounds=MAX_ROUNDS):
+    """Fight a to the death with BloodCombatSystem; returns (winner, rounds).
+
+    winner is 0 for a, 1 for b and -1 for a draw. The higher DEX acts first
+    each round, ties decided by a coin flip.
+    """
+    if a.stat("DEX") != b.stat("DEX"):
+        a_first = a.stat("DEX") > b.stat("DEX")
+    else:
+        a_first = random.random() < 0.5
+    order = ((a, b, 0), (b, a, 1)) if a_first else ((b, a, 1), (a, b, 0))
+
+    for rounds in range(1, max_rounds + 1):
+        for actor, target, side in order:
+            scalar_act(actor, target)
+            if target.hp <= 0:
+                return side, rounds
+    return -1, max_rounds
+
+# ======================
+# VECTORIZED ENGINE
+# ======================
+def roll_stats(class_name, n, rng):
+    """(n, 6) stats: 3d6 with the lowest die turned to 6, plus class bonus"""
+    bonus = CLASS_BONUSES[CLASS_NAMES.index(class_name)]
+    return (CURSED_STAT_DICE.sample((n, 6), rng) + bonus).astype(np.int32)
+
+
+def simulate_duels(stats_a, stats_b, rng, shard_a=None, shard_b=None, max_rounds=MAX_ROUNDS):
+    """Resolve len(stats_a) duels side by side.
+
+    Returns a dict with per-duel `winner` (0, 1 or -1 for a draw) and
+    `rounds`, plus `hp_curve`: the mean HP fraction of each side after
+    every round, with finished duels held at their final HP.
+    """
+    n = len(stats_a)
+    stats = np.stack([stats_a, stats_b])
+    shard = np.zeros((2, n), dtype=np.int32)
+    if shard_a is not None:
+        shard[0] = shard_a
+    if shard_b is not None:
+        shard[1] = shard_b
+    hp = (BASE_HP + HP_PER_CON * stats[:, :, CON]).astype(np.int32)
+    max_hp = hp.copy()
+    full_hp = hp.astype(np.float64)
+    spell = duel_spell()
+    cost = spell.blood_cost
+
+    dex_a, dex_b = stats_a[:, DEX], stats_b[:, DEX]
+    first = np.where(dex_a > dex_b, 0, np.where(dex_a < dex_b, 1, rng.integers(0, 2, n)))
+
+    winner = np.full(n, -1, dtype=np.int8)
+    rounds = np.full(n, max_rounds, dtype=np.int32)
+    curve = np.zeros((2, max_rounds + 1))
+    curve[:, 0] = 1.0
+    settled = np.zeros(2)
+    active = np.arange(n)
+
+    for r in range(1, max_rounds + 1):
+        for turn in (0, 1):
+            actor = first[active] if turn == 0 else 1 - first[active]
+            target = 1 - actor
+            m = active.size
+            s = stats[actor, active]
+
+            cast = (s[:, INT] > s[:, DEX]) & (hp[actor, active] > 2 * cost)
+            strike = STRIKE_DICE.sample(m, rng) + s[:, DEX] // 2 + SHARD_BONUS * shard[actor, active]
+
+            hp[actor, active] -= np.where(cast, cost, 0)
+            hp[target, active] -= np.where(cast, 0, strike).astype(np.int32)
+            if cast.any():
+                # The spell's own effect program, on the targets it hits
+                rows, cols = target[cast], active[cast]
+                victims = hp[rows, cols]
+                spell.program.apply_arrays(victims, max_hp[rows, cols], rng=rng)
+                hp[rows, cols] = victims
+
+            dead = hp[target, active] <= 0
+            if dead.any():
+                done = active[dead]
+                winner[done] = actor[dead]
+                rounds[done] = r
+                settled += (np.maximum(hp[:, done], 0) / full_hp[:, done]).sum(axis=1)
+                active = active[~dead]
+
+        curve[:, r] = (settled + (np.maximum(hp[:, active], 0) / full_hp[:, active]).sum(axis=1)) / n
+        if active.size == 0:
+            curve[:, r + 1:] = (settled / n)[:, None]
+            break
+
+    return {"winner": winner, "rounds": rounds, "hp_curve": curve}
+
+
+def summarize(result, max_rounds=MAX_ROUNDS):
+    """Win rates, time-to-kill distribution and HP-drain curves of one matchup"""
+    winner, rounds = result["winner"], result["rounds"]
+    n = len(winner)
+    decided = rounds[winner >= 0]
+    ttk = np.percentile(decided, (10, 50, 90)) if decided.size else np.full(3, np.nan)
+    last = int(decided.max()) if decided.size else 0
+    return {
+        "duels": n,
+        "win_a": float(np.count_nonzero(winner == 0) / n),
+        "win_b": float(np.count_nonzero(winner == 1) / n),
+        "draw": float(np.count_nonzero(winner == -1) / n),
+        "ttk_mean": float(decided.mean()) if decided.size else float("nan"),
+        "ttk_p10": float(ttk[0]),
+        "ttk_p50": float(ttk[1]),
+        "ttk_p90": float(ttk[2]),
+        "ttk_histogram": np.bincount(decided, minlength=last + 1)[1:last + 1] / n,
+        "hp_curve_a": result["hp_curve"][0, :last + 1],
+        "hp_curve_b": result["hp_curve"][1, :last + 1]
+    }
+
+
+def simulate_matchups(classes=None, duels=100_000, seed=None, max_rounds=MAX_ROUNDS):
+    """Every ordered pair of classes; returns {(class_a, class_b): summary}"""
+    classes = list(classes or CLASS_NAMES)
+    rng = np.random.default_rng(seed)
+    results = {}
+    for a in classes:
+        for b in classes:
+            result = simulate_duels(roll_stats(a, duels, rng), roll_stats(b, duels, rng), rng, max_rounds=max_rounds)
+            results[(a, b)] = summarize(result, max_rounds)
+    return results
+
+# ======================
+# VERIFICATION & REPORTS
+# ======================
+def verify_against_scalar(duels=20_000, seed=None, classes=None):
+    """Play each matchup through both engines; returns rows of (a, b, scalar, vector, z).
+
+    z is the two-proportion z-score of the win-rate difference, so values
+    beyond about 4 mean the engines disagree rather than just vary.
+    """
+    classes = list(classes or CLASS_NAMES)
+    random.seed(seed)
+    visuals = BloodCombatSystem.visuals_enabled
+    BloodCombatSystem.set_headless(True)
+    try:
+        vector = simulate_matchups(classes, duels, seed)
+        rows = []
+        for a in classes:
+            for b in classes:
+                outcomes = [scalar_duel(scalar_combatant(a), scalar_combatant(b)) for _ in range(duels)]
+                scalar_win = sum(1 for winner, _ in outcomes if winner == 0) / duels
+                scalar_ttk = sum(r for winner, r in outcomes if winner >= 0) / max(1, sum(1 for w, _ in outcomes if w >= 0))
+                vector_win = vector[(a, b)]["win_a"]
+                pooled = (scalar_win + vector_win) / 2
+                spread = (pooled * (1 - pooled) * 2 / duels) ** 0.5
+                z = (vector_win - scalar_win) / spread if spread else 0.0
+                rows.append((a, b, scalar_win, vector_win, scalar_ttk, vector[(a, b)]["ttk_mean"], z))
+        return rows
+    finally:
+        BloodCombatSystem.visuals_enabled = visuals
+
+
+def format_matchups(results):
+    classes = list(dict.fromkeys(a for a, _ in results))
+    width = max(len(name) for name in classes) + 2
+    lines = ["Win rate of row class vs column class"]
+    lines.append(" " * width + "".join(f"{name:>{width}}" for name in classes))
+    for a in classes:
+        lines.append(f"{a:<{width}}" + "".join(f"{results[(a, b)]['win_a'] * 100:>{width - 1}.1f}%" for b in classes))
+    lines.append("")
+    lines.append(f"{'matchup':<{2 * width + 4}} {'TTK p10':>8} {'p50':>6} {'p90':>6}  HP left (a/b)")
+    for (a, b), summary in results.items():
+        lines.append(
+            f"{a + ' vs ' + b:<{2 * width + 4}} {summary['ttk_p10']:>8.0f} {summary['ttk_p50']:>6.0f} "
+            f"{summary['ttk_p90']:>6.0f}  {summary['hp_curve_a'][-1] * 100:.0f}%/{summary['hp_curve_b'][-1] * 100:.0f}%"
+        )
+    return "\n".join(lines)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Monte Carlo duels between the dark classes")
+    parser.add_argument("--duels", type=int, default=100_000, help="duels per matchup")
+    parser.add_argument("--seed", type=int)
+    parser.add_argument("--verify", type=int, metavar="N", help="compare N duels per matchup with the scalar rules")
+    args = parser.parse_args(argv)
+
+    if args.verify:
+        rows = verify_against_scalar(args.verify, args.seed)
+        print(f"{'matchup':<36} {'scalar':>7} {'vector':>7} {'TTK s':>6} {'TTK v':>6} {'z':>6}")
+        for a, b, scalar_win, vector_win, scalar_ttk, vector_ttk, z in rows:
+            flag = "  MISMATCH" if abs(z) > 4 else ""
+            print(f"{a + ' vs ' + b:<36} {scalar_win:>7.3f} {vector_win:>7.3f} {scalar_ttk:>6.2f} {vector_ttk:>6.2f} {z:>6.2f}{flag}")
+        return 1 if any(abs(row[-1]) > 4 for row in rows) else 0
+
+    start = time.perf_counter()
+    results = simulate_matchups(duels=args.duels, seed=args.seed)
+    elapsed = time.perf_counter() - start
+    print(format_matchups(results))
+    print(f"\n{args.duels * len(results):,} duels in {elapsed:.2f}s")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,616 @@
+"""Validated registry of items and spells with secondary indexes.
+
+Relics, potions and spells live in JSON or TOML content packs: the base
+game in packs/base.json, then any mods in packs/mods/, applied in file
+name order. A pack may hold "relics", "potions" and "spells" tables,
+whose entries add or replace content by name, "patch" to change some
+keys of an existing entry, and "remove" to drop entries:
+
+    {"name": "bleeding-edge",
+     "spells": {"Hemorrhage": {"cost": 12, "damage": "4d6", "sigil": "Garnet"}},
+     "patch": {"Crimson Lash": {"cost": 6}},
+     "remove": ["Siphon Soul"]}
+
+The three kinds don't share a schema (`cost` vs `blood_cost`, keys only
+some kinds use), and mechanics are declared as effect lists (see effects)
+rather than code. The registry checks every entry once, normalizes it into
+a ContentEntry and indexes entries by type, sigil, class requirement and
+effect tag, so lookups during play are dict hits.
+
+Validated content is cached as a binary blob, named by a hash of the pack
+files, in the user's cache directory. Later startups with the same packs
+map that blob and decode entries only as they are looked up, so startup
+costs little more than hashing the packs however much content there is.
+CONTENT loads on first use, so importing this module touches no files.
+"""
+import hashlib
+import json
+import mmap
+import os
+import struct
+import tomllib
+
+from dark_classes import DARK_CLASSES
+from dice import parse
+from effects import EffectError, compile_effects
+from utils import user_cache_dir
+
+# Keys each source may use; anything else is a typo
+ALLOWED_KEYS = {
+    "relic": {"type", "damage", "effect", "effects", "blood_cost", "cost", "defense", "curse"},
+    "potion": {"effect", "effects", "color"},
+    "spell": {"cost", "blood_cost", "damage", "effect", "effects", "sigil", "requirement"}
+}
+ITEM_TYPES = ("weapon", "armor", "relic")
+
+# Effect tags are looked up from keywords in the effect and curse text
+EFFECT_TAGS = {
+    "lifesteal": ("drains hp", "steals", "converts"),
+    "heal": ("restores",),
+    "max_hp_loss": ("reduces max hp",),
+    "stat_drain": ("stat drain",),
+    "blood_magic": ("blood",)
+}
+
+PACK_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "packs")
+CACHE_DIR = os.path.join(user_cache_dir(), "content")
+PACK_SUFFIXES = (".json", ".toml")
+
+# Pack table -> registry source, in load order
+SECTIONS = {"relics": "relic", "potions": "potion", "spells": "spell"}
+PACK_KEYS = {"name", "patch", "remove", *SECTIONS}
+
+# Bump whenever the blob layout or the validation rules change
+CACHE_VERSION = 3
+CACHE_MAGIC = b"GRNC"
+# Stored in place of a missing string or color
+NO_STRING = 0xFFFFFFFF
+
+TAG_NAMES = (*EFFECT_TAGS, "damage", "cursed")
+INDEX_KINDS = ("type", "sigil", "class", "tag")
+
+# magic, version, pack hash, entry count, then offsets of the names,
+# records, strings and index sections
+_HEADER = struct.Struct("<4sH32sIQQQQ")
+# type, blood cost, damage, defense, effect, sigil, requirement, curse,
+# color, tags, effects; strings are string table ids
+_ENTRY = struct.Struct("<11I")
+_INDEX_KEY = struct.Struct("<BII")
+_U32 = struct.Struct("<I")
+
+
+class ContentError(ValueError):
+    """A content entry failed validation"""
+
+
+class ContentEntry:
+    """One normalized item, potion or spell"""
+    __slots__ = (
+        "name", "type", "blood_cost", "damage", "defense", "effect", "program",
+        "sigil", "requirement", "curse", "color", "tags"
+    )
+
+    def __init__(self, name, type, blood_cost=0, damage=None, defense=0, effect="", sigil=None,
+                 requirement=None, curse=None, color=None, tags=frozenset(), program=None):
+        self.name = name
+        self.type = type
+        self.blood_cost = blood_cost
+        self.damage = damage
+        self.defense = defense
+        self.effect = effect
+        # Compiled EffectProgram, or None for entries with no mechanical effect
+        self.program = program
+        self.sigil = sigil
+        self.requirement = requirement
+        self.curse = curse
+        self.color = color
+        self.tags = tags
+
+    @property
+    def expected_damage(self):
+        return self.damage.mean if self.damage is not None else 0.0
+
+    def __repr__(self):
+        return f"ContentEntry({self.name!r}, {self.type!r})"
+
+
+class ContentRegistry:
+    """Every item and spell by name, plus indexes by type, sigil, class and tag"""
+    def __init__(self):
+        self.entries = {}
+        self.by_type = {}
+        self.by_sigil = {}
+        self.by_class = {}
+        self.by_tag = {}
+
+    # ======================
+    # LOADING
+    # ======================
+    def load(self, source, table, origins=None):
+        """Validate and register every entry of a content table.
+
+        origins maps entry names to the pack that last set them, for errors.
+        """
+        origins = origins or {}
+        for name, raw in table.items():
+            self.add(self._normalize(source, name, raw, origins.get(name)))
+        return self
+
+    def add(self, entry):
+        if entry.name in self.entries:
+            raise ContentError(f"duplicate content name {entry.name!r}")
+        self.entries[entry.name] = entry
+        self.by_type.setdefault(entry.type, []).append(entry)
+        if entry.sigil:
+            self.by_sigil.setdefault(entry.sigil, []).append(entry)
+        if entry.requirement:
+            self.by_class.setdefault(entry.requirement, []).append(entry)
+        for tag in entry.tags:
+            self.by_tag.setdefault(tag, []).append(entry)
+
+    def _normalize(self, source, name, raw, pack=None):
+        where = f"{source} entry {name!r}"
+        if pack is not None:
+            where = f"pack {pack} {where}"
+        # Names are NUL-separated in the content cache
+        if not isinstance(name, str) or not name or "\0" in name:
+            raise ContentError(f"{where} needs a non-empty name without NUL characters")
+        if not isinstance(raw, dict):
+            raise ContentError(f"{where} must be a dict")
+        unknown = set(raw) - ALLOWED_KEYS[source]
+        if unknown:
+            raise ContentError(f"{where} has unknown keys {sorted(unknown)}")
+        if "cost" in raw and "blood_cost" in raw:
+            raise ContentError(f"{where} sets both cost and blood_cost")
+
+        for key in ("type", "effect", "sigil", "requirement", "curse"):
+            _check_type(where, key, raw.get(key), str)
+        for key in ("cost", "blood_cost", "defense"):
+            _check_type(where, key, raw.get(key), int)
+        _check_type(where, "damage", raw.get("damage"), str)
+        _check_type(where, "effects", raw.get("effects"), (list, tuple))
+        _check_type(where, "color", raw.get("color"), (list, tuple))
+
+        if source == "relic":
+            kind = raw.get("type", "relic")
+            if kind not in ITEM_TYPES:
+                raise ContentError(f"{where} has type {kind!r}, expected one of {ITEM_TYPES}")
+        else:
+            kind = source
+
+        blood_cost = raw.get("blood_cost", raw.get("cost", 0))
+        if blood_cost < 0:
+            raise ContentError(f"{where} has invalid blood cost {blood_cost!r}")
+        defense = raw.get("defense", 0)
+        if defense < 0:
+            raise ContentError(f"{where} has invalid defense {defense!r}")
+
+        damage = raw.get("damage")
+        if damage is not None:
+            try:
+                damage = parse(damage)
+            except ValueError as e:
+                raise ContentError(f"{where} has invalid damage: {e}") from None
+
+        effect = raw.get("effect", "")
+
+        requirement = raw.get("requirement")
+        if requirement is not None:
+            requirement = requirement.removesuffix(" class")
+            if requirement not in DARK_CLASSES:
+                raise ContentError(f"{where} requires unknown class {requirement!r}")
+
+        program = None
+        spec = raw.get("effects")
+        if spec is None and damage is not None:
+            spec = [("damage", damage.text)]
+        if spec is not None:
+            try:
+                program = compile_effects(spec)
+            except EffectError as e:
+                raise ContentError(f"{where} has invalid effects: {e}") from None
+
+        color = raw.get("color")
+        if color is not None:
+            if len(color) != 3 or not all(
+                isinstance(c, int) and not isinstance(c, bool) and 0 <= c <= 255 for c in color
+            ):
+                raise ContentError(f"{where} has invalid color {color!r}")
+            color = tuple(color)
+
+        curse = raw.get("curse")
+        text = f"{effect} {curse or ''}".lower()
+        tags = {tag for tag, words in EFFECT_TAGS.items() if any(word in text for word in words)}
+        if damage is not None:
+            tags.add("damage")
+        if curse:
+            tags.add("cursed")
+
+        return ContentEntry(
+            name, kind,
+            blood_cost=blood_cost,
+            damage=damage,
+            defense=defense,
+            effect=effect,
+            sigil=raw.get("sigil"),
+            requirement=requirement,
+            curse=curse,
+            color=color,
+            tags=frozenset(tags),
+            program=program
+        )
+
+    # ======================
+    # QUERIES
+    # ======================
+    def __contains__(self, name):
+        return name in self.entries
+
+    def __getitem__(self, name):
+        return self.entries[name]
+
+    def __len__(self):
+        return len(self.entries)
+
+    def names(self):
+        return list(self.entries)
+
+    def get(self, name, default=None):
+        return self.entries.get(name, default)
+
+    def of_type(self, kind):
+        return self.by_type.get(kind, [])
+
+    def with_sigil(self, sigil):
+        return self.by_sigil.get(sigil, [])
+
+    def for_class(self, class_name):
+        """Entries that require class_name"""
+        return self.by_class.get(class_name, [])
+
+    def tagged(self, tag):
+        return self.by_tag.get(tag, [])
+
+    def usable_by(self, class_name):
+        """Entries with no class requirement or one matching class_name"""
+        return [entry for entry in self.entries.values() if entry.requirement in (None, class_name)]
+
+# ======================
+# PACKS
+# ======================
+def default_packs(directory=PACK_DIR):
+    """The base pack followed by every mod, in file name order"""
+    mods = os.path.join(directory, "mods")
+    names = sorted(os.listdir(mods)) if os.path.isdir(mods) else []
+    return [os.path.join(directory, "base.json")] + [
+        os.path.join(mods, name) for name in names if name.endswith(PACK_SUFFIXES)
+    ]
+
+
+def _check_type(where, key, value, types):
+    """ContentError unless value is None or of types; bools don't count as ints"""
+    if value is None:
+        return
+    if not isinstance(value, types) or (isinstance(value, bool) and bool not in _as_tuple(types)):
+        expected = " or ".join(t.__name__ for t in _as_tuple(types))
+        raise ContentError(f"{where} {key} must be {expected}, got {value!r}")
+
+
+def _as_tuple(types):
+    return types if isinstance(types, tuple) else (types,)
+
+
+def read_pack(path):
+    """Parse one JSON or TOML pack"""
+    try:
+        with open(path, "rb") as f:
+            pack = tomllib.load(f) if path.endswith(".toml") else json.load(f)
+    except (OSError, ValueError) as e:
+        raise ContentError(f"can't read pack {path}: {e}") from None
+    if not isinstance(pack, dict):
+        raise ContentError(f"pack {path} must be a table")
+    unknown = set(pack) - PACK_KEYS
+    if unknown:
+        raise ContentError(f"pack {path} has unknown keys {sorted(unknown)}")
+    pack.setdefault("name", os.path.basename(path))
+    where = f"pack {pack['name']}"
+    _check_type(where, "name", pack["name"], str)
+    for key in (*SECTIONS, "patch"):
+        _check_type(where, key, pack.get(key), dict)
+    for name, changes in pack.get("patch", {}).items():
+        _check_type(f"{where} patch", repr(name), changes, dict)
+    _check_type(where, "remove", pack.get("remove"), list)
+    for name in pack.get("remove", ()):
+        _check_type(f"{where} remove", "entry", name, str)
+    return pack
+
+
+def merge_packs(packs, origins=None):
+    """Overlay packs in order; returns {source: {name: raw entry}}.
+
+    origins, if given, is filled with the pack that last set each entry.
+    """
+    origins = {} if origins is None else origins
+    merged = {source: {} for source in SECTIONS.values()}
+
+    def section_of(name, pack_name):
+        for table in merged.values():
+            if name in table:
+                return table
+        raise ContentError(f"pack {pack_name} changes {name!r}, which no earlier pack defines")
+
+    for pack in packs:
+        pack_name = pack.get("name", "<unnamed>")
+        for key, source in SECTIONS.items():
+            table = pack.get(key, {})
+            merged[source].update(table)
+            origins.update(dict.fromkeys(table, pack_name))
+        for name, changes in pack.get("patch", {}).items():
+            table = section_of(name, pack_name)
+            table[name] = {**table[name], **changes}
+            origins[name] = pack_name
+        for name in pack.get("remove", ()):
+            del section_of(name, pack_name)[name]
+    return merged
+
+
+def build_registry(merged, origins=None):
+    """Validate merged pack content into a ContentRegistry"""
+    registry = ContentRegistry()
+    for source, table in merged.items():
+        registry.load(source, table, origins)
+    return registry
+
+
+def pack_key(paths):
+    """Hash of the pack files, the cache format and the known classes"""
+    digest = hashlib.sha256(f"{CACHE_VERSION}:{sorted(DARK_CLASSES)}".encode())
+    for path in paths:
+        with open(path, "rb") as f:
+            data = f.read()
+        digest.update(f"{os.path.basename(path)}:{len(data)}:".encode())
+        digest.update(data)
+    return digest.digest()
+
+# ======================
+# BINARY CACHE
+# ======================
+def write_cache(registry, path, key):
+    """Serialize a validated registry; written atomically"""
+    entries = list(registry.entries.values())
+    ids, strings = {}, []
+
+    def intern(text):
+        if text is None:
+            return NO_STRING
+        index = ids.get(text)
+        if index is None:
+            index = ids[text] = len(strings)
+            strings.append(text)
+        return index
+
+    records = []
+    for entry in entries:
+        color = NO_STRING if entry.color is None else (entry.color[0] << 16) | (entry.color[1] << 8) | entry.color[2]
+        records.append(_ENTRY.pack(
+            intern(entry.type),
+            entry.blood_cost,
+            intern(entry.damage.text if entry.damage is not None else None),
+            entry.defense,
+            intern(entry.effect),
+            intern(entry.sigil),
+            intern(entry.requirement),
+            intern(entry.curse),
+            color,
+            sum(1 << i for i, tag in enumerate(TAG_NAMES) if tag in entry.tags),
+            intern(json.dumps([[op, *args] for op, args in entry.program.spec]) if entry.program is not None else None)
+        ))
+
+    position = {entry.name: i for i, entry in enumerate(entries)}
+    index = []
+    for kind, table in zip(INDEX_KINDS, (registry.by_type, registry.by_sigil, registry.by_class, registry.by_tag)):
+        for value, listed in table.items():
+            index.append(_INDEX_KEY.pack(INDEX_KINDS.index(kind), intern(value), len(listed)))
+            index.append(struct.pack(f"<{len(listed)}I", *(position[entry.name] for entry in listed)))
+
+    names = "\0".join(entry.name for entry in entries).encode()
+    encoded = [text.encode() for text in strings]
+    offsets = [0]
+    for data in encoded:
+        offsets.append(offsets[-1] + len(data))
+    string_table = _U32.pack(len(encoded)) + struct.pack(f"<{len(offsets)}I", *offsets) + b"".join(encoded)
+
+    names_at = _HEADER.size
+    records_at = names_at + len(names)
+    strings_at = records_at + _ENTRY.size * len(records)
+    index_at = strings_at + len(string_table)
+    header = _HEADER.pack(CACHE_MAGIC, CACHE_VERSION, key, len(entries), names_at, records_at, strings_at, index_at)
+    blob = b"".join([header, names, *records, string_table, _U32.pack(len(index) // 2), *index])
+
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    temp = f"{path}.{os.getpid()}.tmp"
+    with open(temp, "wb") as f:
+        f.write(blob)
+    os.replace(temp, path)
+
+
+class PackedContent:
+    """Read-only registry backed by a memory-mapped cache blob.
+
+    Offers the ContentRegistry queries. Entries are decoded, and their
+    dice and effect programs compiled, the first time they are looked up.
+    """
+    def __init__(self, path, key=None):
+        self.path = path
+        with open(path, "rb") as f:
+            self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        if len(self._map) < _HEADER.size:
+            raise ContentError(f"{path} is not a content cache")
+        magic, version, stored_key, count, names_at, records_at, strings_at, index_at = _HEADER.unpack_from(self._map)
+        if magic != CACHE_MAGIC or version != CACHE_VERSION or (key is not None and stored_key != key):
+            raise ContentError(f"{path} is stale or not a content cache")
+
+        names = self._map[names_at:records_at].decode().split("\0") if count else []
+        self._ids = {name: i for i, name in enumerate(names)}
+        self._names = names
+        self._records_at = records_at
+        self._entries = [None] * count
+
+        string_count, = _U32.unpack_from(self._map, strings_at)
+        self._string_offsets = struct.unpack_from(f"<{string_count + 1}I", self._map, strings_at + 4)
+        self._blob_at = strings_at + 4 + 4 * (string_count + 1)
+        self._strings = [None] * string_count
+
+        # (kind, value) -> (offset of the entry ids, count), decoded on use
+        self._index = {}
+        self._lists = {}
+        keys, = _U32.unpack_from(self._map, index_at)
+        offset = index_at + 4
+        for _ in range(keys):
+            kind, value, listed = _INDEX_KEY.unpack_from(self._map, offset)
+            offset += _INDEX_KEY.size
+            self._index[(INDEX_KINDS[kind], self._string(value))] = (offset, listed)
+            offset += 4 * listed
+
+    def _string(self, i):
+        if i == NO_STRING:
+            return None
+        text = self._strings[i]
+        if text is None:
+            start, end = self._string_offsets[i], self._string_offsets[i + 1]
+            text = self._strings[i] = self._map[self._blob_at + start:self._blob_at + end].decode()
+        return text
+
+    def _entry(self, i):
+        entry = self._entries[i]
+        if entry is None:
+            (kind, blood_cost, damage, defense, effect, sigil, requirement, curse,
+             color, tags, effects) = _ENTRY.unpack_from(self._map, self._records_at + _ENTRY.size * i)
+            damage, effects = self._string(damage), self._string(effects)
+            entry = self._entries[i] = ContentEntry(
+                self._names[i], self._string(kind),
+                blood_cost=blood_cost,
+                damage=parse(damage) if damage is not None else None,
+                defense=defense,
+                effect=self._string(effect),
+                sigil=self._string(sigil),
+                requirement=self._string(requirement),
+                curse=self._string(curse),
+                color=None if color == NO_STRING else (color >> 16, (color >> 8) & 0xFF, color & 0xFF),
+                tags=frozenset(tag for bit, tag in enumerate(TAG_NAMES) if tags >> bit & 1),
+                program=compile_effects(json.loads(effects)) if effects is not None else None
+            )
+        return entry
+
+    def _listed(self, kind, value):
+        key = (kind, value)
+        entries = self._lists.get(key)
+        if entries is None:
+            offset, count = self._index.get(key, (0, 0))
+            ids = struct.unpack_from(f"<{count}I", self._map, offset) if count else ()
+            entries = self._lists[key] = [self._entry(i) for i in ids]
+        return entries
+
+    # ======================
+    # QUERIES
+    # ======================
+    def __contains__(self, name):
+        return name in self._ids
+
+    def __getitem__(self, name):
+        return self._entry(self._ids[name])
+
+    def __len__(self):
+        return len(self._names)
+
+    def get(self, name, default=None):
+        i = self._ids.get(name)
+        return default if i is None else self._entry(i)
+
+    def names(self):
+        return list(self._names)
+
+    def of_type(self, kind):
+        return self._listed("type", kind)
+
+    def with_sigil(self, sigil):
+        return self._listed("sigil", sigil)
+
+    def for_class(self, class_name):
+        """Entries that require class_name"""
+        return self._listed("class", class_name)
+
+    def tagged(self, tag):
+        return self._listed("tag", tag)
+
+    def usable_by(self, class_name):
+        """Entries with no class requirement or one matching class_name"""
+        barred = {
+            entry.name
+            for (kind, value) in self._index if kind == "class" and value != class_name
+            for entry in self._listed(kind, value)
+        }
+        return [self._entry(i) for i, name in enumerate(self._names) if name not in barred]
+
+
+def load_content(paths=None, cache_dir=CACHE_DIR):
+    """Content from packs, via the binary cache when it is current.
+
+    On a cache miss the packs are parsed, merged, validated and cached,
+    and stale cache files are removed. If the cache can't be written the
+    validated registry is returned directly.
+    """
+    paths = default_packs() if paths is None else list(paths)
+    key = pack_key(paths)
+    cache = os.path.join(cache_dir, f"content-{key.hex()[:16]}.bin")
+    if os.path.exists(cache):
+        try:
+            return PackedContent(cache, key)
+        except (ContentError, OSError, ValueError):
+            pass
+
+    origins = {}
+    registry = build_registry(merge_packs((read_pack(path) for path in paths), origins), origins)
+    try:
+        write_cache(registry, cache, key)
+    except OSError:
+        return registry
+    for name in os.listdir(cache_dir):
+        if name.startswith("content-") and name != os.path.basename(cache):
+            try:
+                os.remove(os.path.join(cache_dir, name))
+            except OSError:
+                pass
+    return PackedContent(cache, key)
+
+
+def load_default():
+    """The base pack and installed mods, from the content cache if current"""
+    return load_content()
+
+
+class LazyContent:
+    """Stands in for a registry and loads it the first time it is queried"""
+    def __init__(self, loader=load_default):
+        self._loader = loader
+        self._content = None
+
+    def load(self):
+        if self._content is None:
+            self._content = self._loader()
+        return self._content
+
+    def __getattr__(self, name):
+        return getattr(self.load(), name)
+
+    def __contains__(self, name):
+        return name in self.load()
+
+    def __getitem__(self, name):
+        return self.load()[name]
+
+    def __len__(self):
+        return len(self.load())
+
+
+CONTENT = LazyContent()
@@ -0,0 +1,38 @@
+STAT_NAMES = ("STR", "DEX", "CON", "INT", "WIS", "CHA")
+
+DARK_TITLES = [
+    "the Bloodsoaked",
+    "of the Crimson Veil",
+    "the Garnet Ghost",
+    "Bearer of the Dark Shard",
+    "the Void-Touched"
+]
+
+DARK_CLASSES = {
+    "Bloodmancer": {
+        "stats": {"STR": 1, "DEX": 2, "CON": 2, "INT": 4, "WIS": 3, "CHA": 1},
+        "desc": "Master of hemomancy\nExcels at blood magic\nWeak in melee combat",
+        "color": (120, 0, 30)
+    },
+    "Nightblade": {
+        "stats": {"STR": 3, "DEX": 4, "CON": 2, "INT": 1, "WIS": 1, "CHA": 2},
+        "desc": "Shadowy assassin\nHigh critical chance\nLow magical defense",
+        "color": (30, 0, 60)
+    },
+    "Harbinger": {
+        "stats": {"STR": 2, "DEX": 1, "CON": 4, "INT": 2, "WIS": 3, "CHA": 1},
+        "desc": "Tanky frontline fighter\nHigh health pool\nSlow movement speed",
+        "color": (60, 30, 0)
+    },
+    "Garnet Apostle": {
+        "stats": {"STR": 1, "DEX": 2, "CON": 3, "INT": 3, "WIS": 4, "CHA": 0},
+        "desc": "Garnet magic specialist\nBalanced abilities\nNo charisma",
+        "color": (90, 0, 0)
+    }
+}
+
+STARTING_INVENTORY = {
+    "weapons": ["Rusty Dagger"],
+    "armor": ["Tattered Robes"],
+    "relics": []
+}
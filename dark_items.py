@@ -1,21 +0,0 @@
-GARNET_RELICS = {
-    "Shard of the Crimson Moon": {
-        "type": "weapon",
-        "damage": "2d6+3",
-        "effect": "Drains HP on hit",
-        "blood_cost": 1
-    },
-    "Vein of the Dark Apostle": {
-        "type": "armor",
-        "defense": 15,
-        "effect": "Converts 10% damage to HP",
-        "curse": "Random stat drain"
-    },
-}
-
-BLOOD_POTIONS = {
-    "Vial of Forbidden Life": {
-        "effect": "Restores 50 HP but reduces max HP by 10",
-        "color": (200, 0, 0)
-    }
-}
\ No newline at end of file
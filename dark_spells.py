@@ -1,13 +0,0 @@
-DARK_SPELLS = {
-    "Crimson Lash": {
-        "cost": 8,
-        "damage": "3d8",
-        "effect": "Whips target with blood tendrils",
-        "sigil": "Garnet"
-    },
-    "Siphon Soul": {
-        "cost": 15,
-        "effect": "Steals 30% of target's HP",
-        "requirement": "Garnet Apostle class"
-    }
-}
\ No newline at end of file
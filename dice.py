@@ -0,0 +1,283 @@
+"""Dice expressions: parse once, then roll, bulk-sample or get exact odds.
+
+Expressions are sums of dice pools and constants, e.g. "3d8", "2d6+3" or
+"1d20-1". A pool can carry rules applied after rolling, replacements
+first, then keep/drop:
+
+    kh2 / kl2   keep the highest / lowest 2 dice
+    dh1 / dl1   drop the highest / lowest die
+    sl6 / sh1   set the lowest / highest die to 6 / 1
+
+so the dark gift "3d6 but the lowest die becomes 6" is "3d6sl6".
+"""
+import math
+import random
+import re
+from bisect import bisect_right
+from functools import lru_cache
+from itertools import combinations_with_replacement
+
+import numpy as np
+
+_TERM = re.compile(r"\s*([+-])\s*(?:(\d*)d(\d+)((?:[kds][hl]\d+)*)|(\d+))")
+_RULE = re.compile(r"([kds])([hl])(\d+)")
+
+# Pools with rules get their exact distribution by enumerating sorted
+# outcomes; past this many the pool is too big to enumerate
+MAX_ENUMERATED = 2_000_000
+
+
+class DicePool:
+    """NdS with optional keep/drop and replacement rules"""
+    __slots__ = ("count", "sides", "sign", "keep", "replace", "_pmf")
+
+    def __init__(self, count, sides, sign=1, keep=None, replace=None):
+        if count < 1 or sides < 1:
+            raise ValueError(f"invalid dice pool {count}d{sides}")
+        self.count = count
+        self.sides = sides
+        self.sign = sign
+        # keep: ("high" | "low", n) dice kept after sorting
+        self.keep = keep
+        # replace: ("high" | "low", value) for the die to overwrite
+        self.replace = replace
+        self._pmf = None
+
+    @property
+    def plain(self):
+        return self.keep is None and self.replace is None
+
+    def _apply_rules(self, rolls):
+        """Sorted rolls (ascending) -> the dice that count"""
+        if self.replace is not None:
+            which, value = self.replace
+            rolls[0 if which == "low" else -1] = value
+            rolls.sort()
+        if self.keep is not None:
+            which, n = self.keep
+            rolls = rolls[-n:] if which == "high" else rolls[:n]
+        return rolls
+
+    def roll(self, rng=random):
+        randint, sides = rng.randint, self.sides
+        if self.plain:
+            return self.sign * sum(randint(1, sides) for _ in range(self.count))
+        rolls = sorted(randint(1, sides) for _ in range(self.count))
+        return self.sign * sum(self._apply_rules(rolls))
+
+    def sample(self, shape, rng):
+        rolls = rng.integers(1, self.sides + 1, size=shape + (self.count,), dtype=np.int32)
+        if not self.plain:
+            rolls.sort(axis=-1)
+            if self.replace is not None:
+                which, value = self.replace
+                rolls[..., 0 if which == "low" else -1] = value
+                rolls.sort(axis=-1)
+            if self.keep is not None:
+                which, n = self.keep
+                rolls = rolls[..., -n:] if which == "high" else rolls[..., :n]
+        return self.sign * rolls.sum(axis=-1)
+
+    def pmf(self):
+        """(lowest total, probabilities) for this pool, before its sign"""
+        if self._pmf is None:
+            self._pmf = self._plain_pmf() if self.plain else self._enumerated_pmf()
+        return self._pmf
+
+    def _plain_pmf(self):
+        die = np.full(self.sides, 1.0 / self.sides)
+        probs = np.ones(1)
+        # Square-and-multiply so 100d6 needs 7 convolutions, not 100
+        power, n = die, self.count
+        while n:
+            if n & 1:
+                probs = np.convolve(probs, power)
+            n >>= 1
+            if n:
+                power = np.convolve(power, power)
+        return self.count, probs
+
+    def _enumerated_pmf(self):
+        outcomes = math.comb(self.count + self.sides - 1, self.count)
+        if outcomes > MAX_ENUMERATED:
+            raise ValueError(f"{self} has {outcomes:,} sorted outcomes, too many to enumerate")
+        totals = {}
+        for rolls in combinations_with_replacement(range(1, self.sides + 1), self.count):
+            # Number of orderings that sort to this multiset
+            ways = math.factorial(self.count)
+            for face in set(rolls):
+                ways //= math.factorial(rolls.count(face))
+            total = sum(self._apply_rules(list(rolls)))
+            totals[total] = totals.get(total, 0) + ways
+        low = min(totals)
+        probs = np.zeros(max(totals) - low + 1)
+        for total, ways in totals.items():
+            probs[total - low] = ways
+        return low, probs / self.sides ** self.count
+
+    def __str__(self):
+        text = f"{self.count}d{self.sides}"
+        if self.replace is not None:
+            text += f"s{self.replace[0][0]}{self.replace[1]}"
+        if self.keep is not None:
+            text += f"k{self.keep[0][0]}{self.keep[1]}"
+        return text
+
+
+class DiceExpression:
+    """A parsed dice expression; build with parse() so it is compiled once"""
+    def __init__(self, text, pools, constant):
+        self.text = text
+        self.pools = tuple(pools)
+        self.constant = constant
+        self._distribution = None
+        self._cdf = None
+
+    def roll(self, rng=random):
+        """One result, drawn from the `random` module (or a random.Random)"""
+        return self.constant + sum(pool.roll(rng) for pool in self.pools)
+
+    def roller(self, rng=random):
+        """Zero-argument function returning one result per call.
+
+        Draws by inverse CDF, one uniform and a bisect however many dice
+        there are, so it suits inner loops better than roll(). Constant
+        expressions return their value directly.
+        """
+        if not self.pools:
+            constant = self.constant
+            return lambda: constant
+        values, probs = self.pmf()
+        values = values.tolist()
+        cdf = (np.cumsum(probs) / probs.sum()).tolist()
+        cdf[-1] = 1.0
+        uniform = rng.random
+
+        def roll():
+            return values[bisect_right(cdf, uniform())]
+        return roll
+
+    def sample(self, size, rng=None):
+        """NumPy array of results with the given shape.
+
+        Draws by inverse CDF from the exact distribution, one uniform per
+        result however many dice are rolled; pools too large to enumerate
+        fall back to rolling every die.
+        """
+        rng = rng if rng is not None else np.random.default_rng()
+        shape = (size,) if isinstance(size, int) else tuple(size)
+        if self._cdf is None:
+            try:
+                values, probs = self.pmf()
+                self._cdf = (values, np.cumsum(probs) / probs.sum())
+            except ValueError:
+                self._cdf = False
+        if self._cdf:
+            values, cdf = self._cdf
+            index = np.searchsorted(cdf, rng.random(shape), side="right")
+            return values[np.minimum(index, len(values) - 1)]
+
+        total = np.full(shape, self.constant, dtype=np.int64)
+        for pool in self.pools:
+            total += pool.sample(shape, rng)
+        return total
+
+    # ======================
+    # EXACT DISTRIBUTION
+    # ======================
+    def pmf(self):
+        """(values, probabilities) arrays covering every possible result"""
+        if self._distribution is None:
+            low, probs = self.constant, np.ones(1)
+            for pool in self.pools:
+                pool_low, pool_probs = pool.pmf()
+                if pool.sign < 0:
+                    pool_low, pool_probs = -(pool_low + len(pool_probs) - 1), pool_probs[::-1]
+                low += pool_low
+                probs = np.convolve(probs, pool_probs)
+            self._distribution = (np.arange(low, low + len(probs)), probs)
+        return self._distribution
+
+    def distribution(self):
+        """{result: probability}"""
+        values, probs = self.pmf()
+        return {int(v): float(p) for v, p in zip(values, probs) if p > 0}
+
+    @property
+    def mean(self):
+        values, probs = self.pmf()
+        return float(values @ probs)
+
+    @property
+    def minimum(self):
+        values, probs = self.pmf()
+        return int(values[np.nonzero(probs)[0][0]])
+
+    @property
+    def maximum(self):
+        values, probs = self.pmf()
+        return int(values[np.nonzero(probs)[0][-1]])
+
+    def chance_at_least(self, value):
+        values, probs = self.pmf()
+        return float(probs[values >= value].sum())
+
+    def __str__(self):
+        return self.text
+
+    def __repr__(self):
+        return f"DiceExpression({self.text!r})"
+
+
+@lru_cache(maxsize=512)
+def parse(text):
+    """Compile a dice expression, reusing the cached result for repeat strings"""
+    source = text.replace(" ", "").lower()
+    if not source:
+        raise ValueError("empty dice expression")
+    if source[0] not in "+-":
+        source = "+" + source
+
+    pools, constant, pos = [], 0, 0
+    while pos < len(source):
+        match = _TERM.match(source, pos)
+        if match is None:
+            raise ValueError(f"invalid dice expression {text!r} at {source[pos:]!r}")
+        sign = -1 if match.group(1) == "-" else 1
+        if match.group(5) is not None:
+            constant += sign * int(match.group(5))
+        else:
+            count = int(match.group(2) or 1)
+            pools.append(DicePool(count, int(match.group(3)), sign, *_parse_rules(match.group(4), count, text)))
+        pos = match.end()
+    return DiceExpression(text, pools, constant)
+
+
+def _parse_rules(rules, count, text):
+    keep = replace = None
+    for kind, side, value in _RULE.findall(rules):
+        side, value = ("high" if side == "h" else "low"), int(value)
+        if kind == "s":
+            if replace is not None:
+                raise ValueError(f"more than one replacement rule in {text!r}")
+            replace = (side, value)
+            continue
+        if keep is not None:
+            raise ValueError(f"more than one keep/drop rule in {text!r}")
+        if value > count or (kind == "d" and value >= count):
+            raise ValueError(f"{text!r} keeps or drops more dice than it rolls")
+        # Dropping the lowest n is keeping the highest count - n
+        if kind == "d":
+            side, value = ("low" if side == "high" else "high"), count - value
+        keep = (side, value)
+    return keep, replace
+
+
+def roll(text, rng=random):
+    """Roll an expression string once"""
+    return parse(text).roll(rng)
+
+
+def expected(text):
+    """Exact mean of an expression string"""
+    return parse(text).mean
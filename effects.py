@@ -0,0 +1,250 @@
+"""Declarative spell and relic effects, compiled once into closures.
+
+An effect list is a sequence of (op, *args) tuples:
+
+    ("damage", dice[, stat])  target loses dice HP (+ caster's stat // 2)
+    ("drain", dice)           target loses dice HP and the caster gains it
+    ("steal", percent)        caster takes percent of the target's current HP
+    ("heal", dice)            target regains dice HP, up to max HP
+    ("max_hp", delta)         target's max HP changes by delta
+    ("curse", stat)           corrupt_stat drain on stat (None = random stat)
+    ("lifesteal", percent)    caster heals percent of the damage dealt
+
+compile_effects() turns a list into an EffectProgram: one closure per op,
+with dice pre-compiled to inverse-CDF rollers, so a cast is a handful of
+plain function calls. Programs also apply in batch, either to many
+Characters or to NumPy arrays of HP.
+"""
+import numpy as np
+
+from dark_classes import STAT_NAMES
+from dice import parse
+
+OPS = ("damage", "drain", "steal", "heal", "max_hp", "curse", "lifesteal")
+# (fewest, most) arguments each op takes
+ARITY = {"damage": (1, 2), "curse": (0, 1), **dict.fromkeys(("drain", "steal", "heal", "max_hp", "lifesteal"), (1, 1))}
+
+
+class EffectError(ValueError):
+    """An effect list is malformed"""
+
+
+class EffectProgram:
+    """Compiled effect list; call program(caster, target) to apply it.
+
+    `apply` is the same function without the method call in front, for
+    inner loops that cast many times.
+    """
+    __slots__ = ("spec", "steps", "lifesteal", "apply")
+
+    def __init__(self, spec, steps, lifesteal):
+        self.spec = spec
+        self.steps = steps
+        self.lifesteal = lifesteal
+        self.apply = self._link(steps, lifesteal)
+
+    @staticmethod
+    def _link(steps, lifesteal):
+        """Fuse the step closures into one apply(caster, target) -> damage dealt"""
+        if len(steps) == 1 and not lifesteal:
+            return steps[0]
+        if len(steps) == 1:
+            step = steps[0]
+
+            def apply(caster, target):
+                dealt = step(caster, target)
+                if dealt > 0:
+                    caster.hp = min(caster.max_hp, caster.hp + dealt * lifesteal // 100)
+                return dealt
+            return apply
+
+        def apply(caster, target):
+            dealt = 0
+            for step in steps:
+                dealt += step(caster, target)
+            if lifesteal and dealt > 0:
+                caster.hp = min(caster.max_hp, caster.hp + dealt * lifesteal // 100)
+            return dealt
+        return apply
+
+    def __call__(self, caster, target):
+        """Apply to one target; returns the damage dealt"""
+        return self.apply(caster, target)
+
+    def cast_many(self, caster, targets):
+        """Apply to every target in turn; returns total damage dealt"""
+        apply = self.apply
+        return sum(apply(caster, target) for target in targets)
+
+    def apply_arrays(self, hp, max_hp, stats=None, rng=None):
+        """Apply to n targets held as arrays, in place.
+
+        hp and max_hp are (n,) int arrays, stats an optional (n, 6) array
+        needed only by curses. Returns (damage per target, HP the caster
+        gains). Stat-scaled damage is not supported here since it needs a
+        caster; use Character targets for those.
+        """
+        rng = rng if rng is not None else np.random.default_rng()
+        n = len(hp)
+        dealt = np.zeros(n, dtype=np.int64)
+        gained = 0
+        for op, args in self.spec:
+            if op == "damage":
+                if len(args) > 1:
+                    raise EffectError("stat-scaled damage needs Character targets")
+                hits = parse(str(args[0])).sample(n, rng)
+                hp -= hits
+                dealt += hits
+            elif op == "drain":
+                hits = parse(str(args[0])).sample(n, rng)
+                hp -= hits
+                dealt += hits
+                gained += int(hits.sum())
+            elif op == "steal":
+                taken = np.maximum(hp, 0) * args[0] // 100
+                hp -= taken
+                dealt += taken
+                gained += int(taken.sum())
+            elif op == "heal":
+                np.minimum(max_hp, hp + parse(str(args[0])).sample(n, rng), out=hp)
+            elif op == "max_hp":
+                # Clamped like Character max HP
+                max_hp += args[0]
+                np.maximum(max_hp, 1, out=max_hp)
+                np.minimum(hp, max_hp, out=hp)
+            elif op == "curse":
+                if stats is None:
+                    raise EffectError("curse needs a stats array")
+                stat = args[0] if args else None
+                column = rng.integers(0, stats.shape[1], n) if stat is None else np.full(n, _stat_index(stat))
+                rows = np.arange(n)
+                stats[rows, column] = np.maximum(1, stats[rows, column] + rng.integers(-2, 2, n))
+        if self.lifesteal:
+            gained += int(dealt.clip(min=0).sum()) * self.lifesteal // 100
+        return dealt, gained
+
+    def __repr__(self):
+        return f"EffectProgram({self.spec!r})"
+
+
+def _stat_index(stat):
+    if stat not in STAT_NAMES:
+        raise EffectError(f"unknown stat {stat!r}")
+    return STAT_NAMES.index(stat)
+
+# ======================
+# COMPILER
+# ======================
+def _roller(dice, op):
+    if not isinstance(dice, (str, int)) or isinstance(dice, bool):
+        raise EffectError(f"{op}: dice must be text like '2d6' or an int, got {dice!r}")
+    try:
+        return parse(str(dice)).roller()
+    except ValueError as e:
+        raise EffectError(f"{op}: {e}") from None
+
+
+def _percent(value, op):
+    if not isinstance(value, int) or isinstance(value, bool) or not 0 <= value <= 100:
+        raise EffectError(f"{op}: percent must be an int from 0 to 100, got {value!r}")
+    return value
+
+
+def _compile_step(op, args):
+    if op == "damage":
+        roll = _roller(args[0], op)
+        if len(args) > 1:
+            stat = args[1]
+            _stat_index(stat)
+
+            def damage(caster, target):
+                amount = roll() + caster.stat(stat) // 2
+                target.hp -= amount
+                return amount
+        else:
+            def damage(caster, target):
+                amount = roll()
+                target.hp -= amount
+                return amount
+        return damage
+
+    if op == "drain":
+        roll = _roller(args[0], op)
+
+        def drain(caster, target):
+            amount = roll()
+            target.hp -= amount
+            caster.hp = min(caster.max_hp, caster.hp + amount)
+            return amount
+        return drain
+
+    if op == "steal":
+        percent = _percent(args[0], op)
+
+        def steal(caster, target):
+            amount = max(target.hp, 0) * percent // 100
+            target.hp -= amount
+            caster.hp = min(caster.max_hp, caster.hp + amount)
+            return amount
+        return steal
+
+    if op == "heal":
+        roll = _roller(args[0], op)
+
+        def heal(caster, target):
+            target.hp = min(target.max_hp, target.hp + roll())
+            return 0
+        return heal
+
+    if op == "max_hp":
+        delta = args[0]
+        if not isinstance(delta, int) or isinstance(delta, bool):
+            raise EffectError(f"max_hp: delta must be an int, got {delta!r}")
+
+        def max_hp(caster, target):
+            target.max_hp_bonus += delta
+            target.invalidate()
+            target.hp = min(target.hp, target.max_hp)
+            return 0
+        return max_hp
+
+    if op == "curse":
+        stat = args[0] if args else None
+        if stat is not None:
+            _stat_index(stat)
+
+        def curse(caster, target):
+            target.drain(stat)
+            return 0
+        return curse
+
+    raise EffectError(f"unknown effect op {op!r}, expected one of {OPS}")
+
+
+def compile_effects(spec):
+    """Compile an effect list into an EffectProgram"""
+    if not isinstance(spec, (list, tuple)):
+        raise EffectError(f"effects must be a list of [op, args...], got {spec!r}")
+    normalized = []
+    steps = []
+    lifesteal = 0
+    for effect in spec:
+        if isinstance(effect, str):
+            effect = (effect,)
+        if not isinstance(effect, (list, tuple)) or not effect:
+            raise EffectError(f"each effect must be [op, args...], got {effect!r}")
+        op, args = effect[0], tuple(effect[1:])
+        if not isinstance(op, str) or op not in OPS:
+            raise EffectError(f"unknown effect op {op!r}, expected one of {OPS}")
+        fewest, most = ARITY[op]
+        if not fewest <= len(args) <= most:
+            expected = fewest if fewest == most else f"{fewest} to {most}"
+            raise EffectError(f"{op} takes {expected} argument(s), got {len(args)}")
+        normalized.append((op, args))
+        if op == "lifesteal":
+            lifesteal += _percent(args[0], op)
+        else:
+            steps.append(_compile_step(op, args))
+    if not steps and not lifesteal:
+        raise EffectError("empty effect list")
+    return EffectProgram(tuple(normalized), tuple(steps), lifesteal)
@@ -0,0 +1,249 @@
+"""Turn order for encounters with any number of combatants.
+
+Everything that happens at a point in combat time is an Event on one
+binary heap: combatant turns, delayed blood-ritual casts, damage-over-time
+ticks and the end of haste or slow effects. Faster combatants (higher DEX,
+or hasted) get shorter gaps between turns. Adding, cancelling and popping
+events are all O(log n): cancelled events stay in the heap marked dead and
+are skipped when they surface, so nothing is ever searched for, and the
+heap is rebuilt without them if they come to outnumber live ones.
+
+    order = InitiativeScheduler()
+    for character in party + undead:
+        order.add(character)
+    order.cast_later(lich, hero, CONTENT["Crimson Lash"], delay=150)
+    while (event := order.step()) is not None:
+        if event.kind == TURN:
+            ...  # pick an action for event.actor
+"""
+import heapq
+import itertools
+
+from combat import BloodCombatSystem
+from effects import EffectProgram, compile_effects
+
+# Combat time units in one turn of a DEX 0 combatant
+TURN_LENGTH = 100
+# Each point of DEX adds this fraction of base speed
+SPEED_PER_DEX = 0.1
+# Dead heap entries tolerated before a compaction
+COMPACT_SLACK = 64
+
+TURN = "turn"
+CAST = "cast"
+DOT = "dot"
+EXPIRE = "expire"
+
+
+class Event:
+    """Something scheduled to happen at `time`.
+
+    After step() returns an event, `result` holds what it did: the spell
+    message for casts, damage dealt for ticks.
+    """
+    __slots__ = ("time", "kind", "actor", "target", "payload", "remaining", "interval", "cancelled", "result")
+
+    def __init__(self, time, kind, actor, target=None, payload=None, remaining=0, interval=0):
+        self.time = time
+        self.kind = kind
+        self.actor = actor
+        self.target = target
+        self.payload = payload
+        self.remaining = remaining
+        self.interval = interval
+        self.cancelled = False
+        self.result = None
+
+    def __repr__(self):
+        return f"Event({self.kind!r}, t={self.time:g}, {getattr(self.actor, 'name', self.actor)!r})"
+
+
+class Combatant:
+    """Scheduler state for one character: speed factor and pending turn"""
+    __slots__ = ("character", "haste", "turn")
+
+    def __init__(self, character):
+        self.character = character
+        # Multiplies speed; above 1 is hasted, below 1 slowed
+        self.haste = 1.0
+        self.turn = None
+
+
+def turn_delay(character, haste=1.0):
+    """Combat time between a character's turns"""
+    return TURN_LENGTH / ((1 + SPEED_PER_DEX * max(character.stat("DEX"), 0)) * haste)
+
+
+class InitiativeScheduler:
+    """Heap of pending events ordered by time, then by scheduling order"""
+    def __init__(self):
+        self.now = 0.0
+        self.combatants = {}
+        self._heap = []
+        self._order = itertools.count()
+        self.live_events = 0
+
+    def __len__(self):
+        return self.live_events
+
+    def _push(self, event):
+        heapq.heappush(self._heap, (event.time, next(self._order), event))
+        self.live_events += 1
+        return event
+
+    def cancel(self, event):
+        """Drop a pending event; it is discarded when it reaches the top"""
+        if event is not None and not event.cancelled:
+            event.cancelled = True
+            self.live_events -= 1
+            # Events cancelled far in the future may never surface; once they
+            # outnumber live ones, rebuild without them (amortized O(1))
+            if len(self._heap) > 2 * self.live_events + COMPACT_SLACK:
+                self._heap = [entry for entry in self._heap if not entry[2].cancelled]
+                heapq.heapify(self._heap)
+
+    # ======================
+    # COMBATANTS
+    # ======================
+    def add(self, character, delay=None):
+        """Join the encounter; the first turn comes after one turn delay"""
+        if character in self.combatants:
+            raise ValueError(f"{character.name!r} is already in the encounter")
+        combatant = self.combatants[character] = Combatant(character)
+        if delay is None:
+            delay = turn_delay(character)
+        combatant.turn = self._push(Event(self.now + delay, TURN, character))
+        return combatant
+
+    def remove(self, character):
+        """Leave the encounter; pending casts and ticks are left to fizzle"""
+        combatant = self.combatants.pop(character, None)
+        if combatant is not None:
+            self.cancel(combatant.turn)
+
+    def next_turn(self, character):
+        """Time of character's next turn, or None if not in the encounter"""
+        combatant = self.combatants.get(character)
+        return combatant.turn.time if combatant is not None else None
+
+    def haste(self, character, factor, duration=None):
+        """Multiply character's speed by factor (below 1 slows).
+
+        The wait for the pending turn shrinks or stretches to match, and
+        after `duration` combat time the factor is undone.
+        """
+        if factor <= 0:
+            raise ValueError("haste factor must be positive")
+        combatant = self.combatants[character]
+        self._rescale(combatant, combatant.haste * factor)
+        if duration is not None:
+            return self._push(Event(self.now + duration, EXPIRE, character, payload=factor))
+        return None
+
+    def slow(self, character, factor, duration=None):
+        """Divide character's speed by factor"""
+        return self.haste(character, 1 / factor, duration)
+
+    def _rescale(self, combatant, haste):
+        turn = combatant.turn
+        remaining = (turn.time - self.now) * combatant.haste / haste
+        combatant.haste = haste
+        self.cancel(turn)
+        combatant.turn = self._push(Event(self.now + remaining, TURN, combatant.character))
+
+    # ======================
+    # DELAYED EFFECTS
+    # ======================
+    def cast_later(self, caster, target, spell, delay):
+        """Resolve cast_necromancy after delay, unless the caster dies first"""
+        return self._push(Event(self.now + delay, CAST, caster, target, spell))
+
+    def add_dot(self, source, target, effects, ticks, interval=TURN_LENGTH):
+        """Apply an effect program to target every interval, ticks times.
+
+        effects is an EffectProgram or an effect list for compile_effects;
+        source plays the caster, e.g. for drains.
+        """
+        if ticks < 1:
+            raise ValueError("a damage-over-time effect needs at least one tick")
+        program = effects if isinstance(effects, EffectProgram) else compile_effects(effects)
+        return self._push(Event(self.now + interval, DOT, source, target, program, ticks, interval))
+
+    # ======================
+    # RUNNING
+    # ======================
+    def step(self):
+        """Advance to the next live event, resolve it and return it.
+
+        Returns None once nothing is scheduled. Turns are rescheduled before
+        being returned, so the caller only has to act on them. Events whose
+        actor (or, for ticks, target) has died are dropped.
+        """
+        heap = self._heap
+        while heap:
+            time, _, event = heapq.heappop(heap)
+            if event.cancelled:
+                continue
+            self.live_events -= 1
+            self.now = time
+            kind, actor = event.kind, event.actor
+
+            if kind == TURN:
+                combatant = self.combatants.get(actor)
+                if combatant is None or combatant.turn is not event:
+                    continue
+                if actor.hp <= 0:
+                    del self.combatants[actor]
+                    continue
+                combatant.turn = self._push(Event(time + turn_delay(actor, combatant.haste), TURN, actor))
+                return event
+
+            if kind == CAST:
+                if actor.hp <= 0 or event.target.hp <= 0:
+                    continue
+                event.result = BloodCombatSystem.cast_necromancy(actor, event.target, event.payload)
+                return event
+
+            if kind == DOT:
+                if event.target.hp <= 0:
+                    continue
+                event.result = event.payload(actor, event.target)
+                if event.remaining > 1:
+                    self._push(Event(time + event.interval, DOT, actor, event.target, event.payload,
+                                     event.remaining - 1, event.interval))
+                return event
+
+            # EXPIRE
+            combatant = self.combatants.get(actor)
+            if combatant is not None:
+                self._rescale(combatant, combatant.haste / event.payload)
+            return event
+        return None
+
+    def peek(self):
+        """Time of the next live event, or None"""
+        heap = self._heap
+        while heap and heap[0][2].cancelled:
+            heapq.heappop(heap)
+        return heap[0][0] if heap else None
+
+    def run(self, until=None, on_turn=None):
+        """Step until no events remain or the next is after `until`.
+
+        on_turn(scheduler, event) is called for every turn. Returns the
+        number of events resolved.
+        """
+        resolved = 0
+        while True:
+            next_time = self.peek()
+            if next_time is None or (until is not None and next_time > until):
+                break
+            event = self.step()
+            if event is None:
+                break
+            resolved += 1
+            if on_turn is not None and event.kind == TURN:
+                on_turn(self, event)
+        if until is not None:
+            self.now = max(self.now, until)
+        return resolved
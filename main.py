@@ -1,193 +1,562 @@
+import time
+_PROCESS_START = time.perf_counter()
+
+import numpy as np
 import pygame
+import argparse
+import atexit
+import os
 import sys
 import random
+from profiling import StartupProfiler, HotPathProfiler, PerformanceHUD, MemoryProfiler
+from transitions import TransitionScheduler
+from renderer import DirtyRectRenderer
+from scenes import Scene, SceneStack
+from timing import FixedTimestep
+from assets import ASSETS
+from character_model import Character
+from savegame import SaveError, SaveFile, default_save_path
+from music import MUSIC, PLAYLIST
 from utils import (
     load_font,
     load_sound,
     play_music,
     stop_music,
-    fade_in,
     wrap_text,
-    center_horizontal
+    center_horizontal,
+    render_text
 )
+_IMPORTS_DONE = time.perf_counter()
 
-class DarkRPG:
-    def __init__(self):
-        pygame.init()
-        self.screen = pygame.display.set_mode((1280, 720))
-        pygame.display.set_caption("GARNET: Shadowborn")
-        self.clock = pygame.time.Clock()
-        
-        # Font system
-        self.font_title = load_font("OldLondon.ttf", 96, "arial")
-        self.font_subtitle = load_font("OldLondon.ttf", 64, "arial")
-        self.font_crimson = load_font("OldLondon.ttf", 42, "arial")
-        self.font_regular = load_font("OldLondon.ttf", 36, "arial")
-        
-        # Game states
-        self.current_state = "title"
-        self.player = None
-        self.current_music = None
+# ======================
+# SCENES
+# ======================
+class TitleScene(Scene):
+    """Enhanced title screen with subtitle"""
+    name = "title"
 
-        # Title screen garnet sprite
-        try:
-            self.title_garnet = pygame.image.load("assets/sprites/title_garnet.png").convert_alpha()
-            self.title_garnet = pygame.transform.scale(self.title_garnet, (300, 300))
-        except:
-            # Fallback if sprite missing
-            self.title_garnet = pygame.Surface((300, 300), pygame.SRCALPHA)
-            pygame.draw.polygon(self.title_garnet, (180, 0, 30), 
-                              [(150, 0), (300, 150), (150, 300), (0, 150)])
-
-    def show_title_screen(self):
-        """Enhanced title screen with subtitle"""
-        # Pulsing background effect
-        pulse = int(pygame.time.get_ticks() / 300) % 10
-        self.screen.fill((10 + pulse//2, 0, 5 + pulse//3))
-        
-        # Draw title garnet sprite (centered)
-        garnet_pos = (
-            self.screen.get_width()//2 - self.title_garnet.get_width()//2,
-            self.screen.get_height()//2 - self.title_garnet.get_height()//2 - 50
-        )
-        self.screen.blit(self.title_garnet, garnet_pos)
-        
-        # Main title with shadow
-        title = self.font_title.render("GARNET", True, (180, 4, 45))
-        title_shadow = self.font_title.render("GARNET", True, (80, 0, 0))
-        title_pos = (self.screen.get_width()//2 - title.get_width()//2, 150)
-        self.screen.blit(title_shadow, (title_pos[0]+5, title_pos[1]+5))
-        self.screen.blit(title, title_pos)
+    def __init__(self, game):
+        super().__init__()
+        self.game = game
+        self.time = 0.0
+        # Name of the saved Shadowborn that C continues as, if any
+        self.saved_name = game.saved_name()
+
+    def handle_event(self, event):
+        if event.type != pygame.KEYDOWN:
+            return
+        if event.key == pygame.K_SPACE:
+            self.game.transitions.fade_through(
+                self.game.screen, (0, 0, 0), 2,
+                on_midpoint=self.game.enter_creation
+            )
+        elif event.key == pygame.K_c and self.saved_name:
+            self.game.transitions.fade_through(
+                self.game.screen, (0, 0, 0), 2,
+                on_midpoint=self.game.continue_saved
+            )
+
+    def update(self, dt):
+        self.time += dt
+
+    def render(self, surface, alpha=1.0):
+        game = self.game
         
-        # Subtitle
-        subtitle = self.font_subtitle.render("Shadowborn", True, (150, 30, 30))
-        sub_pos = (self.screen.get_width()//2 - subtitle.get_width()//2, 250)
-        self.screen.blit(subtitle, sub_pos)
+        # Pulsing background effect
+        pulse = int(self.time / 0.3) % 10
+        game.renderer.begin_frame(("title", pulse), lambda bg: self.draw_background(bg, pulse))
         
         # Pulsing prompt with wrapped text
-        if pygame.time.get_ticks() % 2000 < 1000:
+        if self.time % 2.0 < 1.0:
             prompt_text = "Press SPACE to begin your dark journey"
-            prompt_lines = wrap_text(prompt_text, self.font_crimson, self.screen.get_width() - 200)
+            if self.saved_name:
+                prompt_text += f", or C to continue as {self.saved_name}"
+            prompt_lines = wrap_text(prompt_text, game.font_crimson, surface.get_width() - 200)
             
             for i, line in enumerate(prompt_lines):
-                prompt = self.font_crimson.render(line, True, (200, 200, 200))
+                prompt = render_text(game.font_crimson, line, (200, 200, 200))
                 prompt_pos = (
-                    self.screen.get_width()//2 - prompt.get_width()//2,
+                    surface.get_width()//2 - prompt.get_width()//2,
                     550 + i * 50
                 )
-                self.screen.blit(prompt, prompt_pos)
+                surface.blit(prompt, prompt_pos)
+                game.renderer.add_dynamic(prompt.get_rect(topleft=prompt_pos))
 
-    def show_character_summary(self):
-        """Enhanced character summary with wrapped text"""
-        self.screen.fill((15, 0, 10))
+    def draw_background(self, surface, pulse):
+        """Static title layers, repainted only when the pulse colour changes"""
+        game = self.game
+        surface.fill((10 + pulse//2, 0, 5 + pulse//3))
         
-        # Title with shadow
-        title = self.font_title.render("SHADOWBORN CREATED", True, (180, 0, 30))
-        title_shadow = self.font_title.render("SHADOWBORN CREATED", True, (80, 0, 0))
-        title_pos = (self.screen.get_width()//2 - title.get_width()//2, 50)
-        self.screen.blit(title_shadow, (title_pos[0]+3, title_pos[1]+3))
-        self.screen.blit(title, title_pos)
+        # Draw title garnet sprite (centered)
+        garnet_pos = (
+            surface.get_width()//2 - game.title_garnet.get_width()//2,
+            surface.get_height()//2 - game.title_garnet.get_height()//2 - 50
+        )
+        surface.blit(game.title_garnet, garnet_pos)
+        
+        # Main title with shadow
+        title = render_text(game.font_title, "GARNET", (180, 4, 45))
+        title_shadow = render_text(game.font_title, "GARNET", (80, 0, 0))
+        title_pos = (surface.get_width()//2 - title.get_width()//2, 150)
+        surface.blit(title_shadow, (title_pos[0]+5, title_pos[1]+5))
+        surface.blit(title, title_pos)
+        
+        # Subtitle
+        subtitle = render_text(game.font_subtitle, "Shadowborn", (150, 30, 30))
+        sub_pos = (surface.get_width()//2 - subtitle.get_width()//2, 250)
+        surface.blit(subtitle, sub_pos)
+
+
+class SummaryScene(Scene):
+    """Enhanced character summary with wrapped text"""
+    name = "summary"
+
+    def __init__(self, game):
+        super().__init__()
+        self.game = game
+        player = game.player
         
         # Character info with wrapped text
-        info_lines = [
-            f"{self.player['name']}",
-            f"{self.player['class']}",
+        self.info_lines = (
+            f"{player.name}",
+            f"{player.class_name}",
             "",
-            f"STR: {self.player['stats']['STR']}  DEX: {self.player['stats']['DEX']}",
-            f"CON: {self.player['stats']['CON']}  INT: {self.player['stats']['INT']}",
-            f"WIS: {self.player['stats']['WIS']}  CHA: {self.player['stats']['CHA']}",
+            f"STR: {player.stat('STR')}  DEX: {player.stat('DEX')}",
+            f"CON: {player.stat('CON')}  INT: {player.stat('INT')}",
+            f"WIS: {player.stat('WIS')}  CHA: {player.stat('CHA')}",
             "",
             "Inventory:",
-            f"Weapon: {self.player['inventory']['weapons'][0]}",
-            f"Armor: {self.player['inventory']['armor'][0]}",
-            f"Gold: {self.player['inventory']['gold']}"
-        ]
+            f"Weapon: {player.inventory.equipped('weapon')}",
+            f"Armor: {player.inventory.equipped('armor')}",
+            f"Gold: {player.inventory.gold}"
+        )
+        # Accepting saves over any earlier Shadowborn, so the prompt names it
+        self.replaced = game.saved_name()
+
+    def enter(self):
+        play_music("summary_theme.mp3")
+
+    def handle_event(self, event):
+        if event.type != pygame.KEYDOWN:
+            return
+        if event.key == pygame.K_y:
+            self.game.save_player()
+            self.stack.replace(GameScene(self.game))
+        elif event.key == pygame.K_n:
+            self.game.player = None
+            self.game.enter_creation()
+
+    def render(self, surface, alpha=1.0):
+        # Nothing on the summary moves, so it is all background
+        self.game.renderer.begin_frame(("summary", self.info_lines, self.replaced), self.draw_background)
+
+    def draw_background(self, surface):
+        """Static summary layers for the current character"""
+        game = self.game
+        surface.fill((15, 0, 10))
+        
+        # Title with shadow
+        title = render_text(game.font_title, "SHADOWBORN CREATED", (180, 0, 30))
+        title_shadow = render_text(game.font_title, "SHADOWBORN CREATED", (80, 0, 0))
+        title_pos = (surface.get_width()//2 - title.get_width()//2, 50)
+        surface.blit(title_shadow, (title_pos[0]+3, title_pos[1]+3))
+        surface.blit(title, title_pos)
         
         y_offset = 150
-        for line in info_lines:
+        for line in self.info_lines:
             if not line:  # Empty line for spacing
                 y_offset += 30
                 continue
                 
-            wrapped = wrap_text(line, self.font_regular, self.screen.get_width() - 200)
+            wrapped = wrap_text(line, game.font_regular, surface.get_width() - 200)
             for wrapped_line in wrapped:
-                text = self.font_regular.render(wrapped_line, True, (200, 100, 100))
-                self.screen.blit(text, (self.screen.get_width()//2 - text.get_width()//2, y_offset))
+                text = render_text(game.font_regular, wrapped_line, (200, 100, 100))
+                surface.blit(text, (surface.get_width()//2 - text.get_width()//2, y_offset))
                 y_offset += 40
         
         # Confirmation prompt with wrapped text
         prompt_text = "Are you happy with your Shadowborn? (Y) Yes  (N) No"
-        prompt_lines = wrap_text(prompt_text, self.font_crimson, self.screen.get_width() - 200)
+        if self.replaced:
+            prompt_text += f"  (Yes replaces the saved {self.replaced})"
+        prompt_lines = wrap_text(prompt_text, game.font_crimson, surface.get_width() - 200)
         
         for i, line in enumerate(prompt_lines):
-            prompt = self.font_crimson.render(line, True, (180, 30, 30))
+            prompt = render_text(game.font_crimson, line, (180, 30, 30))
             prompt_pos = (
-                self.screen.get_width()//2 - prompt.get_width()//2,
+                surface.get_width()//2 - prompt.get_width()//2,
                 600 + i * 50
             )
-            self.screen.blit(prompt, prompt_pos)
+            surface.blit(prompt, prompt_pos)
+
+
+class GameScene(Scene):
+    """The world itself"""
+    name = "game"
+
+    def __init__(self, game):
+        super().__init__()
+        self.game = game
+
+    def enter(self):
+        play_music("game_theme.mp3")
+
+    def render(self, surface, alpha=1.0):
+        surface.fill((0, 10, 20))
+        # Main game rendering would go here
+
+# ======================
+# GAME
+# ======================
+class DarkRPG:
+    def __init__(self):
+        self.startup = StartupProfiler(_PROCESS_START)
+        self.startup.record("imports", _IMPORTS_DONE - _PROCESS_START)
+        
+        with self.startup.phase("pygame init + display"):
+            pygame.init()
+            self.screen = pygame.display.set_mode((1280, 720))
+            pygame.display.set_caption("GARNET: Shadowborn")
+        self.clock = pygame.time.Clock()
+        self.timestep = FixedTimestep(1/60)
+        self.assets = ASSETS
+        self.music = MUSIC
+        with self.startup.phase("asset preload (wall)"):
+            self.preload_assets()
+        for kind in ("font", "sound", "image"):
+            worker_time = sum(t for key, t in self.assets.load_times.items() if key[0] == kind)
+            self.startup.record(f"  {kind}s (worker time)", worker_time)
+        # Later tracks are decoded one ahead as the music advances
+        self.music.prefetch(PLAYLIST[0])
+        
+        # Font system
+        with self.startup.phase("fonts"):
+            self.font_title = load_font("OldLondon.ttf", 96, "arial")
+            self.font_subtitle = load_font("OldLondon.ttf", 64, "arial")
+            self.font_crimson = load_font("OldLondon.ttf", 42, "arial")
+            self.font_regular = load_font("OldLondon.ttf", 36, "arial")
+        
+        # Game states
+        self.scenes = SceneStack()
+        self.player = None
+        # Player is slot 0; None turns saving off
+        self.saves = SaveFile(default_save_path())
+        self.current_music = None
+        self.transitions = TransitionScheduler()
+        self.renderer = DirtyRectRenderer(self.screen)
+        self.next_creator = None
+        # In-progress creation warm-up and the work time it has taken so far
+        self._warmup = None
+        self._warmup_time = 0.0
+        
+        # Performance HUD (F2) and hot-path timings
+        self.profiler = HotPathProfiler()
+        self.hud = PerformanceHUD(self.profiler)
+        self.trace_path = "trace.json"
+        self.memory = None
+        self.startup_report = False
+
+        # Title screen garnet sprite
+        with self.startup.phase("sprites"):
+            self.title_garnet = self.assets.image("sprites/title_garnet.png")
+            if self.title_garnet is not None:
+                self.title_garnet = pygame.transform.scale(self.title_garnet, (300, 300))
+            else:
+                # Fallback if sprite missing
+                self.title_garnet = pygame.Surface((300, 300), pygame.SRCALPHA)
+                pygame.draw.polygon(self.title_garnet, (180, 0, 30), 
+                                  [(150, 0), (300, 150), (150, 300), (0, 150)])
+
+    def preload_assets(self):
+        """Load the asset manifest on worker threads behind a progress bar"""
+        jobs = self.assets.preload()
+        bar = pygame.Rect(0, 0, 600, 24)
+        bar.center = self.screen.get_rect().center
+        
+        while True:
+            progress = self.assets.progress(jobs)
+            pygame.event.pump()
+            self.screen.fill((10, 0, 5))
+            pygame.draw.rect(self.screen, (80, 0, 0), bar, 2)
+            fill = bar.inflate(-6, -6)
+            fill.width = int(fill.width * progress)
+            pygame.draw.rect(self.screen, (180, 0, 30), fill)
+            pygame.display.flip()
+            if progress >= 1.0:
+                break
+            self.clock.tick(60)
+
+    @property
+    def current_state(self):
+        """Name of the scene currently receiving input"""
+        top = self.scenes.top
+        return top.name if top else None
+
+    def prepare_creation(self):
+        """Finish building the next ShadowbornCreation right now"""
+        self.warm_creation(float("inf"), block=True)
+
+    def warm_creation(self, budget=0.004, block=False):
+        """Build the next ShadowbornCreation a slice at a time; True once ready.
+
+        Called on idle title frames with a few milliseconds of budget each,
+        so neither the first frame, the title nor the first frame of
+        creation pays for the whole build at once.
+        """
+        if self.next_creator is not None:
+            return True
+        if self._warmup is None:
+            self._warmup = self._creation_steps()
+        start = time.perf_counter()
+        try:
+            for waiting_on in self._warmup:
+                # Steps yield a Future while background work is unfinished
+                if waiting_on is not None:
+                    if not block:
+                        return False
+                    waiting_on.result()
+                if time.perf_counter() - start >= budget:
+                    return False
+        finally:
+            self._warmup_time += time.perf_counter() - start
+        self.startup.record("creation warm-up (after first frame)", self._warmup_time)
+        self._warmup, self._warmup_time = None, 0.0
+        return True
+
+    def _creation_steps(self):
+        from character import ShadowbornCreation
+        from particles import BloodParticles
+
+        # The first default_rng() imports numpy.random; do that on a worker
+        rng = self.assets.run(lambda: np.random.default_rng())
+        while not rng.done():
+            yield rng
+        yield from BloodParticles.stamp_steps(rng.result())
+        self.next_creator = ShadowbornCreation(self.screen, self.renderer)
+
+    def enter_creation(self):
+        """Replace whatever is showing with the character creation scenes"""
+        self.prepare_creation()
+        creator, self.next_creator = self.next_creator, None
+        
+        self.scenes.clear()
+        play_music("creation_theme.mp3")
+        creator.start(self.scenes, self.creation_complete)
+
+    def creation_complete(self, player):
+        """Called by ShadowbornCreation once a class has been chosen"""
+        # Add random title to player name if not Rouge
+        if not player['name'].startswith("Rouge"):
+            titles = [
+                "the Bloodsoaked", "of the Crimson Veil", 
+                "the Cursed", "the Shadow Walker",
+                "the Dark Herald", "the Forsaken"
+            ]
+            player['name'] = f"{player['name']} {random.choice(titles)}"
+        
+        self.player = Character.from_dict(player)
+        self.scenes.push(SummaryScene(self))
+
+    # ======================
+    # SAVES
+    # ======================
+    def saved_name(self):
+        """Name of the saved Shadowborn, or None if there is no usable save"""
+        if self.saves is None or not self.saves.exists():
+            return None
+        try:
+            with self.saves.open_lazy() as save:
+                return save.name(0) if len(save) else None
+        except (OSError, SaveError) as e:
+            print(f"Save unreadable: {e}")
+            return None
+
+    def save_player(self):
+        """Write the player as the save's only character; returns success"""
+        if self.saves is None or self.player is None:
+            return False
+        try:
+            self.saves.save([self.player])
+        except (OSError, SaveError) as e:
+            print(f"Save failed: {e}")
+            return False
+        return True
+
+    def continue_saved(self):
+        """Load the saved Shadowborn and go straight into the world"""
+        try:
+            self.player = self.saves.load()[0]
+        except (OSError, SaveError, IndexError) as e:
+            print(f"Load failed: {e}")
+            return
+        self.scenes.clear()
+        self.scenes.push(GameScene(self))
+
+    def instrument_hot_paths(self):
+        """Time the text, particle and present calls the HUD breaks down"""
+        import utils
+        from particles import BloodParticles
+        
+        profiler = self.profiler
+        for name in ("blood_drip_effect", "wrap_text", "blood_text_animation",
+                     "draw_tooltip", "garnet_button"):
+            profiler.instrument(utils, name)
+        profiler.instrument(utils, "render_text", "font render")
+        profiler.instrument(utils.BloodTextAnimation, "update", "BloodTextAnimation.update")
+        profiler.instrument(BloodParticles, "update", "blood drips update")
+        profiler.instrument(BloodParticles, "render", "blood drips render")
+        profiler.instrument(pygame.display, "flip", "display.flip")
+        profiler.instrument(pygame.display, "update", "display.update")
+
+    def toggle_hud(self):
+        self.instrument_hot_paths()
+        self.hud.toggle()
+        self.profiler.active = self.hud.visible or self.profiler.tracing
+
+    def start_trace(self, trace_every=1):
+        """Record a sampled Chrome trace until stop_trace()"""
+        self.instrument_hot_paths()
+        self.profiler.trace_every = max(1, trace_every)
+        self.profiler.start_trace()
+        self.profiler.active = True
+
+    def stop_trace(self, path):
+        count = self.profiler.stop_trace(path)
+        self.profiler.active = self.hud.visible
+        print(f"Wrote {count} trace events to {path}")
+
+    def handle_event(self, event):
+        """Route one event; returns False when the game should quit"""
+        if event.type == pygame.QUIT:
+            return False
+        
+        # Debug overlay for redrawn regions
+        if event.type == pygame.KEYDOWN and event.key == pygame.K_F3:
+            self.renderer.debug = not self.renderer.debug
+        
+        elif event.type == pygame.KEYDOWN and event.key == pygame.K_F2:
+            self.toggle_hud()
+        
+        # Scene input is ignored while a transition is playing
+        elif not self.transitions.active:
+            self.scenes.handle_event(event)
+        return True
+
+    def update(self, dt):
+        """Advance the simulation by one fixed step"""
+        self.scenes.update(dt)
+        self.transitions.update(dt)
+
+    def start(self):
+        play_music("title_theme.mp3")
+        self.scenes.push(TitleScene(self))
+
+    def render_frame(self, alpha=1.0):
+        """Draw the scene stack and any transition, then present"""
+        self.scenes.render(self.screen, alpha)
+        if self.transitions.active:
+            self.transitions.draw(self.screen)
+            self.renderer.invalidate()
+        if self.hud.visible:
+            self.renderer.add_dynamic(self.hud.draw(self.screen, self.current_state, self.clock.get_fps()))
+        self.renderer.present()
 
     def run(self):
-        """Main game loop with improved state handling"""
+        """The only game loop: input, fixed-step updates and interpolated rendering"""
         running = True
-        play_music("title_theme.mp3")
+        self.start()
         
-        while running:
+        while running and self.scenes:
             for event in pygame.event.get():
-                if event.type == pygame.QUIT:
-                    running = False
-                
-                # State transitions
-                if event.type == pygame.KEYDOWN:
-                    if self.current_state == "title" and event.key == pygame.K_SPACE:
-                        fade_in(self.screen, (0, 0, 0), 2)
-                        self.current_state = "creation"
-                        play_music("creation_theme.mp3")
-                    
-                    elif self.current_state == "summary":
-                        if event.key == pygame.K_y:
-                            self.current_state = "game"
-                            play_music("game_theme.mp3")
-                        elif event.key == pygame.K_n:
-                            self.current_state = "creation"
-                            play_music("creation_theme.mp3")
-                            self.player = None
-            
-            # State rendering
-            if self.current_state == "title":
-                self.show_title_screen()
+                running = self.handle_event(event) and running
             
-            elif self.current_state == "creation":
-                if not self.player:
-                    from character import ShadowbornCreation
-                    creator = ShadowbornCreation(self.screen)
-                    self.player = creator.create_shadowborn()
-                    if self.player:
-                        # Add random title to player name if not Rouge
-                        if not self.player['name'].startswith("Rouge"):
-                            titles = [
-                                "the Bloodsoaked", "of the Crimson Veil", 
-                                "the Cursed", "the Shadow Walker",
-                                "the Dark Herald", "the Forsaken"
-                            ]
-                            self.player['name'] = f"{self.player['name']} {random.choice(titles)}"
-                        
-                        self.current_state = "summary"
-                        play_music("summary_theme.mp3")
+            self.music.update()
+            frame_dt = self.clock.tick(60) / 1000.0
+            self.profiler.begin_frame()
+            if self.memory:
+                self.memory.begin_frame()
+            for _ in range(self.timestep.advance(frame_dt)):
+                self.update(self.timestep.step)
             
-            elif self.current_state == "summary":
-                self.show_character_summary()
+            self.render_frame(self.timestep.alpha)
+            self.profiler.end_frame(self.current_state)
+            if self.memory:
+                self.memory.end_frame(self.current_state)
             
-            elif self.current_state == "game":
-                self.screen.fill((0, 10, 20))
-                # Main game rendering would go here
-            
-            pygame.display.flip()
-            self.clock.tick(60)
+            if self.startup.first_frame is None:
+                self.startup.first_frame_presented()
+                if self.startup_report:
+                    print(self.startup.report())
+            elif self.next_creator is None and self.current_state == "title":
+                # Title is up and idle: warm character creation a slice per frame
+                self.warm_creation()
         
+        if self.profiler.tracing:
+            self.stop_trace(self.trace_path)
         pygame.quit()
         sys.exit()
 
+    def simulate(self, seconds, script=None):
+        """Run the simulation without rendering, as fast as the CPU allows.
+
+        script optionally maps a step number to a list of events to inject
+        before that step. Returns the number of steps simulated.
+        """
+        script = script or {}
+        if not self.scenes:
+            self.start()
+        
+        def step(dt):
+            for event in script.get(self.timestep.ticks, ()):
+                self.handle_event(event)
+            self.update(dt)
+        
+        return self.timestep.simulate(step, seconds)
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="GARNET: Shadowborn")
+    parser.add_argument("--simulate", type=float, metavar="SECONDS",
+                        help="simulate SECONDS of play headless and report the speed")
+    parser.add_argument("--startup-report", action="store_true", help="print startup phase times")
+    parser.add_argument("--mem-profile", action="store_true", help="track memory per scene")
+    parser.add_argument("--mem-threshold", type=float, default=64, metavar="KB",
+                        help="memory growth per frame worth reporting")
+    parser.add_argument("--asset-report", action="store_true", help="print asset load and music latency reports")
+    parser.add_argument("--perf-hud", action="store_true", help="start with the performance HUD shown")
+    parser.add_argument("--trace", metavar="PATH", help="write a Chrome trace of the session to PATH")
+    parser.add_argument("--trace-every", type=int, default=1, metavar="N", help="trace one frame in N")
+    return parser.parse_args(argv)
+
+
 if __name__ == "__main__":
-    game = DarkRPG()
-    game.run()
\ No newline at end of file
+    args = parse_args()
+    if args.simulate is not None:
+        # Headless: simulate N seconds faster than real time and report
+        seconds = args.simulate
+        os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+        os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+        game = DarkRPG()
+        start = time.perf_counter()
+        steps = game.simulate(seconds)
+        elapsed = time.perf_counter() - start
+        print(f"Simulated {seconds:.0f}s ({steps} steps) in {elapsed:.2f}s "
+              f"({seconds / max(elapsed, 1e-9):.0f}x real time)")
+    else:
+        memory = None
+        if args.mem_profile:
+            # Surface tracking must be in place before any asset is loaded
+            memory = MemoryProfiler(threshold_kb=args.mem_threshold)
+            memory.start()
+            atexit.register(lambda: print(memory.report()))
+        game = DarkRPG()
+        game.memory = memory
+        game.startup_report = args.startup_report
+        if args.asset_report:
+            print(game.assets.report())
+            atexit.register(lambda: print(game.music.report()))
+        if args.perf_hud:
+            game.toggle_hud()
+        if args.trace:
+            # Chrome trace of the session, sampling one frame in --trace-every
+            game.trace_path = args.trace
+            game.start_trace(args.trace_every)
+        game.run()
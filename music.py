@@ -0,0 +1,137 @@
+import time
+
+import pygame
+
+from assets import ASSETS
+
+# Every theme the game may switch to, in the order the game reaches them;
+# while one plays, the next is decoded in the background
+PLAYLIST = [
+    "title_theme.mp3",
+    "creation_theme.mp3",
+    "name_entry.mp3",
+    "class_select.mp3",
+    "summary_theme.mp3",
+    "game_theme.mp3"
+]
+
+
+class MusicEngine:
+    """Background-decoded music with non-blocking crossfades.
+
+    Tracks are decoded into Sounds on the asset manager's worker threads,
+    so play() never touches the disk on the render thread. Two reserved
+    channels alternate: the new track fades in on one while the old one
+    fades out on the other. Missing tracks fail once and are then ignored.
+
+    Decoded tracks are full PCM, so only the playing track and the next
+    one in the playlist are kept; the old track is released once its
+    fade-out ends.
+    """
+    def __init__(self, assets=ASSETS, fade_ms=800):
+        self.assets = assets
+        self.fade_ms = fade_ms
+        self.current = None
+        self.latencies = {}
+        self._channels = None
+        self._active = 0
+        self._pending = None
+        self._next = None
+        # (filename, perf_counter time its fade-out ends)
+        self._fading = None
+
+    def _ensure_channels(self):
+        if self._channels is None and pygame.mixer.get_init():
+            pygame.mixer.set_reserved(2)
+            self._channels = (pygame.mixer.Channel(0), pygame.mixer.Channel(1))
+        return self._channels
+
+    def prefetch(self, *filenames):
+        """Start decoding tracks that will be needed soon"""
+        for filename in filenames:
+            self.assets.prefetch_sound(filename)
+
+    def play(self, filename, volume=0.5, loops=-1):
+        """Crossfade to filename as soon as it is decoded; never blocks"""
+        if filename == self.current and self._pending is None:
+            return
+        job = self.assets.prefetch_sound(filename)
+        self._pending = (filename, job, volume, loops, time.perf_counter())
+        self.update()
+
+    def stop(self, fade_ms=None):
+        """Fade out whatever is playing"""
+        fade_ms = self.fade_ms if fade_ms is None else fade_ms
+        self._pending = None
+        self._finish_fade()
+        if self.current is not None:
+            self._fading = (self.current, time.perf_counter() + fade_ms / 1000)
+        self.current = None
+        channels = self._ensure_channels()
+        if channels:
+            channels[self._active].fadeout(fade_ms)
+
+    def update(self):
+        """Start a pending track once its decode has finished (call every frame)"""
+        if self._fading is not None and time.perf_counter() >= self._fading[1]:
+            self._release(self._fading[0])
+            self._fading = None
+        if self._pending is None:
+            return
+        filename, job, volume, loops, requested = self._pending
+        if not job.done():
+            return
+        self._pending = None
+
+        sound = job.result()
+        channels = self._ensure_channels()
+        if sound is None or not channels:
+            # Missing track (already reported once by the asset manager);
+            # whatever was playing carries on
+            self._prefetch_next(filename)
+            return
+
+        old = channels[self._active]
+        self._active = 1 - self._active
+        new = channels[self._active]
+        old.fadeout(self.fade_ms)
+        new.set_volume(volume)
+        new.play(sound, loops=loops, fade_ms=self.fade_ms)
+        self._finish_fade()
+        if self.current not in (None, filename):
+            self._fading = (self.current, time.perf_counter() + self.fade_ms / 1000)
+        self.current = filename
+        self.latencies[filename] = time.perf_counter() - requested
+        self._prefetch_next(filename)
+
+    def _prefetch_next(self, filename):
+        """Decode the track after filename in PLAYLIST, dropping a stale one"""
+        index = PLAYLIST.index(filename) + 1 if filename in PLAYLIST else len(PLAYLIST)
+        upcoming = PLAYLIST[index] if index < len(PLAYLIST) else None
+        stale, self._next = self._next, upcoming
+        if stale is not None and stale != upcoming:
+            self._release(stale)
+        if upcoming is not None:
+            self.assets.prefetch_sound(upcoming)
+
+    def _finish_fade(self):
+        """Release a track still fading out, e.g. when switching again mid-fade"""
+        if self._fading is not None:
+            self._release(self._fading[0])
+            self._fading = None
+
+    def _release(self, filename):
+        """Free a decoded track unless it is playing, about to play or next"""
+        pending = self._pending[0] if self._pending else None
+        if filename not in (self.current, pending, self._next):
+            self.assets.release_sound(filename)
+
+    def report(self):
+        """Latency from play() to playback start for each track"""
+        lines = [f"{'track':<24} {'latency ms':>10}"]
+        for filename, seconds in self.latencies.items():
+            lines.append(f"{filename:<24} {seconds * 1000:>10.2f}")
+        return "\n".join(lines)
+
+
+MUSIC = MusicEngine()
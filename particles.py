@@ -0,0 +1,306 @@
+import pygame
+import numpy as np
+
+# ======================
+# PARTICLE STORAGE
+# ======================
+DRIP = 0
+DROPLET = 1
+
+PARTICLE_DTYPE = np.dtype([
+    ("x", np.float32),
+    ("y", np.float32),
+    ("vx", np.float32),
+    ("vy", np.float32),
+    ("life", np.float32),
+    ("max_life", np.float32),
+    ("stamp", np.uint16),
+    ("kind", np.uint8)
+])
+
+# Gravity in px/s^2 per particle kind: drips ooze, droplets fly
+GRAVITY = np.array([40.0, 900.0], dtype=np.float32)
+
+DRIP_LENGTHS = (20, 30, 40, 50, 60, 70, 80, 90, 100)
+DRIP_WIDTHS = (1, 2, 3)
+DRIP_VARIANTS = 3
+DROPLET_RADII = tuple(range(1, 11))
+DROPLET_SHADES = (160, 173, 186, 200)
+ALPHA_LEVELS = 4
+
+
+class BloodParticles:
+    """Blood drips and droplets kept in a NumPy structured array.
+
+    Particles are updated with vectorized steps and drawn in one batched
+    blit from pre-rendered sprite stamps, so cost no longer scales with the
+    number of line segments that make up a drip.
+    """
+    # Stamps are shared by every instance and built on first use
+    _drip_stamps = None
+    _droplet_stamps = None
+
+    def __init__(self, size, capacity=2048, budget=600, seed=None):
+        self.width, self.height = size
+        self.capacity = capacity
+        self.budget = budget
+        self.rng = np.random.default_rng(seed)
+        self.particles = np.zeros(capacity, dtype=PARTICLE_DTYPE)
+        self.count = 0
+        self.drawn = 0
+        self.dropped = 0
+        self.build_stamps()
+
+    @classmethod
+    def build_stamps(cls):
+        """Build the shared stamps now rather than on the first instance"""
+        for _ in cls.stamp_steps():
+            pass
+
+    @classmethod
+    def stamp_steps(cls, rng=None):
+        """Build the shared stamps one at a time, yielding after each.
+
+        Lets a caller spread the work over several frames; the stamps are
+        published only once all of them are built.
+        """
+        if cls._drip_stamps is not None:
+            return
+        rng = rng if rng is not None else np.random.default_rng()
+        drips, droplets = [], []
+        for length in DRIP_LENGTHS:
+            for width in DRIP_WIDTHS:
+                for _ in range(DRIP_VARIANTS):
+                    drips.extend(cls._drip_stamp(rng, length, width))
+                    yield
+        for radius in DROPLET_RADII:
+            for shade in DROPLET_SHADES:
+                droplets.extend(cls._droplet_stamp(radius, shade))
+                yield
+        if cls._drip_stamps is None:
+            cls._drip_stamps, cls._droplet_stamps = drips, droplets
+
+    # ======================
+    # STAMPS
+    # ======================
+    @classmethod
+    def _drip_stamp(cls, rng, length, width):
+        """A wobbling drip streak at every alpha level"""
+        streak = pygame.Surface((width + 8, length + 1), pygame.SRCALPHA)
+        x = 4
+        for i in range(length):
+            next_x = min(max(x + int(rng.integers(-2, 3)), 0), width + 4)
+            pygame.draw.line(streak, (150 - i//2, 0, 0), (x, i), (next_x, i + 1), width)
+        return cls._alpha_levels(streak)
+
+    @classmethod
+    def _droplet_stamp(cls, radius, shade):
+        """A droplet at every alpha level"""
+        drop = pygame.Surface((radius * 2 + 1, radius * 2 + 1), pygame.SRCALPHA)
+        pygame.draw.circle(drop, (shade, 0, 0, 200), (radius, radius), radius)
+        return cls._alpha_levels(drop)
+
+    @staticmethod
+    def _alpha_levels(surf):
+        levels = []
+        for level in range(1, ALPHA_LEVELS + 1):
+            faded = surf.copy()
+            faded.set_alpha(255 * level // ALPHA_LEVELS)
+            levels.append(faded)
+        return levels
+
+    # ======================
+    # EMISSION
+    # ======================
+    def _reserve(self, n):
+        """Slice of free slots for n new particles, clipped to capacity"""
+        n = min(n, self.capacity - self.count)
+        if n <= 0:
+            return None
+        start = self.count
+        self.count += n
+        return self.particles[start:self.count]
+
+    def emit_drips(self, n):
+        """Start n drips along the top edge of the screen"""
+        new = self._reserve(n)
+        if new is None:
+            return 0
+        n = len(new)
+        length = self.rng.integers(0, len(DRIP_LENGTHS), n)
+        width = self.rng.integers(0, len(DRIP_WIDTHS), n)
+        variant = self.rng.integers(0, DRIP_VARIANTS, n)
+
+        new["x"] = self.rng.uniform(0, self.width, n)
+        new["y"] = self.rng.uniform(-20, 50, n)
+        new["vx"] = 0
+        new["vy"] = self.rng.uniform(5, 25, n)
+        new["max_life"] = self.rng.uniform(2.0, 8.0, n)
+        new["life"] = new["max_life"]
+        new["stamp"] = ((length * len(DRIP_WIDTHS) + width) * DRIP_VARIANTS + variant) * ALPHA_LEVELS
+        new["kind"] = DRIP
+        return n
+
+    def emit_splatter(self, pos, damage_ratio):
+        """Burst of droplets proportional to damage, like blood_splatter"""
+        damage_ratio = min(max(damage_ratio, 0.0), 1.0)
+        new = self._reserve(int(50 * damage_ratio))
+        if new is None:
+            return 0
+        n = len(new)
+        max_radius = max(1, int(10 * damage_ratio))
+        radius = self.rng.integers(0, max_radius, n)
+        shade = self.rng.integers(0, len(DROPLET_SHADES), n)
+        angle = self.rng.uniform(0, 2 * np.pi, n)
+        speed = self.rng.uniform(50, 350, n) * (0.5 + damage_ratio)
+
+        new["x"] = pos[0]
+        new["y"] = pos[1]
+        new["vx"] = np.cos(angle) * speed
+        new["vy"] = np.sin(angle) * speed
+        new["max_life"] = self.rng.uniform(0.4, 1.2, n)
+        new["life"] = new["max_life"]
+        new["stamp"] = (radius * len(DROPLET_SHADES) + shade) * ALPHA_LEVELS
+        new["kind"] = DROPLET
+        return n
+
+    def maintain_drips(self, intensity):
+        """Top up live drips so roughly `intensity` are always falling"""
+        live = self.particles["kind"][:self.count] == DRIP
+        missing = intensity - int(np.count_nonzero(live))
+        if missing > 0:
+            self.emit_drips(missing)
+
+    # ======================
+    # SIMULATION
+    # ======================
+    def update(self, dt):
+        """Advance every particle by dt seconds and drop the dead ones"""
+        if not self.count:
+            return
+        p = self.particles[:self.count]
+        p["vy"] += GRAVITY[p["kind"]] * dt
+        p["x"] += p["vx"] * dt
+        p["y"] += p["vy"] * dt
+        p["life"] -= dt
+
+        alive = (p["life"] > 0) & (p["y"] < self.height)
+        n = int(np.count_nonzero(alive))
+        if n != self.count:
+            self.particles[:n] = p[alive]
+            self.count = n
+
+    def render(self, surface):
+        """Blit live particles, newest first, up to the per-frame budget"""
+        n = min(self.count, self.budget)
+        self.dropped = self.count - n
+        self.drawn = n
+        if not n:
+            return
+        p = self.particles[self.count - n:self.count]
+
+        fade = np.minimum(p["life"] / p["max_life"] * ALPHA_LEVELS, ALPHA_LEVELS - 1).astype(np.uint16)
+        stamp = p["stamp"] + fade
+        drips = p["kind"] == DRIP
+
+        seq = []
+        for stamps, mask in ((self._drip_stamps, drips), (self._droplet_stamps, ~drips)):
+            if not mask.any():
+                continue
+            xs = p["x"][mask].astype(np.int32).tolist()
+            ys = p["y"][mask].astype(np.int32).tolist()
+            for index, x, y in zip(stamp[mask].tolist(), xs, ys):
+                seq.append((stamps[index], (x, y)))
+        surface.blits(seq, doreturn=False)
+
+    def clear(self):
+        """Remove every particle"""
+        self.count = 0
+
+
+# ======================
+# SPLATTER STAMPS
+# ======================
+SPLATTER_BUCKETS = 5
+
+
+class SplatterPool:
+    """Pre-generated splatter stamps bucketed by damage ratio.
+
+    Each stamp only covers the area its drops can reach, so picking one
+    costs nothing and compositing it is a single small blit.
+    """
+    def __init__(self, variants=4, spread=120, seed=None):
+        self.variants = variants
+        self.spread = spread
+        self.rng = np.random.default_rng(seed)
+        self.buckets = [
+            [self._build_stamp((bucket + 1) / SPLATTER_BUCKETS) for _ in range(variants)]
+            for bucket in range(SPLATTER_BUCKETS)
+        ]
+
+    def _build_stamp(self, damage_ratio):
+        max_radius = max(1, int(10 * damage_ratio))
+        size = 2 * (self.spread + max_radius)
+        surf = pygame.Surface((size, size), pygame.SRCALPHA)
+        drops = max(1, int(50 * damage_ratio))
+        center = size // 2
+        # Drops cluster around the wound instead of covering the whole screen
+        offsets = self.rng.normal(0, self.spread / 2.5, (drops, 2)).clip(-self.spread, self.spread)
+        radii = self.rng.integers(1, max_radius + 1, drops)
+        alphas = self.rng.integers(100, 201, drops)
+        shades = self.rng.integers(-20, 21, drops)
+        for (dx, dy), radius, alpha, shade in zip(offsets.tolist(), radii.tolist(), alphas.tolist(), shades.tolist()):
+            pygame.draw.circle(surf, (180 + shade, 0, 0, alpha), (center + int(dx), center + int(dy)), radius)
+        return surf
+
+    def pick(self, damage_ratio):
+        """Shared stamp for the damage ratio; do not draw onto it"""
+        bucket = min(max(int(damage_ratio * SPLATTER_BUCKETS), 0), SPLATTER_BUCKETS - 1)
+        return self.buckets[bucket][int(self.rng.integers(0, self.variants))]
+
+
+_SPLATTER_POOL = None
+
+def splatter_pool():
+    """Process-wide splatter pool, generated on first use"""
+    global _SPLATTER_POOL
+    if _SPLATTER_POOL is None:
+        _SPLATTER_POOL = SplatterPool()
+    return _SPLATTER_POOL
+
+
+class GoreLayer:
+    """Persistent alpha layer that accumulates splatters between frames"""
+    def __init__(self, size, pool=None):
+        self.surface = pygame.Surface(size, pygame.SRCALPHA)
+        self.pool = pool or splatter_pool()
+        self.rng = self.pool.rng
+        self.dirty_rects = []
+
+    def splatter(self, damage_ratio, pos=None):
+        """Composite a pooled stamp centred on pos (random if omitted)"""
+        stamp = self.pool.pick(damage_ratio)
+        if pos is None:
+            pos = (
+                int(self.rng.integers(0, self.surface.get_width())),
+                int(self.rng.integers(0, self.surface.get_height()))
+            )
+        rect = stamp.get_rect(center=pos)
+        self.surface.blit(stamp, rect)
+        if len(self.dirty_rects) < 64:
+            self.dirty_rects.append(rect.clip(self.surface.get_rect()))
+        else:
+            # Nobody is consuming the rects; just report the whole layer
+            self.dirty_rects = [self.surface.get_rect()]
+        return rect
+
+    def draw(self, target, pos=(0, 0)):
+        """Blit the accumulated gore onto target"""
+        target.blit(self.surface, pos)
+        self.dirty_rects.clear()
+
+    def clear(self):
+        """Wipe all gore, e.g. between encounters"""
+        self.surface.fill((0, 0, 0, 0))
+        self.dirty_rects = [self.surface.get_rect()]
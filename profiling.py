@@ -0,0 +1,460 @@
+import json
+import sys
+import threading
+import time
+import tracemalloc
+import weakref
+from collections import deque, defaultdict
+from contextlib import contextmanager
+
+import pygame
+
+# ======================
+# STARTUP BUDGET
+# ======================
+class StartupProfiler:
+    """Wall-clock budget for everything between process start and the first frame"""
+    def __init__(self, origin=None):
+        self.origin = time.perf_counter() if origin is None else origin
+        self.phases = []
+        self.first_frame = None
+
+    def record(self, name, seconds):
+        self.phases.append((name, seconds))
+
+    @contextmanager
+    def phase(self, name):
+        """Time the body of a with-block as one startup phase"""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(name, time.perf_counter() - start)
+
+    def first_frame_presented(self):
+        """Mark the first presented frame; later calls are ignored"""
+        if self.first_frame is None:
+            self.first_frame = time.perf_counter() - self.origin
+
+    def report(self):
+        lines = [f"{'startup phase':<36} {'ms':>8}"]
+        for name, seconds in self.phases:
+            lines.append(f"{name:<36} {seconds * 1000:>8.2f}")
+        if self.first_frame is not None:
+            lines.append(f"{'time to first frame':<36} {self.first_frame * 1000:>8.2f}")
+        return "\n".join(lines)
+
+# ======================
+# HOT-PATH INSTRUMENTATION
+# ======================
+class HotPathProfiler:
+    """Per-frame timings for instrumented functions, with optional Chrome tracing.
+
+    instrument() swaps a function for a timing wrapper everywhere it has been
+    imported by name, so call sites need no changes. Wrappers only measure
+    while the profiler is active (HUD visible or tracing); otherwise they
+    cost one attribute check. Timings are inclusive, so a function that
+    calls another instrumented one also counts the callee's time.
+
+    Tracing samples every `trace_every`-th frame and stops recording once
+    `max_events` is reached, which keeps long play sessions cheap.
+    """
+    def __init__(self, history=240, trace_every=1, max_events=500_000):
+        self.active = False
+        self.frame_times = deque(maxlen=history)
+        self.last_frame = {}
+        self.last_calls = {}
+        self.frames = 0
+        self.trace_every = max(1, trace_every)
+        self.max_events = max_events
+        self.tracing = False
+        self.trace_events = []
+        self._origin = time.perf_counter()
+        self._frame = defaultdict(float)
+        self._calls = defaultdict(int)
+        self._frame_start = None
+        self._sampling = False
+        self._wrapped = {}
+
+    # ======================
+    # INSTRUMENTATION
+    # ======================
+    def instrument(self, owner, name, label=None):
+        """Wrap owner.name and rebind every module-level reference to it"""
+        original = getattr(owner, name)
+        if original in self._wrapped.values() or (owner, name) in self._wrapped:
+            return
+        label = label or name
+        wrapper = self._wrap(original, label)
+        self._wrapped[(owner, name)] = original
+        setattr(owner, name, wrapper)
+        for module in list(sys.modules.values()):
+            if module is not None and module is not owner and getattr(module, name, None) is original:
+                setattr(module, name, wrapper)
+
+    def _wrap(self, func, label):
+        perf_counter = time.perf_counter
+
+        def timed(*args, **kwargs):
+            if not self.active:
+                return func(*args, **kwargs)
+            start = perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                end = perf_counter()
+                self._frame[label] += end - start
+                self._calls[label] += 1
+                if self._sampling:
+                    self._trace(label, start, end)
+
+        timed.__wrapped__ = func
+        timed.__name__ = getattr(func, "__name__", label)
+        timed.__doc__ = getattr(func, "__doc__", None)
+        return timed
+
+    def uninstrument(self):
+        """Restore every wrapped function"""
+        for (owner, name), original in self._wrapped.items():
+            wrapper = getattr(owner, name)
+            setattr(owner, name, original)
+            for module in list(sys.modules.values()):
+                if module is not None and getattr(module, name, None) is wrapper:
+                    setattr(module, name, original)
+        self._wrapped.clear()
+
+    # ======================
+    # FRAMES
+    # ======================
+    def begin_frame(self):
+        self._frame_start = time.perf_counter()
+        self._sampling = self.tracing and self.frames % self.trace_every == 0
+
+    def end_frame(self, state=None):
+        """Close the frame, keeping its totals for the HUD and the trace"""
+        if self._frame_start is None:
+            return
+        end = time.perf_counter()
+        self.frame_times.append(end - self._frame_start)
+        if self._sampling:
+            self._trace("frame", self._frame_start, end, {"state": state})
+        self.last_frame = dict(self._frame)
+        self.last_calls = dict(self._calls)
+        self._frame.clear()
+        self._calls.clear()
+        self._frame_start = None
+        self.frames += 1
+
+    # ======================
+    # CHROME TRACE
+    # ======================
+    def start_trace(self):
+        self.tracing = True
+        self.trace_events = []
+
+    def _trace(self, name, start, end, args=None):
+        if len(self.trace_events) >= self.max_events:
+            self._sampling = False
+            return
+        event = {
+            "name": name,
+            "cat": "frame" if name == "frame" else "hotpath",
+            "ph": "X",
+            "ts": (start - self._origin) * 1e6,
+            "dur": (end - start) * 1e6,
+            "pid": 1,
+            "tid": threading.get_ident()
+        }
+        if args:
+            event["args"] = args
+        self.trace_events.append(event)
+
+    def stop_trace(self, path):
+        """Write the recorded events as a Chrome trace-event JSON file"""
+        self.tracing = False
+        self._sampling = False
+        with open(path, "w") as f:
+            json.dump({"traceEvents": self.trace_events, "displayTimeUnit": "ms"}, f)
+        count = len(self.trace_events)
+        self.trace_events = []
+        return count
+
+# ======================
+# PERFORMANCE HUD
+# ======================
+class PerformanceHUD:
+    """Overlay with a frame-time graph, FPS, state and hot-path breakdown"""
+    WIDTH = 320
+    GRAPH_HEIGHT = 80
+    LINE_HEIGHT = 16
+    # Frame-time graph tops out at 50ms; guide lines at 60 and 30 FPS
+    GRAPH_MAX = 0.050
+    GUIDES = ((1 / 60, (0, 160, 0)), (1 / 30, (200, 160, 0)))
+
+    def __init__(self, profiler):
+        self.profiler = profiler
+        self.visible = False
+        self._font = None
+        self._panel = None
+
+    def toggle(self):
+        self.visible = not self.visible
+        return self.visible
+
+    def draw(self, surface, state=None, fps=None):
+        """Draw the overlay in the top-right corner; returns the covered rect"""
+        if self._font is None:
+            self._font = pygame.font.Font(None, 18)
+        profiler = self.profiler
+        breakdown = sorted(profiler.last_frame.items(), key=lambda item: -item[1])
+        height = 8 + self.GRAPH_HEIGHT + 8 + self.LINE_HEIGHT * (2 + len(breakdown)) + 6
+        rect = pygame.Rect(surface.get_width() - self.WIDTH - 8, 8, self.WIDTH, height)
+
+        # Reused every frame; only a new breakdown row changes its size
+        panel = self._panel
+        if panel is None or panel.get_size() != rect.size:
+            panel = self._panel = pygame.Surface(rect.size, pygame.SRCALPHA)
+        panel.fill((0, 0, 0, 190))
+        graph = pygame.Rect(8, 8, self.WIDTH - 16, self.GRAPH_HEIGHT)
+        pygame.draw.rect(panel, (60, 60, 60), graph, 1)
+        for seconds, color in self.GUIDES:
+            y = graph.bottom - int(graph.height * seconds / self.GRAPH_MAX)
+            pygame.draw.line(panel, color, (graph.left, y), (graph.right - 1, y))
+
+        times = list(profiler.frame_times)[-graph.width:]
+        if len(times) > 1:
+            points = [
+                (graph.right - len(times) + i, graph.bottom - 1 - int(min(t, self.GRAPH_MAX) / self.GRAPH_MAX * (graph.height - 2)))
+                for i, t in enumerate(times)
+            ]
+            pygame.draw.lines(panel, (220, 40, 60), False, points)
+
+        y = graph.bottom + 8
+        frame_ms = times[-1] * 1000 if times else 0.0
+        worst_ms = max(times) * 1000 if times else 0.0
+        fps_text = f"{fps:.0f} FPS" if fps is not None else "-- FPS"
+        lines = [
+            (f"{fps_text}   frame {frame_ms:.2f}ms   worst {worst_ms:.2f}ms", (230, 230, 230)),
+            (f"state: {state or '-'}" + ("   [tracing]" if profiler.tracing else ""), (180, 180, 180))
+        ]
+        for label, seconds in breakdown:
+            calls = profiler.last_calls.get(label, 0)
+            lines.append((f"{label:<22} {seconds * 1000:>7.3f}ms  x{calls}", (220, 120, 120)))
+        for text, color in lines:
+            panel.blit(self._font.render(text, True, color), (8, y))
+            y += self.LINE_HEIGHT
+
+        surface.blit(panel, rect)
+        return rect
+
+# ======================
+# MEMORY PROFILING
+# ======================
+class SurfaceTracker:
+    """Counts live pygame Surfaces and the bytes of pixel data they hold.
+
+    Surface pixels live in SDL's allocator, invisible to tracemalloc, so
+    install() routes the ways this game makes surfaces through tracked
+    types: the Surface constructor, Font.render, image loading and the
+    transform functions. Fonts opened before install() are not tracked,
+    so install before the game loads any.
+    """
+    TRANSFORMS = ("scale", "smoothscale", "rotate", "rotozoom", "flip", "scale2x")
+
+    def __init__(self):
+        self._live = weakref.WeakSet()
+        self.created = 0
+        self._originals = None
+
+    def track(self, surface):
+        if surface is not None and surface not in self._live:
+            self._live.add(surface)
+            self.created += 1
+        return surface
+
+    def stats(self):
+        """(live surface count, total pixel bytes)"""
+        surfaces = list(self._live)
+        return len(surfaces), sum(s.get_width() * s.get_height() * s.get_bytesize() for s in surfaces)
+
+    def install(self):
+        if self._originals is not None:
+            return
+        import pygame.sysfont
+
+        tracker = self
+        base_surface = pygame.Surface
+        base_font = pygame.font.Font
+
+        class TrackedSurface(base_surface):
+            def __init__(self, *args, **kwargs):
+                super().__init__(*args, **kwargs)
+                tracker.track(self)
+
+            def copy(self):
+                return tracker.track(super().copy())
+
+            def convert(self, *args):
+                return tracker.track(super().convert(*args))
+
+            def convert_alpha(self, *args):
+                return tracker.track(super().convert_alpha(*args))
+
+            def subsurface(self, *args):
+                return tracker.track(super().subsurface(*args))
+
+        class TrackedFont(base_font):
+            def render(self, *args, **kwargs):
+                return tracker.track(super().render(*args, **kwargs))
+
+        self._originals = {
+            (pygame, "Surface"): base_surface,
+            (pygame.surface, "Surface"): pygame.surface.Surface,
+            (pygame.font, "Font"): base_font,
+            (pygame.sysfont, "Font"): pygame.sysfont.Font,
+            (pygame.image, "load"): pygame.image.load
+        }
+        pygame.Surface = pygame.surface.Surface = TrackedSurface
+        pygame.font.Font = pygame.sysfont.Font = TrackedFont
+        pygame.image.load = self._tracking(pygame.image.load)
+        for name in self.TRANSFORMS:
+            if hasattr(pygame.transform, name):
+                self._originals[(pygame.transform, name)] = getattr(pygame.transform, name)
+                setattr(pygame.transform, name, self._tracking(getattr(pygame.transform, name)))
+
+    def _tracking(self, func):
+        def tracked(*args, **kwargs):
+            return self.track(func(*args, **kwargs))
+        return tracked
+
+    def uninstall(self):
+        if self._originals is None:
+            return
+        for (owner, name), original in self._originals.items():
+            setattr(owner, name, original)
+        self._originals = None
+
+
+class StateMemory:
+    """Allocation totals for one game state"""
+    def __init__(self):
+        self.frames = 0
+        self.steady_frames = 0
+        self.steady_alloc = 0
+        self.max_alloc = 0
+        self.net_growth = 0
+        self.max_surfaces = 0
+        self.max_surface_bytes = 0
+        self.lines = defaultdict(lambda: [0, 0])
+        self.warned = False
+
+
+class MemoryProfiler:
+    """tracemalloc-based allocation profile, attributed to game state and source line.
+
+    Each frame records the peak Python allocation above the frame's starting
+    point; frames after the first `warmup` of a state visit count as steady
+    state, and one of those allocating more than `threshold_kb` triggers a
+    warning. Snapshots taken on state changes (and every `snapshot_every`
+    frames) attribute retained growth to source lines.
+    """
+    def __init__(self, threshold_kb=64, warmup=30, snapshot_every=600, top=8, tracker=None):
+        self.threshold = threshold_kb * 1024
+        self.warmup = warmup
+        self.snapshot_every = snapshot_every
+        self.top = top
+        self.tracker = tracker or SurfaceTracker()
+        self.states = defaultdict(StateMemory)
+        self._state = None
+        self._state_frames = 0
+        self._since_snapshot = 0
+        self._snapshot = None
+        self._frame_base = 0
+        self._filters = [
+            tracemalloc.Filter(False, tracemalloc.__file__),
+            tracemalloc.Filter(False, __file__),
+            tracemalloc.Filter(False, "*/_weakrefset.py"),
+            tracemalloc.Filter(False, "<frozen importlib._bootstrap*>")
+        ]
+
+    def start(self, frames=4):
+        """Begin tracing and tracking surfaces; call before the game loads assets"""
+        self.tracker.install()
+        if not tracemalloc.is_tracing():
+            tracemalloc.start(frames)
+
+    def stop(self):
+        self._take_snapshot()
+        tracemalloc.stop()
+        self.tracker.uninstall()
+
+    def begin_frame(self):
+        tracemalloc.reset_peak()
+        self._frame_base = tracemalloc.get_traced_memory()[0]
+
+    def end_frame(self, state):
+        current, peak = tracemalloc.get_traced_memory()
+        if state != self._state:
+            self._take_snapshot()
+            self._state = state
+            self._state_frames = 0
+
+        stats = self.states[state]
+        alloc = max(0, peak - self._frame_base)
+        stats.frames += 1
+        stats.max_alloc = max(stats.max_alloc, alloc)
+        self._state_frames += 1
+        if self._state_frames > self.warmup:
+            stats.steady_frames += 1
+            stats.steady_alloc += alloc
+            if alloc > self.threshold and not stats.warned:
+                stats.warned = True
+                print(f"Memory warning: {state} allocated {alloc / 1024:.1f}KB in one "
+                      f"steady-state frame (threshold {self.threshold / 1024:.0f}KB)")
+
+        count, pixel_bytes = self.tracker.stats()
+        stats.max_surfaces = max(stats.max_surfaces, count)
+        stats.max_surface_bytes = max(stats.max_surface_bytes, pixel_bytes)
+
+        self._since_snapshot += 1
+        if self._since_snapshot >= self.snapshot_every:
+            self._take_snapshot()
+
+    def _take_snapshot(self):
+        """Attribute growth since the last snapshot to the state that was running"""
+        if not tracemalloc.is_tracing():
+            return
+        snapshot = tracemalloc.take_snapshot().filter_traces(self._filters)
+        if self._snapshot is not None and self._state is not None:
+            stats = self.states[self._state]
+            for diff in snapshot.compare_to(self._snapshot, "lineno"):
+                if diff.size_diff:
+                    line = stats.lines[diff.traceback[0]]
+                    line[0] += diff.size_diff
+                    line[1] += diff.count_diff
+                    stats.net_growth += diff.size_diff
+        self._snapshot = snapshot
+        self._since_snapshot = 0
+
+    def report(self):
+        """Per-state allocation table followed by the top growing lines"""
+        self._take_snapshot()
+        lines = [f"{'state':<16} {'frames':>7} {'KB/frame':>9} {'max KB':>8} {'net KB':>8} "
+                 f"{'surfaces':>9} {'surface MB':>11}"]
+        for state, stats in self.states.items():
+            mean = stats.steady_alloc / stats.steady_frames if stats.steady_frames else 0
+            flag = "  !" if stats.warned else ""
+            lines.append(
+                f"{str(state):<16} {stats.frames:>7} {mean / 1024:>9.2f} {stats.max_alloc / 1024:>8.1f} "
+                f"{stats.net_growth / 1024:>8.1f} {stats.max_surfaces:>9} "
+                f"{stats.max_surface_bytes / 2**20:>11.2f}{flag}"
+            )
+        for state, stats in self.states.items():
+            growing = sorted(stats.lines.items(), key=lambda item: -item[1][0])[:self.top]
+            growing = [(frame, size, count) for frame, (size, count) in growing if size > 0]
+            if not growing:
+                continue
+            lines.append(f"\n{state}: retained growth by line")
+            for frame, size, count in growing:
+                lines.append(f"  {size / 1024:>8.1f}KB {count:>+7}  {frame.filename}:{frame.lineno}")
+        return "\n".join(lines)
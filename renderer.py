@@ -0,0 +1,106 @@
+import pygame
+
+class DirtyRectRenderer:
+    """Presents only the screen regions a scene reports as changed.
+
+    A scene calls begin_frame() with a key describing its static layers and
+    a function that paints them. The static layers are composited once into
+    a cached background and only repainted when the key changes. Anything
+    dynamic is drawn on top and registered with add_dynamic(); next frame
+    those regions are restored from the background. Frames that never call
+    begin_frame() fall back to a full flip.
+    """
+    def __init__(self, screen, enabled=True, debug=False):
+        self.screen = screen
+        self.screen_rect = screen.get_rect()
+        self.enabled = enabled
+        self.debug = debug
+        self.background = None
+        self.background_key = None
+        self.dirty = []
+        self.full_redraw = True
+        self.redrawn_fraction = 1.0
+        self.redrawn_rects = 0
+        self._dynamic = []
+        self._overlay = []
+        self._framed = False
+        self._debug_font = None
+
+    def begin_frame(self, key, draw_background):
+        """Put the cached static layers on screen, repainting them if key changed"""
+        self._framed = True
+        if self.background is None:
+            self.background = pygame.Surface(self.screen.get_size()).convert()
+        if key != self.background_key:
+            draw_background(self.background)
+            self.background_key = key
+            self.screen.blit(self.background, (0, 0))
+            self.full_redraw = True
+        else:
+            for rect in {tuple(rect): rect for rect in self._dynamic}.values():
+                self.screen.blit(self.background, rect, rect)
+                self.dirty.append(rect)
+            # The debug overlay is cleaned up too, but not counted as dirty
+            for rect in self._overlay:
+                self.screen.blit(self.background, rect, rect)
+        self._dynamic = []
+
+    def add_dynamic(self, rect):
+        """Register a region drawn this frame on top of the background"""
+        rect = pygame.Rect(rect).clip(self.screen_rect)
+        if rect.width and rect.height:
+            self._dynamic.append(rect)
+            self.dirty.append(rect)
+
+    def invalidate(self):
+        """Force the next present() to flip the whole screen"""
+        self.full_redraw = True
+        self.background_key = None
+
+    def present(self):
+        """Push this frame's changes to the display"""
+        if not self._framed:
+            # Scene doesn't use dirty rects; next begin_frame must redraw all
+            self.invalidate()
+
+        full = self.full_redraw or not self.enabled or not self._framed
+        rects = list({tuple(rect): rect for rect in self.dirty}.values())
+        if full:
+            self.redrawn_fraction = 1.0
+            self.redrawn_rects = 1
+        else:
+            area = sum(rect.width * rect.height for rect in rects)
+            self.redrawn_fraction = min(1.0, area / (self.screen_rect.width * self.screen_rect.height))
+            self.redrawn_rects = len(rects)
+
+        # The overlay reports this frame's numbers and is pushed to the
+        # display without counting towards them
+        restored, self._overlay = self._overlay, []
+        if self.debug:
+            self._draw_debug_overlay(rects)
+
+        if full:
+            pygame.display.flip()
+        elif rects or restored or self._overlay:
+            pygame.display.update(rects + restored + self._overlay)
+
+        self.dirty = []
+        self.full_redraw = False
+        self._framed = False
+
+    def _draw_debug_overlay(self, outlined):
+        """Outline redrawn regions and report how much of the screen they cover"""
+        if self._debug_font is None:
+            self._debug_font = pygame.font.Font(None, 24)
+        for rect in outlined:
+            pygame.draw.rect(self.screen, (0, 255, 0), rect, 1)
+
+        label = "FULL" if self.full_redraw else f"{self.redrawn_rects} rects"
+        text = self._debug_font.render(
+            f"redrawn: {self.redrawn_fraction * 100:.1f}% ({label})", True, (0, 255, 0), (0, 0, 0)
+        )
+        self.screen.blit(text, (8, 8))
+
+        # Outlines and label get restored from the background next frame
+        if self._framed:
+            self._overlay = outlined + [text.get_rect(topleft=(8, 8)).clip(self.screen_rect)]
@@ -0,0 +1,417 @@
+"""Versioned binary saves with an append-only journal.
+
+A save holds a list of Characters, the player first. Full snapshots are
+rewritten atomically (temporary file, fsync, rename), and changes in
+between are appended to a journal next to the save, so keeping the save
+current costs one small write per change instead of a full rewrite.
+
+Snapshot layout, little-endian, version 1:
+
+    header   magic, version, flags, generation, character count,
+             string table offset, index offset
+    records  one per character, see _pack_character
+    strings  u32 count, count + 1 u32 offsets, then the UTF-8 bytes
+    index    u64 offset of every record
+
+Names, classes, item names, item types and curses are stored once in the
+string table and referred to by number. The index and offset-addressed
+strings let open_lazy() memory-map a save and decode only the characters
+asked for.
+
+The journal (<path>.journal) starts with the generation of the snapshot
+it belongs to, so a journal left behind by an older snapshot is ignored.
+Each entry is a character record framed by its length and CRC32; a torn
+entry from a crash mid-append ends the journal.
+"""
+import mmap
+import os
+import struct
+import zlib
+from contextlib import contextmanager
+
+from character_model import Character, Inventory
+from utils import user_data_dir
+
+MAGIC = b"GRNS"
+JOURNAL_MAGIC = b"GRNJ"
+VERSION = 1
+
+_HEADER = struct.Struct("<4sHHQIQQ")
+_JOURNAL_HEADER = struct.Struct("<4sHQ")
+_FRAME = struct.Struct("<II")
+# name, class, 6 rolls, 6 drains, hp, max_hp_bonus, gold, crimson tears,
+# garnet shards, item count, curse count
+_RECORD = struct.Struct("<II6h6hiiiHHHH")
+# name, count, type, equipped
+_ITEM = struct.Struct("<IIIB")
+_U32 = struct.Struct("<I")
+_U64 = struct.Struct("<Q")
+# What decoding damaged data can raise, besides SaveError itself: bad
+# string ids, undecodable text, unknown classes and item kinds
+_DECODE_ERRORS = (struct.error, UnicodeDecodeError, IndexError, KeyError, ValueError, TypeError, OverflowError)
+
+
+class SaveError(ValueError):
+    """A save file is missing, corrupt or from an unknown version"""
+
+
+def _need(buffer, offset, size):
+    """Raise SaveError unless size bytes at offset lie inside buffer"""
+    if offset < 0 or size < 0 or offset + size > len(buffer):
+        raise SaveError(f"data cut off: needs bytes {offset}-{offset + size}, has {len(buffer)}")
+
+
+@contextmanager
+def _decoding(path):
+    """Report anything damaged data makes the decoders raise as SaveError"""
+    try:
+        yield
+    except _DECODE_ERRORS as error:
+        raise SaveError(f"{path} is corrupt: {error}") from error
+
+
+def default_save_path(filename="shadowborn.sav"):
+    return os.path.join(user_data_dir(), filename)
+
+
+# ======================
+# RECORDS
+# ======================
+class _Strings:
+    """Interning table: each distinct string is stored once"""
+    def __init__(self):
+        self.ids = {}
+        self.values = []
+
+    def __call__(self, text):
+        index = self.ids.get(text)
+        if index is None:
+            index = self.ids[text] = len(self.values)
+            self.values.append(text)
+        return index
+
+    def pack(self):
+        encoded = [text.encode() for text in self.values]
+        offsets = [0]
+        for data in encoded:
+            offsets.append(offsets[-1] + len(data))
+        return (_U32.pack(len(encoded))
+                + struct.pack(f"<{len(offsets)}I", *offsets)
+                + b"".join(encoded))
+
+
+def _unpack_strings(buffer, offset):
+    """(list of strings, offset after the table) for a packed string table"""
+    offsets, start = _unpack_string_offsets(buffer, offset)
+    count = len(offsets) - 1
+    blob = bytes(buffer[start:start + offsets[-1]])
+    return [blob[offsets[i]:offsets[i + 1]].decode() for i in range(count)], start + offsets[-1]
+
+
+def _unpack_string_offsets(buffer, offset):
+    """(count + 1 string offsets, offset of the text) after checking both fit"""
+    _need(buffer, offset, 4)
+    count, = _U32.unpack_from(buffer, offset)
+    _need(buffer, offset + 4, 4 * (count + 1))
+    offsets = struct.unpack_from(f"<{count + 1}I", buffer, offset + 4)
+    start = offset + 4 + 4 * (count + 1)
+    if any(offsets[i] > offsets[i + 1] for i in range(count)):
+        raise SaveError("string table offsets out of order")
+    _need(buffer, start, offsets[-1])
+    return offsets, start
+
+
+def _pack_character(character, intern):
+    inventory = character.inventory
+    entries = inventory.entries()
+    parts = [_RECORD.pack(
+        intern(character.name), intern(character.class_name),
+        *character.rolls, *character.drains,
+        character.hp, character.max_hp_bonus, inventory.gold,
+        character.crimson_tears, character.garnet_shards,
+        len(entries), len(character.curses)
+    )]
+    for item, count, kind, equipped in entries:
+        parts.append(_ITEM.pack(intern(item), count, intern(kind), equipped))
+    if character.curses:
+        parts.append(struct.pack(f"<{len(character.curses)}I", *map(intern, character.curses)))
+    return b"".join(parts)
+
+
+def _unpack_character(buffer, offset, string):
+    """(Character, offset after the record); string maps ids to text"""
+    _need(buffer, offset, _RECORD.size)
+    fields = _RECORD.unpack_from(buffer, offset)
+    offset += _RECORD.size
+    n_items, n_curses = fields[19], fields[20]
+    _need(buffer, offset, _ITEM.size * n_items + 4 * n_curses)
+    entries = []
+    for _ in range(n_items):
+        item, count, kind, equipped = _ITEM.unpack_from(buffer, offset)
+        entries.append((string(item), count, string(kind), equipped))
+        offset += _ITEM.size
+    curses = ()
+    if n_curses:
+        curses = tuple(map(string, struct.unpack_from(f"<{n_curses}I", buffer, offset)))
+        offset += 4 * n_curses
+    character = Character(
+        string(fields[0]), string(fields[1]), fields[2:8],
+        Inventory.from_entries(fields[16], entries),
+        hp=fields[14],
+        drains=fields[8:14],
+        curses=curses,
+        crimson_tears=fields[17],
+        garnet_shards=fields[18],
+        max_hp_bonus=fields[15]
+    )
+    return character, offset
+
+
+def _read_header(buffer, path):
+    if len(buffer) < _HEADER.size:
+        raise SaveError(f"{path} is too short to be a save")
+    magic, version, _, generation, count, strings_at, index_at = _HEADER.unpack_from(buffer)
+    if magic != MAGIC:
+        raise SaveError(f"{path} is not a save file")
+    if version != VERSION:
+        raise SaveError(f"{path} is save version {version}, expected {VERSION}")
+    return generation, count, strings_at, index_at
+
+# ======================
+# FILES
+# ======================
+def _write_atomic(path, data, sync=True):
+    """Replace path with data so a crash leaves either the old or new file"""
+    temp = f"{path}.tmp"
+    with open(temp, "wb") as f:
+        f.write(data)
+        if sync:
+            f.flush()
+            os.fsync(f.fileno())
+    os.replace(temp, path)
+    if sync and hasattr(os, "O_DIRECTORY"):
+        # Make the rename itself durable
+        directory = os.open(os.path.dirname(os.path.abspath(path)), os.O_RDONLY | os.O_DIRECTORY)
+        try:
+            os.fsync(directory)
+        finally:
+            os.close(directory)
+
+
+class SaveFile:
+    """A snapshot on disk plus its journal of later changes"""
+    def __init__(self, path):
+        self.path = path
+        self.journal_path = f"{path}.journal"
+        self._header = None
+        # Offset up to which the journal is known to be intact, and the
+        # number of slots once journaled additions are counted
+        self._journal_end = None
+        self._length = None
+
+    def exists(self):
+        return os.path.exists(self.path)
+
+    def save(self, characters, sync=True):
+        """Write a full snapshot and start a fresh journal"""
+        intern = _Strings()
+        records = [_pack_character(character, intern) for character in characters]
+        generation = int.from_bytes(os.urandom(8), "little")
+
+        offsets, position = [], _HEADER.size
+        for record in records:
+            offsets.append(position)
+            position += len(record)
+        strings = intern.pack()
+        strings_at, index_at = position, position + len(strings)
+        header = _HEADER.pack(MAGIC, VERSION, 0, generation, len(records), strings_at, index_at)
+        index = struct.pack(f"<{len(offsets)}Q", *offsets)
+        os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        _write_atomic(self.path, b"".join([header, *records, strings, index]), sync)
+
+        self._header = (generation, len(records))
+        self._journal_end = None
+        self._length = None
+        if os.path.exists(self.journal_path):
+            os.remove(self.journal_path)
+        return generation
+
+    def record(self, index, character, sync=True):
+        """Append character as the new state of slot index.
+
+        index may equal the current number of characters to add one.
+        """
+        generation, count = self._snapshot_header()
+        if self._journal_end is None:
+            changes, self._journal_end = self._scan_journal(generation)
+            self._length = max([count] + [slot + 1 for slot in changes])
+        if not 0 <= index <= self._length:
+            raise IndexError(f"slot {index} is past the end of a {self._length}-character save")
+        intern = _Strings()
+        record = _pack_character(character, intern)
+        payload = _U32.pack(index) + intern.pack() + record
+        entry = _FRAME.pack(len(payload), zlib.crc32(payload)) + payload
+
+        with open(self.journal_path, "r+b" if self._journal_end else "wb") as f:
+            if not self._journal_end:
+                f.write(_JOURNAL_HEADER.pack(JOURNAL_MAGIC, VERSION, generation))
+                self._journal_end = _JOURNAL_HEADER.size
+            # Drops any torn entry left by a crash
+            f.seek(self._journal_end)
+            f.truncate()
+            f.write(entry)
+            if sync:
+                f.flush()
+                os.fsync(f.fileno())
+        self._journal_end += len(entry)
+        self._length = max(self._length, index + 1)
+
+    def compact(self, sync=True):
+        """Fold the journal into a new snapshot"""
+        return self.save(self.load(), sync)
+
+    # ======================
+    # LOADING
+    # ======================
+    def load(self):
+        """Every character, with journaled changes applied"""
+        try:
+            with open(self.path, "rb") as f:
+                data = f.read()
+        except FileNotFoundError:
+            raise SaveError(f"no save at {self.path}") from None
+        generation, count, strings_at, _ = _read_header(data, self.path)
+        self._header = (generation, count)
+        characters, offset = [], _HEADER.size
+        with _decoding(self.path):
+            string = _unpack_strings(data, strings_at)[0].__getitem__
+            for _ in range(count):
+                character, offset = _unpack_character(data, offset, string)
+                characters.append(character)
+        for index, character in sorted(self.journal().items()):
+            if index < len(characters):
+                characters[index] = character
+            else:
+                characters.append(character)
+        return characters
+
+    def open_lazy(self):
+        """Memory-mapped view that decodes characters on first access"""
+        return LazySave(self)
+
+    def journal(self):
+        """{slot: latest journaled Character} for the current snapshot"""
+        return self._scan_journal(self._snapshot_header()[0])[0]
+
+    def _snapshot_header(self):
+        """(generation, character count) of the snapshot on disk"""
+        if self._header is None:
+            try:
+                with open(self.path, "rb") as f:
+                    header = f.read(_HEADER.size)
+            except FileNotFoundError:
+                raise SaveError(f"no save at {self.path}") from None
+            self._header = _read_header(header, self.path)[:2]
+        return self._header
+
+    def _scan_journal(self, generation):
+        """({slot: Character}, offset after the last intact entry)"""
+        try:
+            with open(self.journal_path, "rb") as f:
+                data = f.read()
+        except FileNotFoundError:
+            return {}, 0
+        if len(data) < _JOURNAL_HEADER.size:
+            return {}, 0
+        magic, version, journal_generation = _JOURNAL_HEADER.unpack_from(data)
+        if magic != JOURNAL_MAGIC or version != VERSION or journal_generation != generation:
+            # Left over from another snapshot; the next record starts afresh
+            return {}, 0
+
+        changes, offset = {}, _JOURNAL_HEADER.size
+        while offset + _FRAME.size <= len(data):
+            length, crc = _FRAME.unpack_from(data, offset)
+            start = offset + _FRAME.size
+            payload = data[start:start + length]
+            if len(payload) < length or zlib.crc32(payload) != crc:
+                break
+            with _decoding(self.journal_path):
+                _need(payload, 0, 4)
+                index, = _U32.unpack_from(payload)
+                strings, record_at = _unpack_strings(payload, 4)
+                changes[index] = _unpack_character(payload, record_at, strings.__getitem__)[0]
+            offset = start + length
+        return changes, offset
+
+
+class LazySave:
+    """Read-only, memory-mapped access to one save.
+
+    Only the header, the journal and whatever is asked for get decoded,
+    so opening a save of any size is fast. Use as a context manager or
+    call close() to unmap it.
+    """
+    def __init__(self, save_file):
+        self._file = open(save_file.path, "rb")
+        if os.fstat(self._file.fileno()).st_size < _HEADER.size:
+            self._file.close()
+            raise SaveError(f"{save_file.path} is too short to be a save")
+        self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        self._path = save_file.path
+        try:
+            generation, self._count, strings_at, self._index_at = _read_header(self._map, self._path)
+            save_file._header = (generation, self._count)
+            with _decoding(self._path):
+                self._string_offsets, self._blob_at = _unpack_string_offsets(self._map, strings_at)
+                _need(self._map, self._index_at, 8 * self._count)
+            self._changes = save_file.journal()
+        except SaveError:
+            self.close()
+            raise
+        self._strings = [None] * (len(self._string_offsets) - 1)
+        self._cache = {}
+        self._len = max([self._count] + [index + 1 for index in self._changes])
+
+    def __len__(self):
+        return self._len
+
+    def _string(self, i):
+        text = self._strings[i]
+        if text is None:
+            start = self._blob_at + self._string_offsets[i]
+            text = self._strings[i] = self._map[start:self._blob_at + self._string_offsets[i + 1]].decode()
+        return text
+
+    def _offset(self, index):
+        return _U64.unpack_from(self._map, self._index_at + 8 * index)[0]
+
+    def __getitem__(self, index):
+        if index < 0:
+            index += self._len
+        if not 0 <= index < self._len:
+            raise IndexError(index)
+        character = self._changes.get(index) or self._cache.get(index)
+        if character is None:
+            with _decoding(self._path):
+                character = _unpack_character(self._map, self._offset(index), self._string)[0]
+            self._cache[index] = character
+        return character
+
+    def name(self, index):
+        """Character name without decoding the rest of the record"""
+        if index in self._changes:
+            return self._changes[index].name
+        with _decoding(self._path):
+            offset = self._offset(index)
+            _need(self._map, offset, 4)
+            return self._string(_U32.unpack_from(self._map, offset)[0])
+
+    def close(self):
+        self._map.close()
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
@@ -0,0 +1,83 @@
+class Scene:
+    """One screen of the game, driven by the single loop in DarkRPG.run"""
+    name = "scene"
+    # Opaque scenes hide everything beneath them on the stack
+    opaque = True
+
+    def __init__(self):
+        self.stack = None
+
+    def enter(self):
+        """Called when the scene becomes part of the stack"""
+
+    def exit(self):
+        """Called when the scene leaves the stack"""
+
+    def handle_event(self, event):
+        """React to a single pygame event"""
+
+    def update(self, dt):
+        """Advance scene logic by one fixed step of dt seconds"""
+
+    def render(self, surface, alpha=1.0):
+        """Draw the scene onto surface.
+
+        alpha is how far (0-1) real time has run past the last update, for
+        scenes that interpolate motion between fixed steps.
+        """
+
+
+class SceneStack:
+    """Stack of scenes; the top one gets input and updates, visible ones render"""
+    def __init__(self):
+        self.scenes = []
+
+    def __bool__(self):
+        return bool(self.scenes)
+
+    def __len__(self):
+        return len(self.scenes)
+
+    @property
+    def top(self):
+        return self.scenes[-1] if self.scenes else None
+
+    def push(self, scene):
+        scene.stack = self
+        self.scenes.append(scene)
+        scene.enter()
+        return scene
+
+    def pop(self):
+        scene = self.scenes.pop()
+        scene.exit()
+        scene.stack = None
+        return scene
+
+    def replace(self, scene):
+        """Swap the top scene for another one"""
+        if self.scenes:
+            self.pop()
+        return self.push(scene)
+
+    def clear(self):
+        while self.scenes:
+            self.pop()
+
+    def handle_event(self, event):
+        if self.scenes:
+            self.scenes[-1].handle_event(event)
+
+    def update(self, dt):
+        if self.scenes:
+            self.scenes[-1].update(dt)
+
+    def render(self, surface, alpha=1.0):
+        """Render from the topmost opaque scene upwards"""
+        start = 0
+        for i in range(len(self.scenes) - 1, -1, -1):
+            if self.scenes[i].opaque:
+                start = i
+                break
+        for scene in self.scenes[start:]:
+            scene.render(surface, alpha)
@@ -0,0 +1,85 @@
+"""Damaged saves must fail with SaveError, never crash the loader"""
+import os
+import random
+
+import pytest
+
+from character_factory import CharacterFactory
+from character_model import Character
+from savegame import SaveError, SaveFile
+
+
+def roster(n=3):
+    generated = CharacterFactory(seed=3).generate(n)
+    characters = [Character.from_dict(generated.character(i)) for i in range(n)]
+    characters[1].add_curse("Bleeds at dawn")
+    characters[2].inventory.add("Garnet Shard")
+    return characters
+
+
+@pytest.fixture
+def saved(tmp_path):
+    save = SaveFile(str(tmp_path / "test.sav"))
+    save.save(roster(), sync=False)
+    with open(save.path, "rb") as f:
+        return save, f.read()
+
+
+def read_all(path):
+    """Decode a save both ways, touching every character"""
+    save = SaveFile(path)
+    save.load()
+    with save.open_lazy() as lazy:
+        for i in range(len(lazy)):
+            lazy.name(i)
+            lazy[i]
+
+
+def test_round_trip(saved):
+    save, _ = saved
+    assert [c.to_dict() for c in save.load()] == [c.to_dict() for c in roster()]
+    read_all(save.path)
+
+
+@pytest.mark.parametrize("fraction", [0.0, 0.1, 0.2, 0.3, 0.5, 0.7, 0.9, 0.99])
+def test_truncated(saved, fraction):
+    save, data = saved
+    with open(save.path, "wb") as f:
+        f.write(data[:int(len(data) * fraction)])
+    with pytest.raises(SaveError):
+        read_all(save.path)
+
+
+def test_every_truncation_length(saved):
+    save, data = saved
+    for length in range(len(data)):
+        with open(save.path, "wb") as f:
+            f.write(data[:length])
+        with pytest.raises(SaveError):
+            read_all(save.path)
+
+
+def test_corrupt_bytes(saved):
+    save, data = saved
+    rng = random.Random(5)
+    for _ in range(500):
+        damaged = bytearray(data)
+        for _ in range(rng.randint(1, 4)):
+            damaged[rng.randrange(len(damaged))] = rng.randrange(256)
+        with open(save.path, "wb") as f:
+            f.write(damaged)
+        try:
+            read_all(save.path)
+        except SaveError:
+            pass
+
+
+def test_truncated_journal_entry_is_dropped(saved):
+    save, _ = saved
+    characters = save.load()
+    characters[0].hp -= 5
+    save.record(0, characters[0], sync=False)
+    size = os.path.getsize(save.journal_path)
+    with open(save.journal_path, "r+b") as f:
+        f.truncate(size - 3)
+    assert save.load()[0].hp == characters[0].hp + 5
@@ -0,0 +1,40 @@
+class FixedTimestep:
+    """Turns variable frame times into a whole number of fixed simulation steps.
+
+    Leftover time stays in the accumulator and is exposed as `alpha`, the
+    fraction of a step to interpolate by when rendering. If rendering stalls,
+    at most `max_catch_up` steps run in one frame and the rest of the backlog
+    is dropped, so one slow frame can't snowball into a spiral of catch-up.
+    """
+    def __init__(self, step=1/60, max_catch_up=5):
+        self.step = step
+        self.max_catch_up = max_catch_up
+        self.accumulator = 0.0
+        self.ticks = 0
+        self.dropped_time = 0.0
+
+    @property
+    def alpha(self):
+        """Fraction of a step the render is ahead of the simulation"""
+        return self.accumulator / self.step
+
+    def advance(self, frame_dt):
+        """Add a frame's worth of time and return how many steps to run"""
+        self.accumulator += frame_dt
+        steps = int(self.accumulator / self.step)
+        if steps > self.max_catch_up:
+            self.dropped_time += (steps - self.max_catch_up) * self.step
+            steps = self.max_catch_up
+            self.accumulator = 0.0
+        else:
+            self.accumulator -= steps * self.step
+        self.ticks += steps
+        return steps
+
+    def simulate(self, update, duration):
+        """Run update(step) for `duration` simulated seconds as fast as possible"""
+        steps = int(round(duration / self.step))
+        for _ in range(steps):
+            update(self.step)
+            self.ticks += 1
+        return steps
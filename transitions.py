@@ -0,0 +1,152 @@
+import math
+import pygame
+
+# ======================
+# EASING CURVES
+# ======================
+EASINGS = {
+    "linear": lambda t: t,
+    "ease_in": lambda t: t * t,
+    "ease_out": lambda t: 1 - (1 - t) * (1 - t),
+    "ease_in_out": lambda t: t * t * (3 - 2 * t),
+    "sine": lambda t: 0.5 - 0.5 * math.cos(math.pi * t)
+}
+
+# ======================
+# TWEENS
+# ======================
+class Tween:
+    """Value that runs from 0 to 1 over a duration, advanced by the main loop"""
+    def __init__(self, duration, on_update=None, on_complete=None, easing="linear", delay=0.0):
+        self.duration = max(duration, 1e-6)
+        self.on_update = on_update
+        self.on_complete = on_complete
+        self.ease = EASINGS[easing] if isinstance(easing, str) else easing
+        self.delay = delay
+        self.elapsed = 0.0
+        self.done = False
+
+    @property
+    def progress(self):
+        """Linear progress in [0, 1]"""
+        return min(max(self.elapsed / self.duration, 0.0), 1.0)
+
+    @property
+    def value(self):
+        """Eased progress in [0, 1]"""
+        return self.ease(self.progress)
+
+    def update(self, dt):
+        if self.done:
+            return
+        if self.delay > 0:
+            self.delay -= dt
+            if self.delay > 0:
+                return
+            dt = -self.delay
+            self.delay = 0
+        self.elapsed += dt
+        self.step()
+        if self.on_update:
+            self.on_update(self.value)
+        if self.elapsed >= self.duration:
+            self.done = True
+            if self.on_complete:
+                self.on_complete()
+
+    def step(self):
+        """Hook for subclasses, called after elapsed advances"""
+
+    def draw(self, surface):
+        """Hook for tweens that paint over the frame"""
+
+
+class FadeThrough(Tween):
+    """Fade a frozen snapshot of the old scene into a colour, then out over the new one.
+
+    on_midpoint fires once the screen is fully covered, which is where the
+    caller should switch state.
+    """
+    def __init__(self, snapshot, color, duration, on_midpoint=None, easing="ease_in_out", **kwargs):
+        super().__init__(duration, easing=easing, **kwargs)
+        self.snapshot = snapshot
+        self.overlay = pygame.Surface(snapshot.get_size())
+        self.overlay.fill(color)
+        self.on_midpoint = on_midpoint
+        self.switched = False
+
+    def step(self):
+        if not self.switched and self.progress >= 0.5:
+            self.switched = True
+            if self.on_midpoint:
+                self.on_midpoint()
+
+    def draw(self, surface):
+        t = self.progress
+        if not self.switched:
+            surface.blit(self.snapshot, (0, 0))
+            alpha = self.ease(t / 0.5)
+        else:
+            alpha = 1 - self.ease((t - 0.5) / 0.5)
+        self.overlay.set_alpha(int(255 * alpha))
+        surface.blit(self.overlay, (0, 0))
+
+
+class CrossFade(Tween):
+    """Blend between two cached scene snapshots, switching state halfway"""
+    def __init__(self, from_snapshot, to_snapshot, duration, on_midpoint=None, easing="ease_in_out", **kwargs):
+        super().__init__(duration, easing=easing, **kwargs)
+        self.from_snapshot = from_snapshot.copy()
+        self.to_snapshot = to_snapshot
+        self.on_midpoint = on_midpoint
+        self.switched = False
+
+    def step(self):
+        if not self.switched and self.progress >= 0.5:
+            self.switched = True
+            if self.on_midpoint:
+                self.on_midpoint()
+
+    def draw(self, surface):
+        surface.blit(self.to_snapshot, (0, 0))
+        self.from_snapshot.set_alpha(int(255 * (1 - self.value)))
+        surface.blit(self.from_snapshot, (0, 0))
+
+# ======================
+# SCHEDULER
+# ======================
+class TransitionScheduler:
+    """Runs any number of concurrent tweens inside the main loop's frame"""
+    def __init__(self):
+        self.tweens = []
+
+    @property
+    def active(self):
+        return bool(self.tweens)
+
+    def add(self, tween):
+        self.tweens.append(tween)
+        return tween
+
+    def fade_through(self, surface, color, duration, on_midpoint=None, easing="ease_in_out"):
+        """Snapshot surface and fade it through color, calling on_midpoint when covered"""
+        return self.add(FadeThrough(surface.copy(), color, duration, on_midpoint, easing))
+
+    def crossfade(self, from_snapshot, to_snapshot, duration, on_midpoint=None, easing="ease_in_out"):
+        return self.add(CrossFade(from_snapshot, to_snapshot, duration, on_midpoint, easing))
+
+    def update(self, dt):
+        for tween in list(self.tweens):
+            tween.update(dt)
+        self.tweens = [tween for tween in self.tweens if not tween.done]
+
+    def draw(self, surface):
+        for tween in self.tweens:
+            tween.draw(surface)
+
+    def cancel(self, tween):
+        if tween in self.tweens:
+            self.tweens.remove(tween)
+
+    def clear(self):
+        self.tweens.clear()
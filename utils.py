@@ -1,64 +1,120 @@
 import pygame
+import os
 import random
 import math
-from tkinter import font as tkfont
-from PIL import Image, ImageTk
+import sys
+import time
+from collections import OrderedDict
+from particles import BloodParticles, splatter_pool
+from assets import ASSETS
+from music import MUSIC
 
 # ======================
 # VISUAL EFFECTS
 # ======================
-def blood_drip_effect(surface, intensity=30):
-    """Create dripping blood effect on screen edges"""
-    for _ in range(intensity):
-        x = random.randint(0, surface.get_width())
-        y = random.randint(0, 50)
-        length = random.randint(20, 100)
-        width = random.randint(1, 3)
-        for i in range(length):
-            pygame.draw.line(
-                surface, 
-                (150 - i//2, 0, 0), 
-                (x, y + i), 
-                (x + random.randint(-2, 2), y + i + 1), 
-                width
-            )
+_DRIP_SYSTEMS = {}
+
+def blood_drip_effect(surface, intensity=30, dt=None):
+    """Create dripping blood effect on screen edges
+
+    Drips persist between calls in a shared particle system per surface
+    size; pass dt to advance it, otherwise wall-clock time is used.
+    """
+    system = _DRIP_SYSTEMS.get(surface.get_size())
+    if system is None:
+        system = _DRIP_SYSTEMS[surface.get_size()] = BloodParticles(surface.get_size())
+        system.last_tick = pygame.time.get_ticks()
+    if dt is None:
+        now = pygame.time.get_ticks()
+        dt = min((now - system.last_tick) / 1000.0, 0.1)
+        system.last_tick = now
+    system.maintain_drips(intensity)
+    system.update(dt)
+    system.render(surface)
 
 def blood_splatter(damage_ratio):
-    """Generate blood splatter proportional to damage"""
-    surf = pygame.Surface((800, 600), pygame.SRCALPHA)
-    drops = int(50 * damage_ratio)
-    for _ in range(drops):
-        pos = (random.randint(0, 800), random.randint(0, 600))
-        radius = random.randint(1, int(10 * damage_ratio))
-        alpha = random.randint(100, 200)
-        pygame.draw.circle(
-            surf, 
-            (180 + random.randint(-20, 20), 0, 0, alpha), 
-            pos, 
-            radius
-        )
-    return surf
-
-def fade_in(surface, color, duration):
-    """Blood-red fade in effect"""
-    fade_surf = pygame.Surface(surface.get_size())
-    fade_surf.fill(color)
-    for alpha in range(0, 255, 5):
-        fade_surf.set_alpha(alpha)
-        surface.blit(fade_surf, (0, 0))
-        pygame.display.flip()
-        pygame.time.delay(duration * 1000 // 255)
+    """Blood splatter stamp proportional to damage
+
+    Returns a shared, pre-generated stamp from the splatter pool; composite
+    it somewhere (see particles.GoreLayer) rather than drawing onto it.
+    """
+    return splatter_pool().pick(damage_ratio)
+
+# ======================
+# TEXT CACHE
+# ======================
+class TextSurfaceCache:
+    """LRU cache of rendered text surfaces, bounded by pixel memory"""
+    def __init__(self, max_bytes=16 * 1024 * 1024):
+        self.max_bytes = max_bytes
+        self.bytes_used = 0
+        self.hits = 0
+        self.misses = 0
+        self._surfaces = OrderedDict()
+
+    def render(self, font, text, color, antialias=True):
+        """Return a cached surface for the text, rendering it on a miss.
+
+        The returned surface is shared between callers and must not be
+        modified; copy it first if you need to change its alpha.
+        """
+        key = (font, text, tuple(color), antialias)
+        surf = self._surfaces.get(key)
+        if surf is not None:
+            self._surfaces.move_to_end(key)
+            self.hits += 1
+            return surf
+
+        self.misses += 1
+        surf = font.render(text, antialias, color)
+        size = surf.get_width() * surf.get_height() * surf.get_bytesize()
+        if size > self.max_bytes:
+            # Too big to ever fit, hand it back uncached
+            return surf
+
+        self._surfaces[key] = surf
+        self.bytes_used += size
+        while self.bytes_used > self.max_bytes:
+            _, old = self._surfaces.popitem(last=False)
+            self.bytes_used -= old.get_width() * old.get_height() * old.get_bytesize()
+        return surf
+
+    def clear(self):
+        """Drop every cached surface and reset the counters"""
+        self._surfaces.clear()
+        self.bytes_used = 0
+        self.hits = 0
+        self.misses = 0
+
+    def stats(self):
+        """Snapshot of cache usage for debugging overlays"""
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._surfaces),
+            "bytes": self.bytes_used,
+            "max_bytes": self.max_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0
+        }
+
+TEXT_CACHE = TextSurfaceCache()
+
+def render_text(font, text, color, antialias=True):
+    """Render text through the shared surface cache"""
+    return TEXT_CACHE.render(font, text, color, antialias)
 
 # ======================
 # TEXT & UI RENDERING
 # ====================== 
 def draw_blood_text(surface, text, pos, font, pulse=False):
     """Render text with dripping blood effect"""
-    text_surf = font.render(text, True, (180, 4, 45))
-    shadow = font.render(text, True, (80, 0, 0))
+    text_surf = render_text(font, text, (180, 4, 45))
+    shadow = render_text(font, text, (80, 0, 0))
     
     if pulse:
         alpha = 150 + int(100 * math.sin(pygame.time.get_ticks() / 300))
+        text_surf = text_surf.copy()
         text_surf.set_alpha(alpha)
     
     # Blood drip under text
@@ -102,8 +158,8 @@ def garnet_button(surface, rect, text):
     )
     
     # Text
-    font = pygame.font.Font("assets/fonts/necromancer.ttf", 20)
-    text_surf = font.render(text, True, (255, 220, 220))
+    font = FONTS.get("assets/fonts/necromancer.ttf", 20)
+    text_surf = render_text(font, text, (255, 220, 220))
     surface.blit(text_surf, (
         rect.centerx - text_surf.get_width()//2,
         rect.centery - text_surf.get_height()//2
@@ -113,7 +169,7 @@ def garnet_button(surface, rect, text):
 def draw_tooltip(surface, text, position, font, bg_color=(20, 0, 10), text_color=(200, 200, 200)):
     """Draw a tooltip box with text"""
     lines = text.split('\n')
-    line_surfaces = [font.render(line, True, text_color) for line in lines]
+    line_surfaces = [render_text(font, line, text_color) for line in lines]
     
     # Calculate total size
     max_width = max(surf.get_width() for surf in line_surfaces)
@@ -129,110 +185,291 @@ def draw_tooltip(surface, text, position, font, bg_color=(20, 0, 10), text_color
     for line_surf in line_surfaces:
         surface.blit(line_surf, (rect.x + 10, rect.y + y_offset))
         y_offset += line_surf.get_height() + 5
+    return rect
+
+class TextLayout:
+    """Word-wrapping engine with per-font word widths and memoized layouts"""
+    def __init__(self, max_layouts=512, max_words=4096):
+        self.max_layouts = max_layouts
+        self.max_words = max_words
+        self._layouts = OrderedDict()
+        self._widths = {}
+
+    def measure(self, font, word):
+        """Width of a word or line, measured once per font"""
+        widths = self._widths.get(font)
+        if widths is None:
+            widths = self._widths[font] = {" ": font.size(" ")[0]}
+        width = widths.get(word)
+        if width is None:
+            if len(widths) >= self.max_words:
+                widths.clear()
+                widths[" "] = font.size(" ")[0]
+            width = widths[word] = font.size(word)[0]
+        return width
+
+    def wrap(self, text, font, max_width):
+        """Return the wrapped lines for text, reusing a previous layout if possible"""
+        key = (font, text, max_width)
+        lines = self._layouts.get(key)
+        if lines is not None:
+            self._layouts.move_to_end(key)
+            return lines
+
+        lines = tuple(self._wrap(text, font, max_width))
+        self._layouts[key] = lines
+        if len(self._layouts) > self.max_layouts:
+            self._layouts.popitem(last=False)
+        return lines
+
+    def _wrap(self, text, font, max_width):
+        # Candidate lines are measured whole, as kerning makes them narrower
+        # or wider than the sum of their words
+        lines = []
+        line = ""
+
+        for word in text.split(' '):
+            if not line and not word:
+                # Repeated spaces at a break would indent the next line
+                continue
+            if line:
+                candidate = f"{line} {word}"
+                if self.measure(font, candidate) <= max_width:
+                    line = candidate
+                    continue
+                lines.append(line)
+            if self.measure(font, word) > max_width:
+                # Hard-break words that can never fit on a line of their own
+                pieces = self._split_word(word, font, max_width)
+                lines.extend(pieces[:-1])
+                word = pieces[-1]
+            line = word
+
+        if line or not lines:
+            lines.append(line)
+        return lines
+
+    def _split_word(self, word, font, max_width):
+        pieces = []
+        start = 0
+        for i in range(1, len(word)):
+            if self.measure(font, word[start:i + 1]) > max_width:
+                pieces.append(word[start:i])
+                start = i
+        pieces.append(word[start:])
+        return pieces
+
+    def clear(self):
+        """Forget every measured word and finished layout"""
+        self._layouts.clear()
+        self._widths.clear()
+
+TEXT_LAYOUT = TextLayout()
 
 def wrap_text(text, font, max_width):
     """Wrap text to fit within specified width"""
-    words = text.split(' ')
-    lines = []
-    current_line = []
-    
-    for word in words:
-        test_line = ' '.join(current_line + [word])
-        test_width = font.size(test_line)[0]
-        
-        if test_width <= max_width:
-            current_line.append(word)
-        else:
-            lines.append(' '.join(current_line))
-            current_line = [word]
-    
-    if current_line:
-        lines.append(' '.join(current_line))
-    
-    return lines
+    return TEXT_LAYOUT.wrap(text, font, max_width)
 
 # ======================
 # AUDIO SYSTEM
 # ======================
 def load_sound(filename):
-    """Robust sound loading that works with MP3/WAV"""
-    class DummySound:
-        def play(self): pass
-        def set_volume(self, vol): pass
-
-    try:
-        # Initialize mixer if needed
-        if pygame.mixer.get_init() is None:
-            pygame.mixer.init(frequency=44100, size=-16, channels=2, buffer=512)
-        
-        # Special handling for MP3
-        if filename.endswith('.mp3'):
-            try:
-                return pygame.mixer.Sound(f"assets/sounds/{filename}")
-            except:
-                with open(f"assets/sounds/{filename}", 'rb') as f:
-                    return pygame.mixer.Sound(buffer=f.read())
-        else:
-            return pygame.mixer.Sound(f"assets/sounds/{filename}")
-    except Exception as e:
-        print(f"Sound load failed: {e}")
-        return DummySound()
+    """Robust sound loading that works with MP3/WAV
+
+    Goes through the shared asset manager, so each file is decoded once and
+    missing files are only reported the first time.
+    """
+    return ASSETS.sound(filename)
 
 def play_music(filename, volume=0.5, loops=-1):
-    """Play background music with error handling"""
-    try:
-        pygame.mixer.music.load(f"assets/sounds/{filename}")
-        pygame.mixer.music.set_volume(volume)
-        pygame.mixer.music.play(loops)
-    except Exception as e:
-        print(f"Music error: {e}")
+    """Crossfade to background music without blocking the frame"""
+    MUSIC.play(filename, volume, loops)
 
 def stop_music():
-    """Stop any playing music"""
-    pygame.mixer.music.stop()
+    """Fade out any playing music"""
+    MUSIC.stop()
 
 # ======================
 # FONT SYSTEM
 # ======================
+class FontRegistry:
+    """Process-wide cache of font faces keyed by (path, size)"""
+    def __init__(self):
+        self._faces = {}
+        self._resolved = {}
+        self.load_times = {}
+
+    def get(self, path, size):
+        """Return the face for a font file, parsing it only on first use"""
+        key = (path, size)
+        font = self._faces.get(key)
+        if font is None:
+            start = time.perf_counter()
+            font = pygame.font.Font(path, size)
+            self.load_times[key] = time.perf_counter() - start
+            self._faces[key] = font
+        return font
+
+    def get_system(self, name, size):
+        """Return a cached system font face"""
+        key = (f"sys:{name}", size)
+        font = self._faces.get(key)
+        if font is None:
+            start = time.perf_counter()
+            font = pygame.font.SysFont(name, size)
+            self.load_times[key] = time.perf_counter() - start
+            self._faces[key] = font
+        return font
+
+    def load(self, font_name, size, fallback_name=None):
+        """Resolve the asset -> system -> default chain once per font name"""
+        chain = (font_name, fallback_name)
+        source = self._resolved.get(chain)
+        if source is not None:
+            return self._open(source, size)
+
+        candidates = [("file", f"assets/fonts/{font_name}")]
+        if fallback_name:
+            candidates.append(("sys", fallback_name))
+        for source in candidates:
+            try:
+                font = self._open(source, size)
+            except Exception as e:
+                if source[0] == "sys":
+                    print(f"Font loading failed: {e}")
+                continue
+            self._resolved[chain] = source
+            return font
+
+        # Ultimate fallback
+        self._resolved[chain] = ("file", None)
+        return self.get(None, size)
+
+    def _open(self, source, size):
+        kind, target = source
+        if kind == "sys":
+            return self.get_system(target, size)
+        return self.get(target, size)
+
+    def clear(self):
+        """Forget every face, e.g. after pygame.font.quit()"""
+        self._faces.clear()
+        self._resolved.clear()
+        self.load_times.clear()
+
+FONTS = FontRegistry()
+
 def load_font(font_name, size, fallback_name=None):
     """Safe font loading with multiple fallback options"""
-    try:
-        # Try loading from assets/fonts first
-        try:
-            return pygame.font.Font(f"assets/fonts/{font_name}", size)
-        except:
-            # Fallback to system font if specified
-            if fallback_name:
-                return pygame.font.SysFont(fallback_name, size)
-            # Ultimate fallback
-            return pygame.font.Font(None, size)
-    except Exception as e:
-        print(f"Font loading failed: {e}")
-        return pygame.font.Font(None, size)
+    return FONTS.load(font_name, size, fallback_name)
 
 def center_horizontal(surface, container_rect, y_offset=0):
     """Center surface horizontally within container"""
     rect = surface.get_rect(centerx=container_rect.centerx, y=container_rect.centery + y_offset)
     return rect
 
+class BloodTextAnimation:
+    """Text revealed one character at a time onto a persistent surface.
+
+    Glyph surfaces and advances are cached per font, and the layout is kept
+    between edits, so a frame only touches the character being revealed.
+    """
+    DRIP_HEIGHT = 12
+    _glyphs = {}
+    _advances = {}
+
+    def __init__(self, font, color):
+        self.font = font
+        self.color = tuple(color)
+        self.text = ""
+        self.offsets = [0]
+        self.progress = 0.0
+        self.surface = pygame.Surface((1, font.get_height() + self.DRIP_HEIGHT), pygame.SRCALPHA)
+        self._revealed = 0
+
+    def glyph(self, char):
+        """Cached glyph surface owned by the animation system"""
+        key = (self.font, char, self.color)
+        surf = self._glyphs.get(key)
+        if surf is None:
+            surf = self._glyphs[key] = self.font.render(char, True, self.color)
+        return surf
+
+    def advance(self, char):
+        """Cached horizontal advance of a single character"""
+        key = (self.font, char)
+        width = self._advances.get(key)
+        if width is None:
+            width = self._advances[key] = self.font.size(char)[0]
+        return width
+
+    def set_text(self, text):
+        """Change the text, keeping the layout of the unchanged prefix"""
+        keep = 0
+        limit = min(len(text), len(self.text))
+        while keep < limit and text[keep] == self.text[keep]:
+            keep += 1
+
+        del self.offsets[keep + 1:]
+        for char in text[keep:]:
+            self.offsets.append(self.offsets[-1] + self.advance(char))
+
+        if self.offsets[-1] > self.surface.get_width():
+            # Grow with headroom so typing doesn't reallocate every letter
+            old = self.surface
+            self.surface = pygame.Surface(
+                (max(self.offsets[-1], old.get_width() * 2), old.get_height()), pygame.SRCALPHA
+            )
+            self.surface.blit(old, (0, 0), pygame.Rect(0, 0, self.offsets[keep], old.get_height()))
+
+        # Wipe everything after the shared prefix
+        self.surface.fill((0, 0, 0, 0), pygame.Rect(self.offsets[keep], 0, self.surface.get_width(), self.surface.get_height()))
+        self.text = text
+        self._revealed = min(self._revealed, keep)
+
+    def update(self, progress):
+        """Reveal text up to progress, fading in the current character"""
+        self.progress = progress
+        current = int(progress)
+        text_height = self.font.get_height()
+
+        # Characters that finished revealing are blitted once
+        while self._revealed < min(current, len(self.text)):
+            self._draw_char(self._revealed, 255)
+            self._revealed += 1
+
+        # Drip band under the text is redrawn every frame
+        self.surface.fill((0, 0, 0, 0), pygame.Rect(0, text_height, self.surface.get_width(), self.DRIP_HEIGHT))
+        if current < len(self.text):
+            alpha = int(255 * (progress - current))
+            self._draw_char(current, alpha)
+            x = self.offsets[current]
+            pygame.draw.line(
+                self.surface, (120, 0, 0, alpha),
+                (x + 5, text_height),
+                (x + 15, text_height + 10),
+                2
+            )
+        return self.surface
+
+    def _draw_char(self, index, alpha):
+        rect = pygame.Rect(self.offsets[index], 0, self.offsets[index + 1] - self.offsets[index], self.font.get_height())
+        self.surface.fill((0, 0, 0, 0), rect)
+        glyph = self.glyph(self.text[index])
+        glyph.set_alpha(alpha)
+        self.surface.blit(glyph, rect.topleft)
+
+_TEXT_ANIMATIONS = {}
+
 def blood_text_animation(text, font, progress, color):
     """Create animated blood text surface"""
-    surface = pygame.Surface(font.size(text), pygame.SRCALPHA)
-    for i, char in enumerate(text):
-        if i <= progress:
-            alpha = 255 if i < progress else int(255 * (progress - i + 1))
-            char_surf = font.render(char, True, color)
-            char_surf.set_alpha(alpha)
-            surface.blit(char_surf, (font.size(text[:i])[0], 0))
-            
-            if i == int(progress):
-                pygame.draw.line(
-                    surface, (120, 0, 0, alpha),
-                    (font.size(text[:i])[0] + 5, font.get_height()),
-                    (font.size(text[:i])[0] + 15, font.get_height() + 10),
-                    2
-                )
-    return surface
+    key = (font, tuple(color))
+    animation = _TEXT_ANIMATIONS.get(key)
+    if animation is None:
+        animation = _TEXT_ANIMATIONS[key] = BloodTextAnimation(font, color)
+    if text != animation.text:
+        animation.set_text(text)
+    return animation.update(progress)
 
 # ======================
 # MATH UTILITIES
@@ -242,6 +479,31 @@ def calculate_blood_cost(spell_power, sacrifice_ratio=0.1):
     base_cost = spell_power * 2
     return max(1, int(base_cost * (1 + random.random() * sacrifice_ratio)))
 
-def corrupt_stat(stat_value):
-    """Apply random corruption to a stat"""
-    return max(1, stat_value + random.randint(-2, 1))
\ No newline at end of file
+def corrupt_stat(stat_value, rng=random):
+    """Apply random corruption to a stat; rng is `random` or a random.Random"""
+    return max(1, stat_value + rng.randint(-2, 1))
+
+# ======================
+# USER DIRECTORIES
+# ======================
+APP_DIR_NAME = "garnet-shadowborn"
+
+def user_data_dir():
+    """Per-user directory for saves, following each platform's convention"""
+    if sys.platform == "win32":
+        base = os.environ.get("APPDATA") or os.path.expanduser("~")
+    elif sys.platform == "darwin":
+        base = os.path.expanduser("~/Library/Application Support")
+    else:
+        base = os.environ.get("XDG_DATA_HOME") or os.path.expanduser("~/.local/share")
+    return os.path.join(base, APP_DIR_NAME)
+
+def user_cache_dir():
+    """Per-user directory for caches that can be rebuilt at any time"""
+    if sys.platform == "win32":
+        base = os.environ.get("LOCALAPPDATA") or os.path.expanduser("~")
+    elif sys.platform == "darwin":
+        base = os.path.expanduser("~/Library/Caches")
+    else:
+        base = os.environ.get("XDG_CACHE_HOME") or os.path.expanduser("~/.cache")
+    return os.path.join(base, APP_DIR_NAME)